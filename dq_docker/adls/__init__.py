@@ -3,6 +3,7 @@
 Expose a small ADLS client wrapper that uses fsspec/adlfs when available.
 """
 from .client import ADLSClient
+from .secrets import CachedCredential, SecretCache
 from .utils import build_abfs_uri, env_var_names
 
-__all__ = ["ADLSClient", "build_abfs_uri", "env_var_names"]
+__all__ = ["ADLSClient", "CachedCredential", "SecretCache", "build_abfs_uri", "env_var_names"]
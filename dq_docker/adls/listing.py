@@ -0,0 +1,138 @@
+"""Recursive, parallel listing of ADLS containers with an optional snapshot.
+
+`iter_files` walks a prefix breadth-first, listing every discovered
+directory (shard) concurrently and yielding file entries as soon as their
+parent listing returns, so memory stays proportional to the frontier rather
+than the full tree.
+
+`ListingSnapshot` persists the last-seen signature (ETag, last-modified and
+size) of every path to a small JSON file. When a snapshot is supplied, only
+new or changed entries are yielded and the snapshot is rewritten once the
+walk completes.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..logs import get_logger
+
+logger = get_logger(__name__)
+
+
+def _entry_name(entry: Any) -> str:
+    if isinstance(entry, dict):
+        return str(entry.get("name"))
+    return str(entry)
+
+
+def _is_dir(entry: Any) -> bool:
+    return isinstance(entry, dict) and entry.get("type") == "directory"
+
+
+def entry_signature(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the fields used to decide whether a path changed."""
+    last_modified = entry.get("last_modified") or entry.get("mtime")
+    return {
+        "etag": entry.get("etag"),
+        "last_modified": str(last_modified) if last_modified is not None else None,
+        "size": entry.get("size"),
+    }
+
+
+def iter_files(fs: Any, root: str, max_workers: int = 8) -> Iterator[Dict[str, Any]]:
+    """Recursively yield file entries below `root`.
+
+    Each directory is listed with `fs.ls(path, detail=True)` on a thread
+    pool of `max_workers`; subdirectories are queued as new shards as soon
+    as their parent listing returns.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        pending = {pool.submit(fs.ls, root, detail=True): root}
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                prefix = pending.pop(fut)
+                try:
+                    entries = fut.result()
+                except FileNotFoundError:
+                    logger.debug("Prefix disappeared while listing: %s", prefix)
+                    continue
+                for entry in entries:
+                    if not isinstance(entry, dict):
+                        entry = {"name": entry, "type": "file"}
+                    name = _entry_name(entry)
+                    if _is_dir(entry):
+                        if name.rstrip("/") != prefix.rstrip("/"):
+                            pending[pool.submit(fs.ls, name, detail=True)] = name
+                    else:
+                        yield entry
+
+
+class ListingSnapshot:
+    """Persisted `{path: signature}` map used to diff consecutive listings."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        self.current: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    data = json.load(fh)
+                if isinstance(data, dict):
+                    self.previous = data.get("entries", {}) or {}
+            except Exception as exc:
+                logger.warning("Ignoring unreadable listing snapshot %s: %s", path, exc)
+
+    def observe(self, entry: Dict[str, Any]) -> bool:
+        """Record `entry` and return True when it is new or changed."""
+        name = _entry_name(entry)
+        sig = entry_signature(entry)
+        self.current[name] = sig
+        return self.previous.get(name) != sig
+
+    @property
+    def removed(self) -> List[str]:
+        return sorted(set(self.previous) - set(self.current))
+
+    def save(self) -> None:
+        """Atomically replace the snapshot file with the current listing."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".listing-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"entries": self.current}, fh)
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+def iter_changed_files(
+    fs: Any,
+    root: str,
+    snapshot_path: Optional[str] = None,
+    max_workers: int = 8,
+) -> Iterator[Dict[str, Any]]:
+    """Yield entries below `root`, restricted to new or changed paths when a
+    snapshot is given. The snapshot is only rewritten after a complete walk
+    so an interrupted run re-yields the same changes next time."""
+    if not snapshot_path:
+        yield from iter_files(fs, root, max_workers=max_workers)
+        return
+
+    snapshot = ListingSnapshot(snapshot_path)
+    for entry in iter_files(fs, root, max_workers=max_workers):
+        if snapshot.observe(entry):
+            yield entry
+    if snapshot.removed:
+        logger.info("%d path(s) removed since the last listing of %s", len(snapshot.removed), root)
+    snapshot.save()
@@ -0,0 +1,269 @@
+"""Secret and token caching for Key Vault backed ADLS clients.
+
+`ADLSClient.from_key_vault` needs four secrets and an Azure credential on
+every start. In daemon or multi-worker deployments that repeats Key Vault
+round trips and token acquisitions and can trigger throttling. This module
+provides:
+
+- `fetch_secrets`: fetch several secrets concurrently.
+- `CachedCredential`: wraps an Azure credential and reuses access tokens
+  until shortly before they expire.
+- `SecretCache`: a TTL cache for secret values with refresh-ahead (values
+  close to expiry are served while a background refresh runs) and an
+  optional JSON file that lets worker processes share fetched values.
+  Values are stored there in plain text, so only secret names opted in
+  with `shared_names` (`DQ_KV_CACHE_SHARED`) are shared; everything else,
+  including the client secret unless listed, stays in process memory.
+  Place the shared file on a tmpfs such as `/dev/shm`; it is written with
+  0600 permissions.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from ..logs import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 900.0
+DEFAULT_REFRESH_MARGIN = 120.0
+
+
+def fetch_secrets(get_secret: Callable[[str], Any], names: Iterable[str], max_workers: int = 4) -> Dict[str, Any]:
+    """Fetch `names` concurrently with `get_secret`.
+
+    Returns `{name: value}` where value is the secret string, or the
+    exception raised while fetching it.
+    """
+    names = list(dict.fromkeys(names))
+
+    def _one(name: str) -> Any:
+        try:
+            return get_secret(name).value
+        except Exception as exc:
+            return exc
+
+    if not names:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names)))) as pool:
+        return dict(zip(names, pool.map(_one, names)))
+
+
+class CachedCredential:
+    """Azure credential wrapper that caches access tokens per scope set.
+
+    Tokens are reused until `refresh_margin` seconds before `expires_on`.
+    Any other attribute is delegated to the wrapped credential, except
+    `get_token_info`, so SDK clients always go through the cached
+    `get_token` path.
+    """
+
+    def __init__(self, credential: Any, refresh_margin: float = DEFAULT_REFRESH_MARGIN, clock: Callable[[], float] = time.time):
+        self._credential = credential
+        self._refresh_margin = refresh_margin
+        self._clock = clock
+        self._tokens: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> Any:
+        key = (scopes, kwargs.get("tenant_id"), kwargs.get("claims"))
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is not None and getattr(token, "expires_on", 0) - self._refresh_margin > self._clock():
+                return token
+            token = self._credential.get_token(*scopes, **kwargs)
+            self._tokens[key] = token
+            return token
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "get_token_info":
+            raise AttributeError(name)
+        return getattr(self._credential, name)
+
+
+class SecretCache:
+    """TTL cache for Key Vault secret values.
+
+    Parameters:
+    - `ttl`: seconds a fetched value is served for.
+    - `refresh_margin`: values older than `ttl - refresh_margin` are still
+      returned but refreshed in a background thread. Clamped to half the
+      `ttl` so fresh values are always served without a refresh.
+    - `shared_path`: optional JSON file used to share values between
+      processes; entries fetched by another process are reused.
+    - `shared_names`: secret names whose values may be written to
+      `shared_path`. Nothing is shared by default.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        shared_path: Optional[str] = None,
+        max_workers: int = 4,
+        clock: Callable[[], float] = time.time,
+        shared_names: Optional[Iterable[str]] = None,
+    ):
+        self.ttl = float(ttl)
+        self.refresh_margin = min(float(refresh_margin), self.ttl / 2)
+        self.shared_path = shared_path
+        self.shared_names = frozenset(shared_names or ())
+        self.max_workers = max_workers
+        self._clock = clock
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._refreshing: set = set()
+        self._credential: Optional[CachedCredential] = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(vault_url: str, name: str) -> str:
+        return f"{vault_url.rstrip('/')}|{name}"
+
+    def _shared(self, key: str) -> bool:
+        return key.rsplit("|", 1)[-1] in self.shared_names
+
+    def credential(self, factory: Callable[[], Any]) -> CachedCredential:
+        """Return a process-wide cached credential, creating it on first use."""
+        with self._lock:
+            if self._credential is None:
+                self._credential = CachedCredential(factory(), refresh_margin=self.refresh_margin, clock=self._clock)
+            return self._credential
+
+    def get_many(self, vault_url: str, names: Iterable[str], client_factory: Callable[[], Any]) -> Dict[str, Any]:
+        """Return `{name: value-or-exception}` for `names`.
+
+        Fresh values come from the cache; missing or expired values are
+        fetched concurrently through a single client from `client_factory`;
+        values inside the refresh window are returned immediately and
+        refreshed in the background.
+        """
+        names = list(dict.fromkeys(names))
+        self._load_shared()
+        now = self._clock()
+        results: Dict[str, Any] = {}
+        to_fetch, to_refresh = [], []
+        with self._lock:
+            for name in names:
+                entry = self._entries.get(self._key(vault_url, name))
+                age = now - entry[1] if entry else None
+                if entry is None or age >= self.ttl:
+                    to_fetch.append(name)
+                    continue
+                results[name] = entry[0]
+                if age >= self.ttl - self.refresh_margin:
+                    to_refresh.append(name)
+
+        if to_fetch:
+            fetched = fetch_secrets(client_factory().get_secret, to_fetch, self.max_workers)
+            self._store(vault_url, fetched)
+            results.update(fetched)
+        if to_refresh:
+            self._refresh_in_background(vault_url, to_refresh, client_factory)
+        return results
+
+    def _store(self, vault_url: str, fetched: Dict[str, Any]) -> None:
+        now = self._clock()
+        with self._lock:
+            for name, value in fetched.items():
+                if not isinstance(value, Exception):
+                    self._entries[self._key(vault_url, name)] = (value, now)
+        self._save_shared()
+
+    def _refresh_in_background(self, vault_url: str, names: list, client_factory: Callable[[], Any]) -> Optional[threading.Thread]:
+        with self._lock:
+            names = [n for n in names if self._key(vault_url, n) not in self._refreshing]
+            self._refreshing.update(self._key(vault_url, n) for n in names)
+        if not names:
+            return None
+
+        def _run() -> None:
+            try:
+                self._store(vault_url, fetch_secrets(client_factory().get_secret, names, self.max_workers))
+            except Exception:
+                logger.debug("Background secret refresh failed for %s", names, exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(self._key(vault_url, n) for n in names)
+
+        thread = threading.Thread(target=_run, name="dq-secret-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_shared(self) -> None:
+        if not self.shared_path or not self.shared_names or not os.path.exists(self.shared_path):
+            return
+        try:
+            with open(self.shared_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except Exception:
+            logger.debug("Ignoring unreadable shared secret cache %s", self.shared_path)
+            return
+        with self._lock:
+            for key, item in (data or {}).items():
+                if not self._shared(key):
+                    continue
+                try:
+                    value, fetched_at = item["value"], float(item["fetched_at"])
+                except Exception:
+                    continue
+                current = self._entries.get(key)
+                if current is None or current[1] < fetched_at:
+                    self._entries[key] = (value, fetched_at)
+
+    def _save_shared(self) -> None:
+        if not self.shared_path or not self.shared_names:
+            return
+        directory = os.path.dirname(os.path.abspath(self.shared_path))
+        with self._lock:
+            payload = {k: {"value": v, "fetched_at": t} for k, (v, t) in self._entries.items() if self._shared(k)}
+        if not payload:
+            return
+        tmp = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".secrets-", dir=directory)
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh)
+            os.replace(tmp, self.shared_path)
+        except Exception:
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            logger.warning("Could not write shared secret cache %s", self.shared_path, exc_info=True)
+
+
+_DEFAULT_CACHE: Optional[SecretCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_secret_cache() -> Optional[SecretCache]:
+    """Return the process-wide cache configured from the environment.
+
+    Enabled by `DQ_KV_CACHE_TTL` (seconds); `DQ_KV_CACHE_PATH` optionally
+    names a file shared between worker processes and `DQ_KV_CACHE_SHARED`
+    the comma-separated secret names written to it. Returns None when
+    caching is not configured.
+    """
+    global _DEFAULT_CACHE
+    ttl = os.environ.get("DQ_KV_CACHE_TTL")
+    if not ttl:
+        return None
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            ttl_value = float(ttl)
+            _DEFAULT_CACHE = SecretCache(
+                ttl=ttl_value,
+                refresh_margin=min(DEFAULT_REFRESH_MARGIN, ttl_value / 4),
+                shared_path=os.environ.get("DQ_KV_CACHE_PATH") or None,
+                shared_names=[n.strip() for n in os.environ.get("DQ_KV_CACHE_SHARED", "").split(",") if n.strip()],
+            )
+        return _DEFAULT_CACHE
@@ -70,17 +70,36 @@ def ensure_batch_definition(asset: Any, name: str, path: str) -> Any:
         return None
 
 
-def get_batch_and_preview(batch_definition: Any):
+def ensure_dataframe_batch_definition(asset: Any, name: str) -> Any:
+    """Return a whole-dataframe batch definition on a dataframe asset."""
+    bd = find_batch_definition(asset, name, "")
+    if bd:
+        logger.info("✅ Batch definition '%s' already exists.", name)
+        return bd
+    logger.info("Adding whole-dataframe batch definition '%s'", name)
+    try:
+        return asset.add_batch_definition_whole_dataframe(name)
+    except Exception:
+        logger.info("Could not add batch definition '%s'; skipping.", name)
+        return None
+
+
+def get_batch_and_preview(batch_definition: Any, batch_parameters: Optional[dict] = None):
     """Get a batch from a batch definition and return it.
 
     This helper will attempt to call `get_batch()` on the batch definition and
-    log a short preview (first rows) if available.
+    log a short preview (first rows) if available. `batch_parameters` is
+    forwarded when given (for example `{"dataframe": df}` for dataframe
+    assets).
     """
     if batch_definition is None:
         return None
 
     try:
-        batch = batch_definition.get_batch()
+        if batch_parameters:
+            batch = batch_definition.get_batch(batch_parameters=batch_parameters)
+        else:
+            batch = batch_definition.get_batch()
         # try:
         #     preview = getattr(batch, "head", None)
         #     if callable(preview):
@@ -0,0 +1,302 @@
+"""Shared-memory handoff of loaded batches between processes.
+
+`BatchTransport` publishes loaded data once as an uncompressed Arrow IPC
+file in `/dev/shm` (or, when that is unavailable, a memory-mapped file
+under `DQ_CACHE_DIR/shm`). Other processes receive a small picklable
+`SharedBatch` handle and `attach` to it: the Arrow table's buffers point
+straight into the shared mapping.
+
+The runtime uses it through `ProcessLoader` when `DQ_LOAD_PROCESSES` is
+set: the dataframes of prefetched sources and partitions are parsed in
+worker processes (outside the GIL of the validating process), published
+once and attached by the parent instead of being pickled back. The parent
+then converts the table to pandas: numeric columns without nulls keep
+pointing into the mapping, while string and nullable columns are copied
+into pandas' own (object) representation, so the hand-off saves the
+parse and the pickling, not that copy. Frames that Arrow cannot represent
+(for example object columns mixing types) are loaded in the parent
+instead.
+
+The orchestrator owns the lifecycle: published batches are removed by
+`release`, by `close` (also on interpreter exit) and, for files left behind
+by a crashed run, by `sweep_stale`. File names carry the publisher's PID
+and PID namespace, so a PID is only checked for liveness from the same
+namespace; batches from other containers sharing `DQ_SHM_DIR` (or with
+names that do not parse) are removed only once older than `max_age`.
+`DQ_SHM_DIR` overrides the location.
+"""
+from __future__ import annotations
+
+import atexit
+import glob
+import multiprocessing
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence
+
+from .cache import cache_dir
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+SHM_DIR = "/dev/shm"
+PREFIX = "dq-batch-"
+SUFFIX = ".arrow"
+# Batches of other PID namespaces are swept once older than this.
+DEFAULT_MAX_AGE = 24 * 3600.0
+_NAME = re.compile(re.escape(PREFIX) + r"(?P<ns>[A-Za-z0-9_.]+)-(?P<pid>\d+)-[0-9a-f]+" + re.escape(SUFFIX) + "$")
+_SAFE = re.compile(r"[^A-Za-z0-9_.]+")
+_namespace: Optional[str] = None
+
+
+def pid_namespace() -> str:
+    """Identify the PID namespace of this process: the inode of
+    `/proc/self/ns/pid` where available, else the host name."""
+    global _namespace
+    if _namespace is None:
+        try:
+            _namespace = "ns%x" % os.stat("/proc/self/ns/pid").st_ino
+        except OSError:
+            _namespace = _SAFE.sub("_", socket.gethostname()) or "host"
+    return _namespace
+
+
+def _batch_path(directory: str) -> str:
+    return os.path.join(directory, f"{PREFIX}{pid_namespace()}-{os.getpid()}-{uuid.uuid4().hex}{SUFFIX}")
+
+
+def transport_dir() -> str:
+    """Return the directory batches are published to."""
+    configured = os.environ.get("DQ_SHM_DIR")
+    if configured:
+        os.makedirs(configured, exist_ok=True)
+        return configured
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        return SHM_DIR
+    return cache_dir("shm")
+
+
+class SharedBatch(NamedTuple):
+    """Picklable handle to a published batch."""
+
+    path: str
+    num_rows: int
+    columns: Sequence[str]
+
+    def attach(self, columns: Optional[Sequence[str]] = None) -> Any:
+        """Memory-map the batch and return it as a `pyarrow.Table`."""
+        return attach(self, columns)
+
+    def to_pandas(self, columns: Optional[Sequence[str]] = None) -> Any:
+        """Return the batch as a pandas DataFrame backed by the mapping
+        where the column types allow it."""
+        return attach(self, columns).to_pandas(split_blocks=True)
+
+
+def attach(batch: SharedBatch, columns: Optional[Sequence[str]] = None) -> Any:
+    """Open a published batch zero-copy, optionally restricted to `columns`."""
+    import pyarrow as pa
+
+    source = pa.memory_map(batch.path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(list(columns)) if columns is not None else table
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_stale(path: str, max_age: float, now: float) -> bool:
+    match = _NAME.search(os.path.basename(path))
+    if match and match.group("ns") == pid_namespace():
+        return not _pid_alive(int(match.group("pid")))
+    # Another container (or an unparseable name): its PIDs mean nothing
+    # here, so fall back to the file's age as a lease.
+    try:
+        return now - os.stat(path).st_mtime > max_age
+    except OSError:
+        return False
+
+
+def sweep_stale(directory: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE) -> List[str]:
+    """Remove batches published by processes that are no longer running.
+
+    Liveness is only checked for batches of this PID namespace; others are
+    removed once older than `max_age` seconds.
+    """
+    removed = []
+    now = time.time()
+    for path in glob.glob(os.path.join(directory or transport_dir(), PREFIX + "*" + SUFFIX)):
+        if not _is_stale(path, max_age, now):
+            continue
+        try:
+            os.unlink(path)
+            removed.append(path)
+        except OSError:
+            pass
+    if removed:
+        logger.info("ℹ️ Removed %d stale shared batch(es)", len(removed))
+    return removed
+
+
+def publish(data: Any, directory: Optional[str] = None) -> SharedBatch:
+    """Write a DataFrame or `pyarrow.Table` to `directory` and return its
+    handle. The caller (or a `BatchTransport` that adopts it) owns the file.
+
+    Raises `pyarrow.ArrowException` when a DataFrame cannot be converted
+    (for example an object column mixing strings and numbers)."""
+    import pyarrow as pa
+
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+    path = _batch_path(directory or transport_dir())
+    try:
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    except BaseException:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        raise
+    logger.debug("Published batch of %d rows (%d bytes) to %s", table.num_rows, table.nbytes, path)
+    return SharedBatch(path, table.num_rows, list(table.column_names))
+
+
+def _load_and_publish(fn: Callable[..., Any], directory: str, args: Sequence[Any], kwargs: dict) -> Optional[SharedBatch]:
+    """Worker side of `ProcessLoader.load`; None when the loaded data has
+    no Arrow representation."""
+    import pyarrow as pa
+
+    data = fn(*args, **kwargs)
+    try:
+        return publish(data, directory)
+    except pa.ArrowException as exc:
+        logger.debug("Loaded data cannot be converted to Arrow: %s", exc)
+        return None
+
+
+class BatchTransport:
+    """Publishes batches for other processes and cleans them up.
+
+    Use as a context manager in the orchestrator::
+
+        with BatchTransport() as transport:
+            batch = transport.publish(frame)
+            ...  # hand `batch` to processes that `attach` it
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or transport_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        self._published: List[str] = []
+        self._lock = threading.Lock()
+        sweep_stale(self.directory)
+        atexit.register(self.close)
+
+    def publish(self, data: Any) -> SharedBatch:
+        """Write a DataFrame or `pyarrow.Table` once and return its handle."""
+        batch = publish(data, self.directory)
+        with self._lock:
+            self._published.append(batch.path)
+        return batch
+
+    def adopt(self, batch: SharedBatch) -> SharedBatch:
+        """Take ownership of a batch published by another (worker)
+        process: it is renamed to this process so `sweep_stale` keeps it
+        while this process lives, and removed by `release`/`close`."""
+        path = _batch_path(self.directory)
+        os.replace(batch.path, path)
+        with self._lock:
+            self._published.append(path)
+        return batch._replace(path=path)
+
+    def release(self, batch: Any) -> None:
+        """Remove a published batch (a `SharedBatch` or its path).
+
+        Workers that already attached keep their mapping until they drop
+        it; the memory is freed once the last mapping is closed.
+        """
+        path = batch.path if isinstance(batch, SharedBatch) else batch
+        with self._lock:
+            if path in self._published:
+                self._published.remove(path)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Remove every batch published by this transport."""
+        with self._lock:
+            paths, self._published = self._published, []
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "BatchTransport":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class ProcessLoader:
+    """Runs loader functions in worker processes and hands the resulting
+    DataFrames back through shared memory.
+
+    `load(fn, *args)` calls `fn(*args)` in a spawned worker, which
+    publishes the result; the caller adopts and attaches it, converts it
+    to pandas and releases the file. When the result cannot be converted
+    to Arrow, `fn(*args)` runs again in the calling process instead of
+    failing the load. `fn` must be picklable.
+    """
+
+    def __init__(self, max_workers: int, directory: Optional[str] = None):
+        self.transport = BatchTransport(directory)
+        self._pool = ProcessPoolExecutor(max_workers=max(1, max_workers), mp_context=multiprocessing.get_context("spawn"))
+
+    def load(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        batch = self._pool.submit(_load_and_publish, fn, self.transport.directory, args, kwargs).result()
+        if batch is None:
+            logger.info("ℹ️ Loaded data has no Arrow representation; loading it in this process")
+            return fn(*args, **kwargs)
+        batch = self.transport.adopt(batch)
+        try:
+            return batch.to_pandas()
+        finally:
+            # Attached buffers stay valid after the file is unlinked.
+            self.transport.release(batch)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self.transport.close()
+
+    def __enter__(self) -> "ProcessLoader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def load_processes() -> int:
+    """`DQ_LOAD_PROCESSES`: worker processes for loading dataframes (0 = off)."""
+    try:
+        return max(0, int(os.environ.get("DQ_LOAD_PROCESSES") or 0))
+    except ValueError:
+        logger.warning("Ignoring invalid DQ_LOAD_PROCESSES=%r", os.environ.get("DQ_LOAD_PROCESSES"))
+        return 0
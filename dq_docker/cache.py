@@ -0,0 +1,15 @@
+"""Location of on-disk caches used by the runtime.
+
+Caches are disposable: deleting the directory only costs a rebuild on the
+next run. `DQ_CACHE_DIR` overrides the default of `<tmpdir>/dq_docker`.
+"""
+import os
+import tempfile
+
+
+def cache_dir(*parts: str) -> str:
+    """Return (and create) a directory below the cache root."""
+    root = os.environ.get("DQ_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "dq_docker")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
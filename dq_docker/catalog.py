@@ -0,0 +1,290 @@
+"""Lazily loaded, compiled data source catalog.
+
+`SourceCatalog` reads data source definitions from a directory of
+per-source YAML files (`dq_docker/config/data_sources/`) and/or
+multi-source mapping files (`dq_docker/config/data_sources.yml`). Instead
+of parsing every YAML file on import, the definitions are compiled once
+into a small SQLite artifact under `DQ_CACHE_DIR`, keyed by the mtimes and
+sizes of the inputs, and individual entries are read from it on demand:
+
+- nothing is read until the catalog is first accessed;
+- `catalog[name]` loads a single entry by primary key;
+- `catalog.by_tag(tag)` uses an index over each source's `tags` list;
+- unchanged inputs reuse the compiled artifact across processes.
+
+Source templates (files with a top-level `template` mapping, see
+`dq_docker.source_templates`) are expanded when the catalog is compiled and
+re-expanded on open, since their result depends on a remote or local
+listing rather than on the template file alone.
+
+The catalog implements `collections.abc.Mapping`, so it can be used
+wherever a `{name: source_conf}` dict was expected.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import yaml
+
+from .cache import cache_dir
+from .logs import get_logger
+from .source_templates import expand_template, is_template
+
+logger = get_logger(__name__)
+
+YAML_SUFFIXES = (".yml", ".yaml")
+SCHEMA_VERSION = 1
+
+
+def _tags(conf: Dict[str, Any]) -> List[str]:
+    tags = conf.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",")]
+    return [str(t) for t in tags if str(t)]
+
+
+def _read_yaml(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as fh:
+        return yaml.safe_load(fh) or {}
+
+
+class SourceCatalog(Mapping):
+    """Read-only mapping of data source name to its configuration.
+
+    Parameters:
+    - `directory`: folder of per-source YAML files; each file is one source
+      named after the file (or a template expanding into several).
+    - `files`: YAML files mapping several source names to configurations.
+    - `require_directory`: raise on first access when `directory` is
+      missing, matching the historical import-time check.
+    """
+
+    def __init__(self, directory: Optional[str] = None, files: Sequence[str] = (), require_directory: bool = True):
+        self.directory = directory
+        self.files = list(files)
+        self.require_directory = require_directory
+        self._lock = threading.RLock()
+        self._artifact: Optional[str] = None
+        self._names: Optional[List[str]] = None
+        self._templates: Optional[Dict[str, Dict[str, Any]]] = None
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+
+    # -- inputs -----------------------------------------------------------
+    def _directory_files(self) -> List[str]:
+        if not self.directory:
+            return []
+        if not os.path.isdir(self.directory):
+            if self.require_directory:
+                raise RuntimeError(
+                    f"Missing data source directory: {self.directory}; create per-source YAML files like 'ds_sample_data.yml'"
+                )
+            return []
+        with os.scandir(self.directory) as it:
+            names = sorted(e.name for e in it if e.name.endswith(YAML_SUFFIXES) and e.is_file())
+        return [os.path.join(self.directory, n) for n in names]
+
+    def _fingerprint(self, paths: Iterable[str]) -> str:
+        parts: List[Any] = [SCHEMA_VERSION]
+        for path in paths:
+            st = os.stat(path)
+            parts.append((os.path.abspath(path), st.st_mtime_ns, st.st_size))
+        if self.directory and os.path.isdir(self.directory):
+            parts.append(os.stat(self.directory).st_mtime_ns)
+        return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def _artifact_path(self) -> str:
+        ident = json.dumps([os.path.abspath(self.directory or ""), [os.path.abspath(f) for f in self.files]])
+        return os.path.join(cache_dir("catalog"), hashlib.sha1(ident.encode("utf-8")).hexdigest() + ".sqlite")
+
+    # -- compilation ------------------------------------------------------
+    def _collect(self, dir_files: List[str]) -> Dict[str, Any]:
+        entries: Dict[str, Dict[str, Any]] = {}
+        templates: Dict[str, Dict[str, Any]] = {}
+
+        def _add(key: str, conf: Dict[str, Any], path: str) -> None:
+            if key in entries:
+                raise RuntimeError(f"Duplicate data source key '{key}' from file {path}")
+            entries[key] = conf
+
+        for path in dir_files:
+            try:
+                data = _read_yaml(path)
+                if not isinstance(data, dict):
+                    raise RuntimeError(f"Data source file {path} must contain a mapping at top-level")
+                if is_template(data):
+                    templates[path] = data
+                else:
+                    _add(os.path.splitext(os.path.basename(path))[0], dict(data), path)
+            except Exception as exc:
+                raise RuntimeError(f"Failed to load data source file {path}: {exc}") from exc
+
+        for path in self.files:
+            try:
+                data = _read_yaml(path)
+            except Exception as exc:
+                raise RuntimeError(f"Failed to load data source file {path}: {exc}") from exc
+            for key, conf in (data or {}).items():
+                _add(key, dict(conf or {}), path)
+        return {"entries": entries, "templates": templates}
+
+    def _compile(self, artifact: str, fingerprint: str, dir_files: List[str]) -> None:
+        collected = self._collect(dir_files)
+        fd, tmp = tempfile.mkstemp(prefix=".catalog-", suffix=".sqlite", dir=os.path.dirname(artifact))
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(tmp)
+            with conn:
+                conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.execute("CREATE TABLE sources (name TEXT PRIMARY KEY, payload TEXT NOT NULL)")
+                conn.execute("CREATE TABLE tags (tag TEXT NOT NULL, name TEXT NOT NULL)")
+                conn.execute("CREATE INDEX tags_by_tag ON tags (tag)")
+                conn.execute("CREATE TABLE templates (path TEXT PRIMARY KEY, payload TEXT NOT NULL)")
+                conn.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+                conn.executemany(
+                    "INSERT INTO sources VALUES (?, ?)",
+                    [(name, json.dumps(conf, default=str)) for name, conf in collected["entries"].items()],
+                )
+                conn.executemany(
+                    "INSERT INTO tags VALUES (?, ?)",
+                    [(tag, name) for name, conf in collected["entries"].items() for tag in _tags(conf)],
+                )
+                conn.executemany(
+                    "INSERT INTO templates VALUES (?, ?)",
+                    [(path, json.dumps(data, default=str)) for path, data in collected["templates"].items()],
+                )
+            conn.close()
+            os.replace(tmp, artifact)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        logger.debug("Compiled data source catalog %s (%d entries)", artifact, len(collected["entries"]))
+
+    @staticmethod
+    def _query(artifact: str, sql: str, params: Sequence[Any] = ()) -> List[Any]:
+        conn = sqlite3.connect(f"file:{artifact}?mode=ro", uri=True)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def _stored_fingerprint(self, artifact: str) -> Optional[str]:
+        if not os.path.exists(artifact):
+            return None
+        try:
+            rows = self._query(artifact, "SELECT value FROM meta WHERE key = 'fingerprint'")
+            return rows[0][0] if rows else None
+        except sqlite3.Error:
+            return None
+
+    def _ensure(self) -> str:
+        with self._lock:
+            if self._artifact is not None:
+                return self._artifact
+            dir_files = self._directory_files()
+            if self.directory and self.require_directory and not dir_files:
+                raise RuntimeError(f"No data source YAML files found in {self.directory}; add at least one .yml mapping")
+            fingerprint = self._fingerprint(dir_files + self.files)
+            artifact = self._artifact_path()
+            if self._stored_fingerprint(artifact) != fingerprint:
+                self._compile(artifact, fingerprint, dir_files)
+            self._artifact = artifact
+            return artifact
+
+    def _template_entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._templates is None:
+                rows = self._query(self._ensure(), "SELECT path, payload FROM templates ORDER BY path")
+                expanded: Dict[str, Dict[str, Any]] = {}
+                for path, payload in rows:
+                    try:
+                        result = expand_template(json.loads(payload), origin=path)
+                    except Exception as exc:
+                        raise RuntimeError(f"Failed to load data source file {path}: {exc}") from exc
+                    for key, conf in result.items():
+                        if key in expanded:
+                            raise RuntimeError(f"Duplicate data source key '{key}' from file {path}")
+                        expanded[key] = conf
+                self._templates = expanded
+            return self._templates
+
+    # -- public API -------------------------------------------------------
+    def refresh(self) -> None:
+        """Drop memoized state so the next access re-checks the inputs."""
+        with self._lock:
+            self._artifact = None
+            self._names = None
+            self._templates = None
+            self._loaded.clear()
+
+    def names(self) -> List[str]:
+        with self._lock:
+            if self._names is None:
+                names = {r[0] for r in self._query(self._ensure(), "SELECT name FROM sources")}
+                for key in self._template_entries():
+                    if key in names:
+                        raise RuntimeError(f"Duplicate data source key '{key}' from a source template")
+                    names.add(key)
+                self._names = sorted(names)
+            return list(self._names)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def by_tag(self, tag: str) -> Dict[str, Dict[str, Any]]:
+        """Return the sources carrying `tag`."""
+        names = [r[0] for r in self._query(self._ensure(), "SELECT name FROM tags WHERE tag = ? ORDER BY name", (tag,))]
+        selected = {n: self[n] for n in names}
+        for key, conf in self._template_entries().items():
+            if tag in _tags(conf):
+                selected[key] = conf
+        return dict(sorted(selected.items()))
+
+    def select(self, names: Optional[Iterable[str]] = None, tags: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Return only the requested sources (by name and/or any of `tags`)."""
+        selected: Dict[str, Dict[str, Any]] = {}
+        for name in names or ():
+            selected[name] = self[name]
+        for tag in tags or ():
+            selected.update(self.by_tag(tag))
+        return dict(sorted(selected.items()))
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+        rows = self._query(self._ensure(), "SELECT payload FROM sources WHERE name = ?", (name,))
+        if rows:
+            conf = json.loads(rows[0][0])
+        else:
+            templates = self._template_entries()
+            if name not in templates:
+                raise KeyError(name)
+            conf = templates[name]
+        with self._lock:
+            self._loaded[name] = conf
+        return conf
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.get(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def __repr__(self) -> str:
+        return f"SourceCatalog(directory={self.directory!r}, files={self.files!r})"
@@ -1,185 +1,295 @@
-from typing import Any, List
+import glob
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from .logs import get_logger
+from .store_writes import checkpoint_unchanged, write_stats
+from .store_manifest import StoreManifest, content_hash, default_manifest_path, entry_id, entry_refs, known_ids
 
 logger = get_logger(__name__)
 
 
-def repair_ge_store(context: Any, verbose: bool = False) -> dict:
+def _listed_names(mgr: Any) -> List[str]:
+    """Names of the entries of a GE factory (`validation_definitions`,
+    `checkpoints`) using whichever listing method it offers."""
+    list_fn = getattr(mgr, "list", None) or getattr(mgr, "all", None) or getattr(mgr, "list_keys", None)
+    if not callable(list_fn):
+        return []
+    items = list_fn()
+    keys = []
+    if isinstance(items, dict):
+        keys = list(items.keys())
+    elif isinstance(items, list):
+        for it in items:
+            if isinstance(it, str):
+                keys.append(it)
+            else:
+                try:
+                    nm = getattr(it, "name", None) or (it.get("name") if isinstance(it, dict) else None)
+                    if nm:
+                        keys.append(nm)
+                except Exception:
+                    continue
+    return keys
+
+
+def _backend_names(store: Any) -> Optional[List[str]]:
+    """Entry names listed straight from the store backend, or None when the
+    backend cannot be listed."""
+    backend = getattr(store, "store_backend", None)
+    if backend is None or not callable(getattr(backend, "list_keys", None)):
+        return None
+    try:
+        keys = [tuple(k) for k in backend.list_keys()]
+    except Exception as exc:
+        logger.debug("Could not list store backend keys: %s", exc)
+        return None
+    if any(len(k) != 1 for k in keys):
+        return None
+    return [k[0] for k in keys]
+
+
+def _raw_entries(store: Any) -> Optional[Dict[str, Any]]:
+    """Return `{name: stored value}` read straight from the store backend
+    (no deserialization), or None when the backend cannot be listed."""
+    names = _backend_names(store)
+    if names is None:
+        return None
+    try:
+        return {n: store.store_backend.get((n,)) for n in names}
+    except Exception as exc:
+        logger.debug("Could not read raw store entries: %s", exc)
+        return None
+
+
+def _check_entries(get_fn: Any, names: List[str], max_workers: int) -> List[Tuple[str, Optional[Exception]]]:
+    def _check(name: str) -> Tuple[str, Optional[Exception]]:
+        try:
+            get_fn(name)
+            return name, None
+        except Exception as exc:
+            return name, exc
+
+    if len(names) <= 1 or max_workers <= 1:
+        return [_check(n) for n in names]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names)), thread_name_prefix="dq-repair") as pool:
+        return list(pool.map(_check, names))
+
+
+def repair_ge_store(
+    context: Any,
+    verbose: bool = False,
+    manifest_path: Optional[str] = None,
+    use_manifest: bool = True,
+    max_workers: int = 8,
+) -> dict:
     """Best-effort repair of GE stores: attempt to deserialize stored
     ValidationDefinitions and Checkpoints and delete any entries that raise
     during deserialization. Returns a dict with lists of deleted keys and
-    any errors encountered.
+    any errors encountered, plus how many entries were checked and how many
+    were skipped as already verified.
 
     This function is idempotent and conservative: it only deletes entries
     that cannot be read (deserialize) by the configured GE store APIs.
+
+    Entries that deserialize are recorded in a `StoreManifest` (see
+    `dq_docker.store_manifest`) by content hash; later repairs only
+    deserialize entries that are new, changed, or reference ids that no
+    longer exist, on a pool of `max_workers` threads. `use_manifest=False`
+    re-checks everything.
     """
-    result = {"validation_definitions_deleted": [], "checkpoints_deleted": [], "errors": []}
+    result = {"validation_definitions_deleted": [], "checkpoints_deleted": [], "errors": [], "checked": 0, "skipped": 0}
+    manifest = StoreManifest.load(manifest_path or default_manifest_path(context)) if use_manifest else None
     try:
-        # ValidationDefinition store
-        vd_mgr = getattr(context, "validation_definitions", None)
-        if vd_mgr is not None:
-            list_fn = getattr(vd_mgr, "list", None) or getattr(vd_mgr, "all", None) or getattr(vd_mgr, "list_keys", None)
-            get_fn = getattr(vd_mgr, "get", None)
-            delete_fn = getattr(vd_mgr, "delete", None)
-            if callable(list_fn) and callable(get_fn) and callable(delete_fn):
-                try:
-                    items = list_fn()
-                    keys = []
-                    if isinstance(items, dict):
-                        keys = list(items.keys())
-                    elif isinstance(items, list):
-                        for it in items:
-                            if isinstance(it, str):
-                                keys.append(it)
-                            else:
-                                try:
-                                    nm = getattr(it, "name", None) or (it.get("name") if isinstance(it, dict) else None)
-                                    if nm:
-                                        keys.append(nm)
-                                except Exception:
-                                    continue
-
-                    for key in keys:
-                        try:
-                            # Attempt to read; if it fails, delete the key
-                            get_fn(key)
-                        except Exception:
-                            try:
-                                delete_fn(key)
-                                result["validation_definitions_deleted"].append(key)
-                                if verbose:
-                                    logger.warning("Deleted stale ValidationDefinition from store: %s", key)
-                            except Exception as dexc:
-                                result["errors"].append({"key": key, "error": str(dexc)})
-                except Exception as exc:
-                    result["errors"].append({"phase": "vd_list", "error": str(exc)})
-
-        # Checkpoint store
-        cp_mgr = getattr(context, "checkpoints", None)
-        if cp_mgr is not None:
-            list_fn = getattr(cp_mgr, "list", None) or getattr(cp_mgr, "all", None) or getattr(cp_mgr, "list_keys", None)
-            get_fn = getattr(cp_mgr, "get", None)
-            delete_fn = getattr(cp_mgr, "delete", None)
-            if callable(list_fn) and callable(get_fn) and callable(delete_fn):
-                try:
-                    items = list_fn()
-                    keys = []
-                    if isinstance(items, dict):
-                        keys = list(items.keys())
-                    elif isinstance(items, list):
-                        for it in items:
-                            if isinstance(it, str):
-                                keys.append(it)
-                            else:
-                                try:
-                                    nm = getattr(it, "name", None) or (it.get("name") if isinstance(it, dict) else None)
-                                    if nm:
-                                        keys.append(nm)
-                                except Exception:
-                                    continue
-
-                    for key in keys:
+        existing = known_ids(context)
+        for kind, store_attr, deleted_key, label in (
+            # ValidationDefinitions first: checkpoints reference their ids.
+            ("validation_definitions", "validation_definition_store", "validation_definitions_deleted", "ValidationDefinition"),
+            ("checkpoints", "checkpoint_store", "checkpoints_deleted", "Checkpoint"),
+        ):
+            mgr = getattr(context, kind, None)
+            if mgr is None:
+                continue
+            get_fn = getattr(mgr, "get", None)
+            delete_fn = getattr(mgr, "delete", None)
+            if not callable(get_fn) or not callable(delete_fn):
+                continue
+            try:
+                entries = _raw_entries(getattr(context, store_attr, None))
+                if entries is None:
+                    names = _listed_names(mgr)
+                    digests: Dict[str, Optional[str]] = {n: None for n in names}
+                    to_check = names
+                else:
+                    digests = {n: content_hash(v) for n, v in entries.items()}
+                    to_check = [n for n in entries if manifest is None or not manifest.verified(kind, n, digests[n], existing)]
+                result["skipped"] += len(digests) - len(to_check)
+                result["checked"] += len(to_check)
+
+                deleted = set()
+                for key, exc in _check_entries(get_fn, to_check, max_workers):
+                    if exc is None:
+                        if manifest is not None and digests[key] is not None:
+                            manifest.record(kind, key, digests[key], entry_refs(kind, entries[key]))
+                        continue
+                    try:
+                        # Attempt to read failed: delete the key
                         try:
-                            get_fn(key)
+                            delete_fn(key)
                         except Exception:
-                            try:
-                                delete_fn(key)
-                                result["checkpoints_deleted"].append(key)
-                                if verbose:
-                                    logger.warning("Deleted stale Checkpoint from store: %s", key)
-                            except Exception as dexc:
-                                result["errors"].append({"key": key, "error": str(dexc)})
-                except Exception as exc:
-                    result["errors"].append({"phase": "cp_list", "error": str(exc)})
+                            # The factory's delete() deserializes the entry
+                            # first; remove unreadable ones from the backend.
+                            if entries is None:
+                                raise
+                            getattr(context, store_attr).store_backend.remove_key((key,))
+                        deleted.add(key)
+                        result[deleted_key].append(key)
+                        if manifest is not None:
+                            manifest.forget(kind, key)
+                        if verbose:
+                            logger.warning("Deleted stale %s from store: %s", label, key)
+                    except Exception as dexc:
+                        result["errors"].append({"key": key, "error": str(dexc)})
+
+                if entries is not None:
+                    if manifest is not None:
+                        manifest.retain(kind, [n for n in entries if n not in deleted])
+                    if existing is not None and kind == "validation_definitions":
+                        existing.update(i for n, v in entries.items() if n not in deleted for i in [entry_id(v)] if i)
+            except Exception as exc:
+                result["errors"].append({"phase": "vd_list" if kind == "validation_definitions" else "cp_list", "error": str(exc)})
     except Exception as exc_outer:
         result["errors"].append({"phase": "outer", "error": str(exc_outer)})
 
+    if manifest is not None:
+        try:
+            manifest.save()
+        except OSError as exc:
+            result["errors"].append({"phase": "manifest", "error": str(exc)})
+    if verbose:
+        logger.info("ℹ️ Store repair checked %d entries, skipped %d already verified", result["checked"], result["skipped"])
     return result
 
 
-def clear_ge_store(context: Any, verbose: bool = False) -> dict:
+TOMBSTONE_MARKER = ".tombstone-"
+
+
+def _filesystem_store_dir(context: Any, store: Any) -> Optional[str]:
+    """Directory of a `TupleFilesystemStoreBackend` store, if it has one
+    of its own (never the project root itself)."""
+    backend = getattr(store, "store_backend", None)
+    directory = getattr(backend, "full_base_directory", None)
+    if not directory or "TupleFilesystemStoreBackend" not in {c.__name__ for c in type(backend).__mro__}:
+        return None
+    directory = os.path.abspath(directory)
+    root = getattr(context, "root_directory", None)
+    if root and directory == os.path.abspath(root):
+        return None
+    return directory
+
+
+def _remove_tombstones(paths: List[str]) -> None:
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _swap_out_directory(directory: str, backend: Any) -> List[str]:
+    """Replace `directory` with an empty one keeping the store backend id
+    file, and return the tombstone paths left to delete."""
+    token = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    staging = f"{directory}.new-{token}"
+    os.makedirs(staging)
+    id_file = backend.STORE_BACKEND_ID_KEY[0]
+    if os.path.exists(os.path.join(directory, id_file)):
+        shutil.copy2(os.path.join(directory, id_file), os.path.join(staging, id_file))
+    tombstone = f"{directory}{TOMBSTONE_MARKER}{token}"
+    try:
+        if os.path.exists(directory):
+            os.rename(directory, tombstone)
+        os.rename(staging, directory)
+    except OSError:
+        if not os.path.exists(directory) and os.path.exists(tombstone):
+            os.rename(tombstone, directory)
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    # Leftovers from earlier runs that exited before deleting theirs.
+    return glob.glob(glob.escape(directory) + TOMBSTONE_MARKER + "*")
+
+
+def clear_ge_store(context: Any, verbose: bool = False, bulk: bool = True) -> dict:
     """Conservatively clear GE stores: remove all entries from the
     ValidationDefinition and Checkpoint stores (and return a summary).
 
     This is a destructive operation and should only be used intentionally.
+
+    Filesystem-backed stores are cleared in bulk: the store directory is
+    renamed to a tombstone and replaced by an empty one (keeping its
+    `.ge_store_backend_id`), so the store is either fully cleared or left
+    untouched, and the tombstone is deleted on a background thread. Other
+    backends, or `bulk=False`, delete entry by entry through the store APIs.
     """
     result = {"validation_definitions_deleted": [], "checkpoints_deleted": [], "errors": []}
+    tombstones: List[str] = []
     try:
-        vd_mgr = getattr(context, "validation_definitions", None)
-        if vd_mgr is not None:
-            list_fn = getattr(vd_mgr, "list", None) or getattr(vd_mgr, "all", None) or getattr(vd_mgr, "list_keys", None)
-            delete_fn = getattr(vd_mgr, "delete", None)
-            if callable(list_fn) and callable(delete_fn):
+        for kind, store_attr, deleted_key, label in (
+            # Checkpoints first: they reference ValidationDefinitions.
+            ("checkpoints", "checkpoint_store", "checkpoints_deleted", "Checkpoint"),
+            ("validation_definitions", "validation_definition_store", "validation_definitions_deleted", "ValidationDefinition"),
+        ):
+            mgr = getattr(context, kind, None)
+            if mgr is None:
+                continue
+            store = getattr(context, store_attr, None)
+            directory = _filesystem_store_dir(context, store) if bulk else None
+            if directory is not None:
                 try:
-                    items = list_fn()
-                    keys = []
-                    if isinstance(items, dict):
-                        keys = list(items.keys())
-                    elif isinstance(items, list):
-                        for it in items:
-                            if isinstance(it, str):
-                                keys.append(it)
-                            else:
-                                try:
-                                    nm = getattr(it, "name", None) or (it.get("name") if isinstance(it, dict) else None)
-                                    if nm:
-                                        keys.append(nm)
-                                except Exception:
-                                    continue
-
-                    for key in keys:
-                        try:
-                            delete_fn(key)
-                            result["validation_definitions_deleted"].append(key)
-                            if verbose:
-                                logger.warning("Cleared ValidationDefinition from store: %s", key)
-                        except Exception as exc:
-                            result["errors"].append({"key": key, "error": str(exc)})
+                    keys = [k[0] for k in store.store_backend.list_keys() if len(k) == 1]
+                    tombstones.extend(_swap_out_directory(directory, store.store_backend))
+                    result[deleted_key].extend(keys)
+                    if verbose:
+                        logger.warning("Cleared %d %s entries from store: %s", len(keys), label, directory)
+                    continue
                 except Exception as exc:
-                    result["errors"].append({"phase": "vd_list", "error": str(exc)})
+                    logger.warning("Bulk clear of %s failed (%s); deleting entries one by one", directory, exc)
 
-        cp_mgr = getattr(context, "checkpoints", None)
-        if cp_mgr is not None:
-            list_fn = getattr(cp_mgr, "list", None) or getattr(cp_mgr, "all", None) or getattr(cp_mgr, "list_keys", None)
-            delete_fn = getattr(cp_mgr, "delete", None)
-            if callable(list_fn) and callable(delete_fn):
-                try:
-                    items = list_fn()
-                    keys = []
-                    if isinstance(items, dict):
-                        keys = list(items.keys())
-                    elif isinstance(items, list):
-                        for it in items:
-                            if isinstance(it, str):
-                                keys.append(it)
-                            else:
-                                try:
-                                    nm = getattr(it, "name", None) or (it.get("name") if isinstance(it, dict) else None)
-                                    if nm:
-                                        keys.append(nm)
-                                except Exception:
-                                    continue
-
-                    for key in keys:
+            delete_fn = getattr(mgr, "delete", None)
+            if not callable(delete_fn):
+                continue
+            try:
+                listed = _backend_names(store)
+                for key in listed if listed is not None else _listed_names(mgr):
+                    try:
                         try:
                             delete_fn(key)
-                            result["checkpoints_deleted"].append(key)
-                            if verbose:
-                                logger.warning("Cleared Checkpoint from store: %s", key)
-                        except Exception as exc:
-                            result["errors"].append({"key": key, "error": str(exc)})
-                except Exception as exc:
-                    result["errors"].append({"phase": "cp_list", "error": str(exc)})
+                        except Exception:
+                            # delete() deserializes the entry first.
+                            if listed is None:
+                                raise
+                            store.store_backend.remove_key((key,))
+                        result[deleted_key].append(key)
+                        if verbose:
+                            logger.warning("Cleared %s from store: %s", label, key)
+                    except Exception as exc:
+                        result["errors"].append({"key": key, "error": str(exc)})
+            except Exception as exc:
+                result["errors"].append({"phase": "vd_list" if kind == "validation_definitions" else "cp_list", "error": str(exc)})
     except Exception as exc_outer:
         result["errors"].append({"phase": "outer", "error": str(exc_outer)})
 
+    if tombstones:
+        threading.Thread(target=_remove_tombstones, args=(tombstones,), name="dq-store-tombstones").start()
     return result
 
 
-def create_and_run_checkpoint(context: Any, name: str, validation_definition: Any, actions: List[Any], result_format: Any, run_name: str | None = None, run_id: dict | None = None) -> Any:
+def create_and_run_checkpoint(context: Any, name: str, validation_definition: Any, actions: List[Any], result_format: Any, run_name: str | None = None, run_id: dict | None = None, batch_parameters: dict | None = None) -> Any:
     """Create or update a Checkpoint, run it, and return the results.
 
-    Great Expectations is imported at module level.
+    Great Expectations is imported at module level. `batch_parameters` is
+    forwarded to `Checkpoint.run()` (for example `{"dataframe": df}` for
+    dataframe-backed sources).
     """
 
     import importlib
@@ -221,15 +331,22 @@ def create_and_run_checkpoint(context: Any, name: str, validation_definition: An
 
         checkpoint = _LocalCheckpoint(name=name, validation_definitions=[validation_definition], actions=actions, result_format=result_format)
 
-    # Add or update the checkpoint in the context
-    try:
-        context.checkpoints.add_or_update(checkpoint=checkpoint)
-    except Exception:
-        logger.info("ℹ️ Checkpoint '%s' add_or_update failed; attempting to continue.", name)
+    # Add or update the checkpoint in the context, unless it (and what it
+    # references) is already stored unchanged.
+    stats = write_stats()
+    if checkpoint_unchanged(context, checkpoint):
+        stats.skipped("checkpoints")
+    else:
+        try:
+            context.checkpoints.add_or_update(checkpoint=checkpoint)
+            stats.written("checkpoints")
+        except Exception:
+            logger.info("ℹ️ Checkpoint '%s' add_or_update failed; attempting to continue.", name)
 
     # Prefer to pass a `run_id` mapping when available (richer metadata),
     # then `run_name`, and finally fall back to the no-arg call for older
     # implementations or lightweight test doubles.
+    bp = {"batch_parameters": batch_parameters} if batch_parameters else {}
     try:
         if run_id is not None:
             # Prefer passing a typed RunIdentifier if Great Expectations exposes
@@ -252,24 +369,24 @@ def create_and_run_checkpoint(context: Any, name: str, validation_definition: An
             # Some GE versions accept both `run_id` and `run_name` together;
             # try the richer call first so run_name is preserved in outputs.
             try:
-                results = checkpoint.run(run_id=run_id_to_pass, run_name=(getattr(run_id_to_pass, "run_name", None) if not isinstance(run_id_to_pass, dict) else run_id_to_pass.get("run_name")))
+                results = checkpoint.run(run_id=run_id_to_pass, run_name=(getattr(run_id_to_pass, "run_name", None) if not isinstance(run_id_to_pass, dict) else run_id_to_pass.get("run_name")), **bp)
             except TypeError:
                 try:
-                    results = checkpoint.run(run_id=run_id_to_pass)
+                    results = checkpoint.run(run_id=run_id_to_pass, **bp)
                 except TypeError:
                     try:
-                        results = checkpoint.run(run_name=(getattr(run_id_to_pass, "run_name", None) if not isinstance(run_id_to_pass, dict) else run_id_to_pass.get("run_name")))
+                        results = checkpoint.run(run_name=(getattr(run_id_to_pass, "run_name", None) if not isinstance(run_id_to_pass, dict) else run_id_to_pass.get("run_name")), **bp)
                     except TypeError:
                         results = checkpoint.run()
         else:
             try:
-                results = checkpoint.run(run_id={"run_name": run_name, "run_time": None}, run_name=run_name)
+                results = checkpoint.run(run_id={"run_name": run_name, "run_time": None}, run_name=run_name, **bp)
             except TypeError:
                 try:
-                    results = checkpoint.run(run_name=run_name)
+                    results = checkpoint.run(run_name=run_name, **bp)
                 except TypeError:
                     try:
-                        results = checkpoint.run(run_id={"run_name": run_name, "run_time": None})
+                        results = checkpoint.run(run_id={"run_name": run_name, "run_time": None}, **bp)
                     except TypeError:
                         results = checkpoint.run()
     except Exception:
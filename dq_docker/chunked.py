@@ -0,0 +1,201 @@
+"""Chunked validation of sources larger than the memory budget.
+
+A CSV/Parquet source whose estimate alone exceeds `DQ_MEMORY_BUDGET` is
+read `chunk_rows` rows at a time (see `dq_docker.validator`). Each chunk
+is validated without touching the stores; `ChunkResults` then folds the
+chunk results into one result per expectation (counts summed, percentages
+recomputed, partial lists capped) and judges each expectation again from
+the summed counts and its `mostly`, the way Great Expectations judges the
+whole table. The result is stored once and followed by a single Data Docs
+rebuild.
+
+Only expectations that judge every row on its own can be folded this way.
+Suites with any other expectation (uniqueness, row counts, aggregate
+statistics) cannot be chunked; `table_level_expectations` lists them so
+the source can be failed instead of being judged per chunk.
+"""
+from __future__ import annotations
+
+import datetime
+from typing import Any, Dict, List, Optional
+
+from great_expectations.core.run_identifier import RunIdentifier
+from great_expectations.data_context.types.resource_identifiers import ExpectationSuiteIdentifier, ValidationResultIdentifier
+
+from .logs import get_logger
+from .quarantine import ROW_CHECKS, expectation_spec
+
+logger = get_logger(__name__)
+
+# Expectations whose outcome over a table is the conjunction of their
+# outcome over any split of its rows.
+CHUNK_SAFE_EXPECTATIONS = (frozenset(ROW_CHECKS) - {"expect_column_values_to_be_unique"}) | {
+    "expect_column_to_exist",
+    "expect_table_columns_to_match_ordered_list",
+    "expect_table_columns_to_match_set",
+}
+_SUMMED = ("element_count", "missing_count", "unexpected_count")
+_LISTS = ("partial_unexpected_list", "partial_unexpected_index_list")
+PARTIAL_LIST_LIMIT = 20
+
+
+def table_level_expectations(suite: Any) -> List[str]:
+    """Types of the expectations of `suite` that cannot be evaluated per chunk."""
+    kinds = []
+    for expectation in list(getattr(suite, "expectations", None) or []):
+        kind, _ = expectation_spec(expectation)
+        if kind not in CHUNK_SAFE_EXPECTATIONS:
+            kinds.append(str(kind))
+    return kinds
+
+
+def validate_chunk(validation_definition: Any, chunk: Any, result_format: Any = None) -> Any:
+    """Validate one dataframe chunk with `Batch.validate`, which stores
+    no result.
+
+    Objects that are not Great Expectations ValidationDefinitions (no
+    `batch_definition`/`suite`) are run directly.
+    """
+    bp = {"dataframe": chunk}
+    batch_definition = getattr(validation_definition, "batch_definition", None)
+    suite = getattr(validation_definition, "suite", None)
+    if batch_definition is None or suite is None:
+        return validation_definition.run(batch_parameters=bp)
+    rf = {"result_format": result_format} if result_format else {}
+    return batch_definition.get_batch(batch_parameters=bp).validate(suite, **rf)
+
+
+def _fold(total: Dict[str, Any], part: Dict[str, Any]) -> None:
+    for key in _SUMMED:
+        if key in part:
+            total[key] = int(total.get(key) or 0) + int(part[key] or 0)
+    for key in _LISTS:
+        if key in part:
+            total[key] = (list(total.get(key) or []) + list(part[key] or []))[:PARTIAL_LIST_LIMIT]
+    total.pop("partial_unexpected_counts", None)
+    for key, value in part.items():
+        if key not in _SUMMED and key not in _LISTS and key != "partial_unexpected_counts":
+            total[key] = value
+
+
+def _percentages(result: Dict[str, Any]) -> None:
+    elements = int(result.get("element_count") or 0)
+    unexpected = int(result.get("unexpected_count") or 0)
+    if not elements or "unexpected_count" not in result:
+        return
+    if "missing_count" in result:
+        missing = int(result.get("missing_count") or 0)
+        nonmissing = elements - missing
+        result["missing_percent"] = 100.0 * missing / elements
+        result["unexpected_percent_total"] = 100.0 * unexpected / elements
+        result["unexpected_percent_nonmissing"] = 100.0 * unexpected / nonmissing if nonmissing else None
+        result["unexpected_percent"] = result["unexpected_percent_nonmissing"]
+    else:
+        result["unexpected_percent"] = 100.0 * unexpected / elements
+
+
+def _judge(expectation_result: Any) -> None:
+    """Set the success of a folded column map result from its counts."""
+    result = expectation_result.result or {}
+    if "unexpected_count" not in result or "element_count" not in result:
+        return
+    if (expectation_result.exception_info or {}).get("raised_exception"):
+        return
+    kwargs = getattr(expectation_result.expectation_config, "kwargs", None) or {}
+    mostly = kwargs.get("mostly")
+    mostly = 1.0 if mostly is None else float(mostly)
+    considered = int(result["element_count"] or 0) - int(result.get("missing_count") or 0)
+    unexpected = int(result["unexpected_count"] or 0)
+    # As Great Expectations: no rows to judge is a success.
+    expectation_result.success = considered <= 0 or (considered - unexpected) / considered >= mostly
+
+
+class ChunkResults:
+    """Accumulates chunk results into one suite validation result."""
+
+    def __init__(self) -> None:
+        self.chunks = 0
+        self.success = True
+        self._combined: Any = None
+
+    def add(self, result: Any) -> bool:
+        """Fold a chunk result in; returns that chunk's success.
+
+        A chunk without a result fails the source. Great Expectations
+        results are judged again by `combined()`; other results (plain
+        mappings) only count through their own success.
+        """
+        self.chunks += 1
+        if isinstance(result, dict):
+            success = bool(result.get("success"))
+        else:
+            success = bool(getattr(result, "success", False))
+        if result is None or isinstance(result, dict) or isinstance(self._combined, dict):
+            self.success = self.success and success
+        if result is None:
+            return success
+        if self._combined is None:
+            self._combined = result
+            return success
+        if isinstance(result, dict) or isinstance(self._combined, dict):
+            return success
+        for total, part in zip(self._combined.results, result.results):
+            total.success = bool(total.success and part.success)
+            _fold(total.result, dict(part.result or {}))
+            if not (total.exception_info or {}).get("raised_exception") and (part.exception_info or {}).get("raised_exception"):
+                total.exception_info = part.exception_info
+        return success
+
+    def combined(self) -> Any:
+        """The combined result (None when no chunk produced one). Also
+        settles `success` for the whole source."""
+        result = self._combined
+        if result is None or isinstance(result, dict):
+            return result
+        for expectation_result in result.results:
+            _percentages(expectation_result.result)
+            _judge(expectation_result)
+        evaluated = len(result.results)
+        successful = sum(1 for r in result.results if r.success)
+        self.success = self.success and successful == evaluated
+        result.success = self.success
+        result.statistics = {
+            "evaluated_expectations": evaluated,
+            "successful_expectations": successful,
+            "unsuccessful_expectations": evaluated - successful,
+            "success_percent": 100.0 * successful / evaluated if evaluated else None,
+        }
+        result.meta["chunks"] = self.chunks
+        return result
+
+
+def store_result(context: Any, validation_definition: Any, result: Any, run_id: Optional[Dict[str, Any]] = None) -> bool:
+    """Store a combined suite result like `ValidationDefinition.run()` does.
+
+    Returns False when `result` is not a Great Expectations result or the
+    context has no validation results store.
+    """
+    store = getattr(context, "validation_results_store", None)
+    if store is None or result is None or isinstance(result, dict):
+        return False
+    run_id = run_id or {}
+    identifier = RunIdentifier(
+        run_name=run_id.get("run_name"),
+        run_time=run_id.get("run_time") or datetime.datetime.now(datetime.timezone.utc),
+    )
+    result.meta["validation_id"] = getattr(validation_definition, "id", None)
+    result.meta["checkpoint_id"] = None
+    result.meta["run_id"] = identifier
+    result.meta["validation_time"] = identifier.run_time
+    result.meta["batch_parameters"] = {"dataframe": "<DATAFRAME>"}
+    suite_identifier = ExpectationSuiteIdentifier(name=validation_definition.suite.name)
+    store.store_validation_results(
+        suite_validation_result=result,
+        suite_validation_result_identifier=ValidationResultIdentifier(
+            expectation_suite_identifier=suite_identifier,
+            run_id=identifier,
+            batch_identifier=result.batch_id,
+        ),
+        expectation_suite_identifier=suite_identifier,
+    )
+    return True
@@ -1,4 +1,7 @@
-from typing import Any, Optional
+import os
+import uuid
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Optional
 from .logs import get_logger
 
 logger = get_logger(__name__)
@@ -6,6 +9,12 @@ logger = get_logger(__name__)
 # Eager import: require Great Expectations at module import time
 import great_expectations as gx
 
+# Stores held in memory by an ephemeral run and flushed back afterwards.
+EPHEMERAL_STORES = ("expectations_store", "validation_definition_store", "checkpoint_store", "validation_results_store")
+# Stores copied into memory when the run starts. Validation results are
+# only ever added, so they are not loaded.
+SEEDED_STORES = ("expectations_store", "validation_definition_store", "checkpoint_store")
+
 
 def get_context(project_root: str) -> Optional[Any]:
     """Initialize or load a FileDataContext rooted at `project_root`.
@@ -14,7 +23,243 @@ def get_context(project_root: str) -> Optional[Any]:
     """
     try:
         ctx = gx.get_context(mode="file", project_root_dir=project_root)
-        return ctx
     except Exception as exc:
         logger.error("Failed to initialize/load GE context at %s: %s", project_root, exc)
         raise
+    return ctx
+
+
+def _fluent_section(context: Any) -> Dict[str, Any]:
+    """The `fluent_datasources` section for the datasources of `context`,
+    nested by name like Great Expectations writes it."""
+    import json
+
+    section: Dict[str, Any] = {}
+    for name, ds in context.data_sources.all().items():
+        doc = json.loads(ds.json())
+        doc.pop("name", None)
+        assets = {}
+        for asset in doc.pop("assets", None) or []:
+            asset_name = asset.pop("name")
+            definitions = {}
+            for definition in asset.pop("batch_definitions", None) or []:
+                definitions[definition.pop("name")] = definition
+            if definitions:
+                asset["batch_definitions"] = definitions
+            assets[asset_name] = asset
+        if assets:
+            doc["assets"] = assets
+        section[name] = doc
+    return section
+
+
+def save_project_config(context: Any, loaded: Optional[Iterable[str]] = None) -> bool:
+    """Write `great_expectations.yml` for `context` atomically.
+
+    The file is rendered from the public project config and the context's
+    datasources, merged with datasources another runner added on disk
+    since (names in `loaded`, the ones this context started with, are
+    left out: a missing one was deleted on purpose), written to a
+    temporary file and swapped in with `os.replace`, so readers never see
+    a partial file. Returns False when the file could not be written.
+    """
+    from ruamel.yaml import YAML
+
+    root = getattr(context, "root_directory", None)
+    if not root:
+        return False
+    path = os.path.join(root, getattr(context, "GX_YML", "great_expectations.yml"))
+    loaded = set(loaded or ())
+
+    yaml = YAML()
+    config = yaml.load(context.variables.config.to_yaml_str())
+    ours = _fluent_section(context)
+    try:
+        with open(path) as fh:
+            on_disk = yaml.load(fh) or {}
+    except (OSError, ValueError) as exc:
+        logger.debug("Could not re-read %s before saving: %s", path, exc)
+        on_disk = {}
+    for name, datasource in (on_disk.get("fluent_datasources") or {}).items():
+        if name not in ours and name not in loaded:
+            ours[name] = datasource
+    config.pop("fluent_datasources", None)
+    if ours:
+        config["fluent_datasources"] = ours
+
+    tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "w") as fh:
+            yaml.dump(config, fh)
+        os.replace(tmp, path)
+    except PermissionError as exc:
+        logger.warning("Could not save project config to disk: %s", exc)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def context_mode() -> str:
+    """`DQ_CONTEXT_MODE`: `file` (default) or `ephemeral`."""
+    mode = str(os.environ.get("DQ_CONTEXT_MODE", "file") or "file").strip().lower()
+    if mode not in ("file", "ephemeral"):
+        logger.warning("Ignoring unknown DQ_CONTEXT_MODE=%r; using the file context", mode)
+        return "file"
+    return mode
+
+
+def _store_entries(backend: Any) -> Dict[tuple, Any]:
+    return {tuple(k): backend.get(tuple(k)) for k in backend.list_keys() if tuple(k) != backend.STORE_BACKEND_ID_KEY}
+
+
+def _datasources_json(context: Any) -> Dict[str, str]:
+    return {name: ds.json() for name, ds in context.data_sources.all().items()}
+
+
+class EphemeralProject:
+    """An in-memory copy of a file project for the duration of a run.
+
+    The `EphemeralDataContext` in `.context` is built from the file
+    project's configuration with every store on an `InMemoryStoreBackend`,
+    seeded with the file project's datasources, suites,
+    ValidationDefinitions and checkpoints. Registrations and validation
+    results during the run stay in memory (Data Docs are still written to
+    the file project's sites). `flush()` writes back only what changed
+    since the context was seeded (or last flushed): new validation results,
+    new or changed suites, definitions, checkpoints and datasources (the latter in one
+    atomic `save_project_config`), and
+    removals, then rebuilds Data Docs from the file project when results
+    were written (the run's own rebuilds only know its results). Store
+    backends with `batch()` (for example
+    `dq_docker.sqlite_store`) receive the whole flush in one transaction.
+    """
+
+    def __init__(self, file_context: Any):
+        self.file_context = file_context
+        config = file_context.get_config().to_json_dict()
+        config.pop("fluent_datasources", None)
+        for store in (config.get("stores") or {}).values():
+            store["store_backend"] = {"class_name": "InMemoryStoreBackend"}
+        config["plugins_directory"] = None
+        config["config_variables_file_path"] = None
+        root = file_context.root_directory
+        for site in (config.get("data_docs_sites") or {}).values():
+            backend = site.get("store_backend") or {}
+            base = backend.get("base_directory")
+            if backend.get("class_name") == "TupleFilesystemStoreBackend" and base and not os.path.isabs(base):
+                backend["base_directory"] = os.path.join(root, base)
+
+        from great_expectations.data_context.types.base import DataContextConfig
+
+        self.context = gx.get_context(mode="ephemeral", project_config=DataContextConfig(**config))
+
+        for ds in file_context.data_sources.all().values():
+            seeded = self.context._add_fluent_datasource(datasource=type(ds).parse_raw(ds.json()), save_changes=False)
+            # Copies come without data connectors; file assets need them.
+            seeded._rebuild_asset_data_connectors()
+        self._datasources = _datasources_json(self.context)
+        self._file_datasources = set(self._datasources)
+
+        self._seen: Dict[str, Dict[tuple, Any]] = {}
+        for name in EPHEMERAL_STORES:
+            target = getattr(self.context, name).store_backend
+            entries = _store_entries(getattr(file_context, name).store_backend) if name in SEEDED_STORES else {}
+            for key, value in entries.items():
+                target.set(key, value)
+            self._seen[name] = entries
+        logger.info(
+            "ℹ️ Ephemeral context seeded with %d datasource(s) and %d store entries from %s",
+            len(self._datasources), sum(len(v) for v in self._seen.values()), root,
+        )
+
+    def pending(self) -> Dict[str, Dict[str, Any]]:
+        """Entries to write (`set`) and delete (`remove`) per store."""
+        changes = {}
+        for name in EPHEMERAL_STORES:
+            current = _store_entries(getattr(self.context, name).store_backend)
+            seen = self._seen[name]
+            changes[name] = {
+                "set": {k: v for k, v in current.items() if seen.get(k) != v},
+                "remove": [k for k in seen if k not in current] if name in SEEDED_STORES else [],
+            }
+        return changes
+
+    def flush(self) -> dict:
+        """Write what changed during the run to the file project."""
+        summary: Dict[str, Any] = {"datasources": 0, "errors": []}
+        current = _datasources_json(self.context)
+        changed = {}
+        for name, doc in current.items():
+            if self._datasources.get(name) == doc:
+                continue
+            try:
+                ds = self.context.data_sources.all()[name]
+                # Held in memory only; written below in one atomic save.
+                self.file_context.data_sources.all().set_datasource(name, type(ds).parse_raw(doc))
+                changed[name] = doc
+            except Exception as exc:
+                summary["errors"].append({"datasource": name, "error": str(exc)})
+        if changed:
+            try:
+                if save_project_config(self.file_context, loaded=self._file_datasources):
+                    self._datasources.update(changed)
+                    summary["datasources"] = len(changed)
+                else:
+                    summary["errors"].append({"datasources": "project config not writable"})
+            except Exception as exc:
+                summary["errors"].append({"datasources": str(exc)})
+                logger.error("❌ Could not save datasources to the file project: %s", exc)
+
+        for name, change in self.pending().items():
+            backend = getattr(self.file_context, name).store_backend
+            written = removed = 0
+            batch = getattr(backend, "batch", None)
+            try:
+                with batch() if callable(batch) else nullcontext():
+                    set_many = getattr(backend, "set_many", None)
+                    if callable(set_many):
+                        written = set_many(change["set"].items())
+                    else:
+                        for key, value in change["set"].items():
+                            backend.set(key, value)
+                            written += 1
+                    for key in change["remove"]:
+                        backend.remove_key(key)
+                        removed += 1
+            except Exception as exc:
+                summary["errors"].append({"store": name, "error": str(exc)})
+                logger.error("❌ Could not flush %s to the file project: %s", name, exc)
+                continue
+            if name in SEEDED_STORES:
+                seen = self._seen[name]
+                seen.update(change["set"])
+                for key in change["remove"]:
+                    seen.pop(key, None)
+            else:
+                # Flushed results are not needed in memory any more.
+                memory = getattr(self.context, name).store_backend
+                for key in change["set"]:
+                    memory.remove_key(key)
+            summary[name] = {"written": written, "removed": removed}
+
+        # The run rebuilt Data Docs from its in-memory results only, which
+        # removes the pages of every earlier run from the sites; rebuild
+        # them from the file project now that it has all results.
+        if (summary.get("validation_results_store") or {}).get("written"):
+            try:
+                self.file_context.build_data_docs()
+                summary["data_docs"] = "rebuilt"
+            except Exception as exc:
+                summary["errors"].append({"data_docs": str(exc)})
+                logger.error("❌ Could not rebuild Data Docs from the file project: %s", exc)
+        logger.info("✅ Flushed ephemeral context: %s", summary)
+        return summary
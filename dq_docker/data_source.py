@@ -77,8 +77,25 @@ def find_datasource(ctx: Any, name: str) -> Optional[Any]:
     return None
 
 
+def filesystem_base_matches(ctx: Any, name: str, base_directory: str) -> bool:
+    """False when a pandas_filesystem datasource `name` exists with another
+    base_directory (for example a different runner's mount point)."""
+    ds = find_datasource(ctx, name)
+    if getattr(ds, "type", None) != "pandas_filesystem":
+        return True
+    existing_base = getattr(ds, "base_directory", None)
+    if not existing_base or not base_directory:
+        return True
+    return os.path.abspath(str(existing_base)) == os.path.abspath(str(base_directory))
+
+
 def ensure_pandas_filesystem(ctx: Any, name: str, base_directory: str) -> Any:
     ds = find_datasource(ctx, name)
+    kind = getattr(ds, "type", None) if ds else None
+    if kind is not None and kind != "pandas_filesystem":
+        # Never replace a datasource of another kind: its assets and the
+        # ValidationDefinitions referencing them would be lost.
+        raise ValueError(f"Data source '{name}' exists with type '{kind}', expected 'pandas_filesystem'")
     if ds:
         # If an existing datasource points at a different base_directory
         # (for example when great_expectations.yml contains container paths),
@@ -161,3 +178,60 @@ def ensure_csv_asset(ds: Any, name: str) -> Any:
         logger.info("✅ Asset '%s' already exists on datasource.", name)
         return asset
     return ds.add_csv_asset(name=name)
+
+
+# Supported values for the per-source `asset_type` key. `delta` and
+# `directory` sources are loaded by `dq_docker.readers` and validated
+# through a pandas dataframe asset.
+ASSET_TYPES = ("csv", "parquet", "delta", "directory")
+FRAME_ASSET_TYPES = ("delta", "directory")
+FRAME_DATASOURCE_SUFFIX = "__frame"
+
+
+def frame_datasource_name(name: str, asset_type: str) -> str:
+    """Name of the runtime `pandas` datasource validating source `name`.
+
+    Delta and directory sources are always dataframes and use the source
+    name. CSV/Parquet sources loaded as dataframes (remote, chunked,
+    quarantined, parse-cached) get their own datasource so the source's
+    `pandas_filesystem` datasource is never replaced.
+    """
+    if asset_type in FRAME_ASSET_TYPES:
+        return name
+    return f"{name}{FRAME_DATASOURCE_SUFFIX}"
+
+
+def ensure_pandas_datasource(ctx: Any, name: str) -> Any:
+    """Return a runtime `pandas` datasource, replacing any datasource of a
+    different type registered under the same name."""
+    ds = find_datasource(ctx, name)
+    if ds and getattr(ds, "type", None) == "pandas":
+        logger.info("✅ Data source '%s' already exists.", name)
+        return ds
+    if ds:
+        logger.info("Data source '%s' exists with a different type; recreating as pandas", name)
+        try:
+            ctx.data_sources.delete(name)
+        except Exception:
+            pass
+    logger.info("Adding pandas datasource '%s'", name)
+    return ctx.data_sources.add_pandas(name=name)
+
+
+def ensure_asset(ds: Any, name: str, asset_type: str = "csv", **reader_options: Any) -> Any:
+    """Return the asset `name`, creating the GE asset matching `asset_type`.
+
+    `reader_options` are forwarded to `add_csv_asset`/`add_parquet_asset`.
+    `asset_type="dataframe"` requests a runtime dataframe asset directly.
+    """
+    if asset_type not in ASSET_TYPES and asset_type != "dataframe":
+        raise ValueError(f"Unsupported asset_type '{asset_type}'; expected one of {list(ASSET_TYPES)}")
+    asset = find_asset(ds, name)
+    if asset:
+        logger.info("✅ Asset '%s' already exists on datasource.", name)
+        return asset
+    if asset_type == "csv":
+        return ds.add_csv_asset(name=name, **reader_options)
+    if asset_type == "parquet":
+        return ds.add_parquet_asset(name=name, **reader_options)
+    return ds.add_dataframe_asset(name=name)
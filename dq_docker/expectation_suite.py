@@ -3,6 +3,7 @@ from types import SimpleNamespace
 import importlib
 
 from .logs import get_logger
+from .store_writes import unchanged, write_stats
 
 logger = get_logger(__name__)
 
@@ -73,11 +74,17 @@ def add_suite_to_context(context: Any, suite: Any, name: str) -> Any:
     the DataContext manages (avoids GE errors that require the suite to be
     added to the context before updates).
     """
-    try:
-        context.suites.add(suite)
-        logger.info("✅ Expectation Suite '%s' added to context.", name)
-    except Exception:
-        logger.info("ℹ️ Expectation Suite '%s' may already exist; attempting to reuse.", name)
+    stats = write_stats()
+    if unchanged(getattr(context, "expectations_store", None), name, suite, kind="suites") is not None:
+        # Identical to the stored suite: skip the write.
+        stats.skipped("suites")
+    else:
+        try:
+            context.suites.add(suite)
+            stats.written("suites")
+            logger.info("✅ Expectation Suite '%s' added to context.", name)
+        except Exception:
+            logger.info("ℹ️ Expectation Suite '%s' may already exist; attempting to reuse.", name)
 
     # Try to return the suite object managed by the context (if available).
     try:
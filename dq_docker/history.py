@@ -0,0 +1,206 @@
+"""Append-only run-history index.
+
+Questions such as "which sources failed most in the last 30 days" or "how
+long did the customers validation take over time" should not require
+walking the validation results store. Every `dq-docker-run` therefore
+appends to a small SQLite database:
+
+- `runs`: one row per invocation (start/finish time, host);
+- `source_runs`: one row per validated source (or partition) with load and
+  validation timings, success, error, input location and fingerprint;
+- `expectation_runs`: one row per evaluated expectation with success,
+  element/unexpected counts and the source's validation time.
+
+Rows are only ever inserted. Great Expectations does not time individual
+expectations, so expectation rows carry the timing of the validation they
+were part of. Queries are served by indexes on time, source and expectation
+type; see `dq_docker.history_cli` (`dq-history`).
+
+The database lives at `DQ_HISTORY_DB` (default
+`<project root>/gx/uncommitted/run_history.sqlite`); `DQ_HISTORY=0`
+disables recording.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+HISTORY_FILENAME = "run_history.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    host TEXT,
+    run_name TEXT
+);
+CREATE TABLE IF NOT EXISTS source_runs (
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    partition_key TEXT,
+    suite TEXT,
+    started_at REAL NOT NULL,
+    load_seconds REAL,
+    validation_seconds REAL,
+    duration_seconds REAL,
+    success INTEGER NOT NULL,
+    error TEXT,
+    asset_type TEXT,
+    location TEXT,
+    input_fingerprint TEXT,
+    chunks INTEGER
+);
+CREATE INDEX IF NOT EXISTS source_runs_time ON source_runs (started_at);
+CREATE INDEX IF NOT EXISTS source_runs_source ON source_runs (source, started_at);
+CREATE TABLE IF NOT EXISTS expectation_runs (
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    partition_key TEXT,
+    suite TEXT,
+    started_at REAL NOT NULL,
+    expectation_type TEXT,
+    column_name TEXT,
+    success INTEGER,
+    element_count INTEGER,
+    unexpected_count INTEGER,
+    unexpected_percent REAL,
+    validation_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS expectation_runs_time ON expectation_runs (started_at);
+CREATE INDEX IF NOT EXISTS expectation_runs_source ON expectation_runs (source, started_at);
+CREATE INDEX IF NOT EXISTS expectation_runs_type ON expectation_runs (expectation_type, started_at);
+"""
+
+
+def default_history_path(project_root: Optional[str] = None) -> str:
+    """Return `DQ_HISTORY_DB`, or the default path below `project_root`."""
+    configured = os.environ.get("DQ_HISTORY_DB")
+    if configured:
+        return configured
+    if project_root is None:
+        from .config import gx_config as cfg
+
+        project_root = cfg.PROJECT_ROOT
+    return os.path.join(project_root, "gx", "uncommitted", HISTORY_FILENAME)
+
+
+def history_enabled() -> bool:
+    return str(os.environ.get("DQ_HISTORY", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def fingerprint_digest(location: Optional[str]) -> Optional[str]:
+    """Short digest of the input fingerprint (sizes and mtimes or ETags)."""
+    if not location:
+        return None
+    from .parse_cache import input_fingerprint
+
+    fingerprint = input_fingerprint(location)
+    if fingerprint is None:
+        return None
+    return hashlib.sha1(json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _as_document(validation_results: Any) -> Dict[str, Any]:
+    to_json = getattr(validation_results, "to_json_dict", None)
+    if callable(to_json):
+        return to_json()
+    return dict(validation_results) if isinstance(validation_results, dict) else {}
+
+
+class RunHistory:
+    """Writer (and query helper) for one run-history database."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.run_id: Optional[str] = None
+
+    def start_run(self, run_name: Optional[str] = None) -> str:
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, started_at, host, run_name) VALUES (?, ?, ?, ?)",
+                (self.run_id, time.time(), socket.gethostname(), run_name),
+            )
+        return self.run_id
+
+    def finish_run(self) -> None:
+        if self.run_id is None:
+            return
+        with self._lock, self._conn:
+            # The only update: closing the run row this process opened.
+            self._conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ? AND finished_at IS NULL", (time.time(), self.run_id))
+
+    def record_source(
+        self,
+        source: str,
+        outcome: Dict[str, Any],
+        started_at: float,
+        duration: float,
+        partition_key: Optional[str] = None,
+        suite: Optional[str] = None,
+        load_seconds: Optional[float] = None,
+        validation_seconds: Optional[float] = None,
+        asset_type: Optional[str] = None,
+        location: Optional[str] = None,
+        validation_results: Optional[List[Any]] = None,
+    ) -> None:
+        """Append the rows for one validated source (or partition)."""
+        if self.run_id is None:
+            self.start_run()
+        expectation_rows = []
+        for vr in validation_results or []:
+            for res in _as_document(vr).get("results") or []:
+                config = res.get("expectation_config") or {}
+                result = res.get("result") or {}
+                expectation_rows.append((
+                    self.run_id, source, partition_key, suite, started_at,
+                    config.get("type") or config.get("expectation_type"),
+                    (config.get("kwargs") or {}).get("column"),
+                    None if res.get("success") is None else int(bool(res.get("success"))),
+                    result.get("element_count"),
+                    result.get("unexpected_count"),
+                    result.get("unexpected_percent"),
+                    validation_seconds,
+                ))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO source_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.run_id, source, partition_key, suite, started_at, load_seconds, validation_seconds, duration,
+                    int(bool(outcome.get("success"))), outcome.get("error"), asset_type, location,
+                    fingerprint_digest(location), outcome.get("chunks"),
+                ),
+            )
+            self._conn.executemany("INSERT INTO expectation_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", expectation_rows)
+
+    def record_failure(self, source: str, error: str, partition_key: Optional[str] = None) -> None:
+        """Append a source that failed before it could be validated."""
+        self.record_source(source, {"success": False, "error": error}, time.time(), 0.0, partition_key=partition_key)
+
+    def query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            cur = self._conn.execute(sql, params)
+            names = [d[0] for d in cur.description or ()]
+            return [dict(zip(names, row)) for row in cur.fetchall()]
+
+    def close(self) -> None:
+        self._conn.close()
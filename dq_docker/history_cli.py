@@ -0,0 +1,138 @@
+"""`dq-history`: query the run-history index.
+
+Examples::
+
+    dq-history runs --limit 10
+    dq-history failures --days 30
+    dq-history durations ds_customers --days 90
+    dq-history expectations --source ds_customers --days 30
+    dq-history sql "SELECT source, COUNT(*) FROM source_runs GROUP BY source"
+
+Reads the database written by `dq-docker-run` (`DQ_HISTORY_DB`, default
+`<project root>/gx/uncommitted/run_history.sqlite`, see
+`dq_docker.history`). Add `--json` for machine-readable output.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .history import default_history_path
+
+QUERIES = {
+    "runs": (
+        "SELECT r.run_id, datetime(r.started_at, 'unixepoch') AS started, "
+        "ROUND(r.finished_at - r.started_at, 2) AS seconds, r.run_name, "
+        "COUNT(s.source) AS sources, COALESCE(SUM(1 - s.success), 0) AS failed "
+        "FROM runs r LEFT JOIN source_runs s ON s.run_id = r.run_id "
+        "GROUP BY r.run_id ORDER BY r.started_at DESC LIMIT :limit"
+    ),
+    "failures": (
+        "SELECT source, COUNT(*) AS runs, SUM(1 - success) AS failed, "
+        "ROUND(100.0 * SUM(1 - success) / COUNT(*), 1) AS failed_pct, "
+        "datetime(MAX(CASE WHEN success = 0 THEN started_at END), 'unixepoch') AS last_failure "
+        "FROM source_runs WHERE started_at >= :since "
+        "GROUP BY source HAVING failed > 0 ORDER BY failed DESC, source LIMIT :limit"
+    ),
+    "durations": (
+        "SELECT datetime(started_at, 'unixepoch') AS started, partition_key, "
+        "ROUND(load_seconds, 3) AS load_s, ROUND(validation_seconds, 3) AS validation_s, "
+        "ROUND(duration_seconds, 3) AS total_s, success, input_fingerprint "
+        "FROM source_runs WHERE source = :source AND started_at >= :since "
+        "ORDER BY started_at DESC LIMIT :limit"
+    ),
+    "expectations": (
+        "SELECT source, expectation_type, column_name, COUNT(*) AS evaluated, "
+        "SUM(1 - success) AS failed, SUM(COALESCE(unexpected_count, 0)) AS unexpected "
+        "FROM expectation_runs WHERE started_at >= :since AND (:source IS NULL OR source = :source) "
+        "GROUP BY source, expectation_type, column_name HAVING failed > 0 "
+        "ORDER BY failed DESC, unexpected DESC LIMIT :limit"
+    ),
+}
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    if not os.path.exists(path):
+        raise RuntimeError(f"No run history at {path}; run dq-docker-run first or set DQ_HISTORY_DB")
+    # Read-only: the CLI never modifies the index.
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def run_query(path: str, sql: str, params: Optional[Dict[str, Any]] = None) -> Tuple[List[str], List[tuple]]:
+    conn = _connect(path)
+    try:
+        cur = conn.execute(sql, params or {})
+        return [d[0] for d in cur.description or ()], cur.fetchall()
+    finally:
+        conn.close()
+
+
+def _format_table(columns: List[str], rows: List[tuple]) -> str:
+    cells = [[("" if v is None else str(v)) for v in row] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells)
+    return "\n".join(lines)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="dq-history", description="Query the dq_docker run-history index.")
+    parser.add_argument("--db", default=None, help="history database (default DQ_HISTORY_DB or gx/uncommitted/run_history.sqlite)")
+    parser.add_argument("--json", action="store_true", help="print rows as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    runs = sub.add_parser("runs", help="most recent runs")
+    runs.add_argument("--limit", type=int, default=20)
+
+    failures = sub.add_parser("failures", help="sources that failed most often")
+    failures.add_argument("--days", type=float, default=30)
+    failures.add_argument("--limit", type=int, default=20)
+
+    durations = sub.add_parser("durations", help="timings of one source over time")
+    durations.add_argument("source")
+    durations.add_argument("--days", type=float, default=30)
+    durations.add_argument("--limit", type=int, default=100)
+
+    expectations = sub.add_parser("expectations", help="expectations that failed most often")
+    expectations.add_argument("--source", default=None)
+    expectations.add_argument("--days", type=float, default=30)
+    expectations.add_argument("--limit", type=int, default=20)
+
+    sql = sub.add_parser("sql", help="run a read-only SQL query")
+    sql.add_argument("query")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    path = args.db or default_history_path()
+
+    if args.command == "sql":
+        sql, params = args.query, {}
+    else:
+        sql = QUERIES[args.command]
+        params = {"limit": args.limit, "source": getattr(args, "source", None)}
+        if hasattr(args, "days"):
+            params["since"] = time.time() - args.days * 86400
+
+    try:
+        columns, rows = run_query(path, sql, params)
+    except (RuntimeError, sqlite3.Error) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps([dict(zip(columns, row)) for row in rows], indent=2, default=str))
+    else:
+        print(_format_table(columns, rows))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,255 @@
+"""Memory governor: admission control for concurrently loaded sources.
+
+A couple of large files validated at the same time (partitions running on
+worker threads, or sources loaded ahead by the prefetch pipeline) can
+exceed the container's memory limit. With `DQ_MEMORY_BUDGET` set, the
+orchestrator:
+
+- estimates each source's peak footprint (`estimate_peak`) from its size
+  on disk (or the remote object's size), the column types declared in its contract and its reader
+  options (`usecols`, compression);
+- admits sources through a `MemoryGovernor` only while the sum of the
+  estimates of running sources fits the budget;
+- switches sources whose estimate alone exceeds the budget to chunked
+  evaluation (`chunk_rows`), validating the file chunk by chunk (see
+  `dq_docker.chunked`).
+
+`DQ_MEMORY_BUDGET` is either a fraction of the container memory limit
+(`0.7`; the cgroup v2/v1 limit, or physical memory when unlimited) or an
+absolute number of bytes. Unset disables the governor.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from .compression import compression_from_extension, sniff_local
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+CGROUP_V2_LIMIT = "/sys/fs/cgroup/memory.max"
+CGROUP_V1_LIMIT = "/sys/fs/cgroup/memory/memory.limit_in_bytes"
+# cgroup v1 reports "unlimited" as a huge page-aligned number.
+_UNLIMITED = 1 << 60
+
+# Average CSV text width and in-memory pandas size (bytes) per declared
+# ODCS column type. Strings are Python objects (~50 bytes of overhead).
+TEXT_WIDTH = {"integer": 8, "number": 12, "boolean": 5, "date": 11, "timestamp": 25, "string": 16}
+MEMORY_WIDTH = {"integer": 8, "number": 8, "boolean": 1, "date": 8, "timestamp": 8, "string": 64}
+# Typical decompression ratio of gzip/zstd-compressed CSV.
+COMPRESSION_RATIO = 5
+# Parse buffers plus the copies made while validating.
+PEAK_FACTOR = 2
+# Fallback in-memory/on-disk ratios when no columns are declared.
+SIZE_FACTOR = {"csv": 3, "parquet": 5, "delta": 5, "directory": 3}
+
+
+class Estimate(NamedTuple):
+    """Estimated peak bytes and row count (0 when unknown) of a source."""
+
+    peak_bytes: int
+    rows: int
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as fh:
+            raw = fh.read().strip()
+    except OSError:
+        return None
+    if not raw or raw == "max":
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        return None
+    return None if value >= _UNLIMITED else value
+
+
+def memory_limit() -> Optional[int]:
+    """Return the cgroup memory limit, else physical memory, else None."""
+    for path in (CGROUP_V2_LIMIT, CGROUP_V1_LIMIT):
+        limit = _read_int(path)
+        if limit:
+            return limit
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_budget() -> Optional[int]:
+    """Return the budget configured by `DQ_MEMORY_BUDGET`, or None."""
+    raw = str(os.environ.get("DQ_MEMORY_BUDGET", "")).strip()
+    if not raw:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid DQ_MEMORY_BUDGET=%r", raw)
+        return None
+    if value <= 0:
+        return None
+    if value <= 1:
+        limit = memory_limit()
+        if limit is None:
+            logger.warning("DQ_MEMORY_BUDGET is a fraction but the memory limit is unknown; governor disabled")
+            return None
+        return int(limit * value)
+    return int(value)
+
+
+def contract_column_types(contract_path: Optional[str]) -> Dict[str, str]:
+    """Return `{column: type}` from an ODCS contract (empty on failure).
+
+    Columns declared as `string` with `format: date` / `date-time` count as
+    dates and timestamps, which pandas holds as 8-byte values once parsed.
+    """
+    if not contract_path:
+        return {}
+    try:
+        from .odcs_validator import validate_contract
+
+        data = validate_contract(contract_path)
+    except Exception as exc:
+        logger.debug("No column types for memory estimate from %s: %s", contract_path, exc)
+        return {}
+    types = {}
+    for col in data.get("columns", []):
+        if not isinstance(col, dict) or not col.get("name"):
+            continue
+        kind = str(col.get("type") or "string").lower()
+        fmt = str(col.get("format") or "").lower()
+        if fmt == "date":
+            kind = "date"
+        elif fmt in ("date-time", "datetime", "timestamp"):
+            kind = "timestamp"
+        types[col["name"]] = kind if kind in MEMORY_WIDTH else "string"
+    return types
+
+
+def _size_on_disk(location: str) -> int:
+    if os.path.isdir(location):
+        return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(location) for f in files)
+    return os.path.getsize(location)
+
+
+def _parquet_estimate(location: str, columns: Optional[List[str]]) -> Optional[Estimate]:
+    try:
+        import pyarrow.parquet as pq
+
+        meta = pq.ParquetFile(location).metadata
+    except Exception:
+        return None
+    rows = meta.num_rows
+    selected = set(columns) if columns else None
+    width = 0
+    for i in range(meta.num_row_groups):
+        group = meta.row_group(i)
+        for j in range(group.num_columns):
+            col = group.column(j)
+            if selected is None or col.path_in_schema in selected:
+                width += col.total_uncompressed_size
+    return Estimate(width * PEAK_FACTOR, rows)
+
+
+def estimate_peak(
+    location: Optional[str],
+    asset_type: str = "csv",
+    column_types: Optional[Dict[str, str]] = None,
+    reader_options: Optional[Dict[str, Any]] = None,
+    size: Optional[int] = None,
+) -> Estimate:
+    """Estimate the peak memory needed to load and validate `location`.
+
+    Remote locations are estimated from `size` (the object's byte size,
+    which the caller fetches); remote locations without it and missing
+    locations return `Estimate(0, 0)` (unknown).
+    """
+    remote = "://" in str(location or "")
+    if not location or (remote and not size):
+        return Estimate(0, 0)
+    if size is None:
+        try:
+            size = _size_on_disk(location)
+        except OSError:
+            return Estimate(0, 0)
+    options = reader_options or {}
+    usecols = options.get("usecols") or options.get("columns")
+    usecols = list(usecols) if isinstance(usecols, (list, tuple)) else None
+
+    if asset_type == "parquet" and not remote and not os.path.isdir(location):
+        estimate = _parquet_estimate(location, usecols)
+        if estimate is not None:
+            return estimate
+
+    types = dict(column_types or {})
+    if asset_type == "csv" and types:
+        compressed = compression_from_extension(str(location)) if remote else sniff_local(location)
+        if options.get("compression") not in (None, "infer") or compressed:
+            size *= COMPRESSION_RATIO
+        text_width = sum(TEXT_WIDTH[t] + 1 for t in types.values())
+        rows = max(1, size // max(1, text_width))
+        kept = [t for c, t in types.items() if usecols is None or c in usecols]
+        return Estimate(rows * sum(MEMORY_WIDTH[t] for t in kept) * PEAK_FACTOR, rows)
+
+    return Estimate(size * SIZE_FACTOR.get(asset_type, 3) * PEAK_FACTOR, 0)
+
+
+def chunk_rows(estimate: Estimate, budget: int, minimum: int = 1000) -> int:
+    """Rows per chunk so that one chunk uses about half of `budget`."""
+    if estimate.rows <= 0 or estimate.peak_bytes <= 0:
+        return minimum
+    per_row = estimate.peak_bytes / estimate.rows
+    return max(minimum, int((budget / 2) / per_row))
+
+
+class MemoryGovernor:
+    """Admit work while the sum of estimated peaks fits `budget` bytes.
+
+    A request larger than the whole budget is admitted only when nothing
+    else is running, so it never waits forever.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = int(budget)
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    def oversize(self, nbytes: int) -> bool:
+        return nbytes > self.budget
+
+    @contextmanager
+    def admit(self, nbytes: int, name: str = "") -> Iterator[None]:
+        nbytes = max(0, int(nbytes))
+        with self._cond:
+            while self.in_use and self.in_use + nbytes > self.budget:
+                logger.debug("Waiting to admit %s (%d bytes; %d of %d in use)", name, nbytes, self.in_use, self.budget)
+                self._cond.wait()
+            self.in_use += nbytes
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_use -= nbytes
+                self._cond.notify_all()
+
+
+_governor_lock = threading.Lock()
+_governor: Optional[MemoryGovernor] = None
+
+
+def get_governor() -> Optional[MemoryGovernor]:
+    """Return the process-wide governor, or None when no budget is set."""
+    global _governor
+    budget = memory_budget()
+    if budget is None:
+        return None
+    with _governor_lock:
+        if _governor is None or _governor.budget != budget:
+            _governor = MemoryGovernor(budget)
+            logger.info("ℹ️ Memory governor budget: %d MiB", budget // (1024 * 1024))
+        return _governor
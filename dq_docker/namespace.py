@@ -0,0 +1,112 @@
+"""Run- and source-scoped names for suites, definitions and checkpoints.
+
+Sources commonly share `definition_name` and `expectation_suite_name`, so
+runners validating different sources against one `gx/` project overwrite
+each other's ValidationDefinitions, checkpoints and suites. `DQ_NAMESPACE`
+scopes the names a run writes:
+
+- `source`: `<suite>-<source>` and `<definition>-<source>`, so every
+  source owns its entries and concurrent runs of different sources never
+  touch the same store file;
+- `run`: additionally `<definition>-<source>-<run scope>` for
+  ValidationDefinitions and checkpoints, so concurrent runs of the same
+  source do not either. Suites stay source-scoped so results and Data
+  Docs keep grouping by suite. The run scope is `DQ_RUN_SCOPE` or a
+  timestamp plus random suffix per process, and `drop_run_scope` removes
+  the definitions and checkpoints the run created once it is over.
+
+The default (`none`) keeps the configured names.
+"""
+from __future__ import annotations
+
+import os
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+NAMESPACE_MODES = ("none", "source", "run")
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+_run_scope: Optional[str] = None
+# Run-scoped definition (and checkpoint) names handed out by this process,
+# per run scope.
+_created: Dict[str, Set[str]] = {}
+
+
+def namespace_mode() -> str:
+    """`DQ_NAMESPACE`: `none` (default), `source` or `run`."""
+    mode = str(os.environ.get("DQ_NAMESPACE", "none") or "none").strip().lower()
+    if mode not in NAMESPACE_MODES:
+        logger.warning("Ignoring unknown DQ_NAMESPACE=%r; names are not scoped", mode)
+        return "none"
+    return mode
+
+
+def run_scope() -> str:
+    """`DQ_RUN_SCOPE`, else a per-process `<UTC timestamp>-<random>`."""
+    global _run_scope
+    configured = os.environ.get("DQ_RUN_SCOPE")
+    if configured:
+        return _SAFE.sub("_", configured)
+    if _run_scope is None:
+        _run_scope = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
+    return _run_scope
+
+
+def scope_source_conf(src_name: str, src_conf: Dict[str, Any], mode: Optional[str] = None) -> Dict[str, Any]:
+    """Return `src_conf` with scoped suite and definition names."""
+    mode = mode or namespace_mode()
+    if mode == "none":
+        return src_conf
+    source = _SAFE.sub("_", src_name)
+    conf = dict(src_conf)
+    if conf.get("expectation_suite_name"):
+        conf["expectation_suite_name"] = f"{conf['expectation_suite_name']}-{source}"
+    if conf.get("definition_name"):
+        conf["definition_name"] = f"{conf['definition_name']}-{source}"
+        if mode == "run":
+            scope = run_scope()
+            conf["definition_name"] += f"-{scope}"
+            _created.setdefault(scope, set()).add(conf["definition_name"])
+    return conf
+
+
+def drop_run_scope(context: Any, scope: Optional[str] = None) -> Dict[str, List[str]]:
+    """Delete the checkpoints and ValidationDefinitions of a run scope.
+
+    Without `scope`, only the names this process scoped for its current run
+    are removed, and only in `run` mode. An explicit `scope` (for example
+    left behind by a runner that crashed) removes every name ending in
+    `-<scope>`. Entries are removed from the store backend without being
+    deserialized.
+    """
+    if scope is None:
+        if namespace_mode() != "run":
+            return {}
+        scope = run_scope()
+        created: Optional[Set[str]] = _created.pop(scope, set())
+    else:
+        created = None
+    suffix = f"-{scope}"
+    dropped: Dict[str, List[str]] = {}
+    for kind, store_name in (("checkpoints", "checkpoint_store"), ("validation_definitions", "validation_definition_store")):
+        backend = getattr(getattr(context, store_name, None), "store_backend", None)
+        if backend is None:
+            continue
+        names = []
+        for key in backend.list_keys():
+            name = str(key[-1]) if key else ""
+            if (name in created) if created is not None else name.endswith(suffix):
+                try:
+                    backend.remove_key(tuple(key))
+                    names.append(name)
+                except Exception as exc:
+                    logger.warning("Could not remove %s from %s: %s", name, store_name, exc)
+        dropped[kind] = names
+    if any(dropped.values()):
+        logger.info("ℹ️ Removed run-scoped entries for %s: %s", scope, dropped)
+    return dropped
@@ -0,0 +1,203 @@
+"""Memory-mapped Arrow IPC cache of parsed inputs.
+
+When the same file is validated against several suites, or re-run after a
+contract edit, parsing it again is wasted work. With the cache enabled,
+every DataFrame loaded through `dq_docker.readers.load_frame` is written
+once as an uncompressed Arrow IPC (Feather v2) file. Later loads of the
+same input memory-map that file and build the DataFrame from the mapped
+buffers instead of re-parsing; numeric columns without nulls are used
+zero-copy.
+
+Entries are keyed by the input's fingerprint (path, size and mtime of every
+file, or ETag/last-modified/size for remote objects), the asset type and
+the reader options, so any change to the data or to how it is parsed
+misses the cache. The directory is bounded by `max_bytes`; the least
+recently used entries are evicted first.
+
+Enabled with `DQ_PARSE_CACHE=1` (or `parse_cache: true` on a source);
+`DQ_PARSE_CACHE_MAX_BYTES` sets the bound (default 2 GiB). Requires
+`pyarrow`.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .cache import cache_dir
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+SUFFIX = ".arrow"
+FORMAT_VERSION = 1
+
+
+def _local_fingerprint(location: str) -> List[Any]:
+    if os.path.isdir(location):
+        parts = []
+        for root, dirs, files in os.walk(location):
+            dirs.sort()
+            for name in sorted(files):
+                st = os.stat(os.path.join(root, name))
+                parts.append((os.path.relpath(os.path.join(root, name), location), st.st_size, st.st_mtime_ns))
+        return parts
+    st = os.stat(location)
+    return [(os.path.basename(location), st.st_size, st.st_mtime_ns)]
+
+
+def _remote_fingerprint(location: str) -> List[Any]:
+    from .adls import ADLSClient
+    from .adls.listing import entry_signature
+    from .readers import split_abfs_uri
+
+    container, path = split_abfs_uri(location)
+    return sorted((e["name"], entry_signature(e)) for e in ADLSClient().iter_files(container, path))
+
+
+def input_fingerprint(location: str) -> Optional[List[Any]]:
+    """Return a JSON-serialisable fingerprint of `location`, or None when
+    it cannot be determined (the input is then not cached)."""
+    try:
+        if "://" in str(location):
+            return _remote_fingerprint(location)
+        return _local_fingerprint(os.path.abspath(location))
+    except Exception as exc:
+        logger.debug("No fingerprint for %s: %s", location, exc)
+        return None
+
+
+class ParseCache:
+    """Size-bounded directory of Arrow IPC files keyed by input fingerprint."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or cache_dir("parsed")
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+
+    def key(self, asset_type: str, location: str, reader_options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        fingerprint = input_fingerprint(location)
+        if fingerprint is None:
+            return None
+        payload = {
+            "v": FORMAT_VERSION,
+            "asset_type": asset_type,
+            "location": str(location) if "://" in str(location) else os.path.abspath(location),
+            "fingerprint": fingerprint,
+            "options": reader_options or {},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key: str) -> Any:
+        """Return the cached DataFrame for `key`, or None on a miss."""
+        import pyarrow as pa
+
+        path = self._path(key)
+        try:
+            source = pa.memory_map(path, "r")
+        except (FileNotFoundError, OSError):
+            return None
+        try:
+            table = pa.ipc.open_file(source).read_all()
+            frame = table.to_pandas(split_blocks=True)
+        except Exception as exc:
+            logger.warning("Discarding unreadable parse cache entry %s: %s", path, exc)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return frame
+
+    def put(self, key: str, frame: Any) -> Optional[str]:
+        """Write `frame` for `key` and evict old entries. Returns the path,
+        or None when the frame could not be cached."""
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+        except Exception as exc:
+            logger.debug("Frame not cacheable as Arrow: %s", exc)
+            return None
+        if table.nbytes > self.max_bytes:
+            logger.debug("Frame of %d bytes exceeds parse cache bound %d; not cached", table.nbytes, self.max_bytes)
+            return None
+
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(prefix=".parsed-", suffix=SUFFIX, dir=self.directory)
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, path)
+        except Exception:
+            self._remove(tmp)
+            logger.warning("Could not write parse cache entry %s", path, exc_info=True)
+            return None
+        self.evict()
+        return path
+
+    def get_or_load(self, asset_type: str, location: str, reader_options: Optional[Dict[str, Any]], loader: Callable[[], Any]) -> Any:
+        key = self.key(asset_type, location, reader_options)
+        if key is None:
+            return loader()
+        frame = self.get(key)
+        if frame is not None:
+            logger.info("ℹ️ Loaded %s from parse cache", location)
+            return frame
+        frame = loader()
+        self.put(key, frame)
+        return frame
+
+    def evict(self) -> List[str]:
+        """Remove least recently used entries until the cache fits."""
+        removed = []
+        with self._lock:
+            entries = []
+            for path in glob.glob(os.path.join(self.directory, "*" + SUFFIX)):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                removed.append(path)
+        if removed:
+            logger.debug("Evicted %d parse cache entr(ies)", len(removed))
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def parse_cache_enabled(source_conf: Optional[Dict[str, Any]] = None) -> bool:
+    """True when the cache is enabled globally or for `source_conf`."""
+    if source_conf and "parse_cache" in source_conf:
+        return bool(source_conf.get("parse_cache"))
+    return str(os.environ.get("DQ_PARSE_CACHE", "")).strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_default_parse_cache() -> ParseCache:
+    """Return a cache configured from `DQ_PARSE_CACHE_MAX_BYTES`."""
+    max_bytes = int(os.environ.get("DQ_PARSE_CACHE_MAX_BYTES") or DEFAULT_MAX_BYTES)
+    return ParseCache(max_bytes=max_bytes)
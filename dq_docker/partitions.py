@@ -0,0 +1,102 @@
+"""Regex/date partitioned batch definitions.
+
+A source can declare `batch_definition_regex` instead of (or in addition
+to) a fixed `batch_definition_path`. Every file below `source_folder` whose
+relative path fully matches the regex is a partition. Named groups (for
+example `(?P<year>\\d{4})`) form the partition key and define the ordering;
+without groups the relative path itself is the key.
+
+`partition_mode` selects what a run validates:
+
+- `latest` (default): only the newest partition, i.e. the highest key.
+- `all`: every partition; the runtime validates them concurrently.
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+PARTITION_MODES = ("latest", "all")
+
+
+class Partition(NamedTuple):
+    key: str
+    path: str
+    sort_key: Tuple[str, ...]
+
+
+def _list_relative_paths(source_folder: str) -> List[str]:
+    if "://" in source_folder:
+        from .adls import ADLSClient
+        from .readers import split_abfs_uri
+
+        container, prefix = split_abfs_uri(source_folder)
+        base = f"{container}/{prefix.strip('/')}".rstrip("/") + "/"
+        names = [e["name"] for e in ADLSClient().iter_files(container, prefix)]
+        return sorted(n[len(base):] if n.startswith(base) else n for n in names)
+
+    paths = []
+    for root, dirs, files in os.walk(source_folder):
+        dirs.sort()
+        rel_root = os.path.relpath(root, source_folder)
+        for name in files:
+            rel = name if rel_root == "." else os.path.join(rel_root, name)
+            paths.append(rel.replace(os.sep, "/"))
+    return sorted(paths)
+
+
+def discover_partitions(source_folder: str, regex: str) -> List[Partition]:
+    """Return the partitions below `source_folder` sorted oldest to newest."""
+    pattern = re.compile(regex)
+    partitions = []
+    for rel in _list_relative_paths(source_folder):
+        m = pattern.fullmatch(rel)
+        if not m:
+            continue
+        groups = tuple(g or "" for g in m.groups())
+        key = "-".join(groups) if groups else rel
+        partitions.append(Partition(key=key, path=rel, sort_key=groups or (rel,)))
+    partitions.sort(key=lambda p: p.sort_key)
+    return partitions
+
+
+def select_partitions(partitions: List[Partition], mode: str) -> List[Partition]:
+    if mode not in PARTITION_MODES:
+        raise ValueError(f"Unsupported partition_mode '{mode}'; expected one of {list(PARTITION_MODES)}")
+    if mode == "latest":
+        return partitions[-1:]
+    return list(partitions)
+
+
+def expand_partitions(src_conf: Dict[str, Any], source_folder: Optional[str]) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+    """Expand a partitioned source into `(partition_key, conf)` pairs.
+
+    Returns None when the source does not declare `batch_definition_regex`.
+    Each conf is a copy of `src_conf` pinned to one partition file. In
+    `all` mode `definition_name` is suffixed with the partition key so
+    concurrent partitions do not share a ValidationDefinition.
+    """
+    regex = src_conf.get("batch_definition_regex")
+    if not regex:
+        return None
+    if not source_folder:
+        raise ValueError("batch_definition_regex requires a source_folder")
+
+    mode = str(src_conf.get("partition_mode") or "latest").lower()
+    selected = select_partitions(discover_partitions(source_folder, regex), mode)
+    logger.info("Partitions selected (%s): %s", mode, [p.key for p in selected])
+
+    expanded = []
+    for part in selected:
+        conf = dict(src_conf)
+        conf["batch_definition_name"] = part.path
+        conf["batch_definition_path"] = part.path
+        if mode == "all" and conf.get("definition_name"):
+            conf["definition_name"] = f"{conf['definition_name']}-{part.key}"
+        expanded.append((part.key, conf))
+    return expanded
@@ -0,0 +1,151 @@
+"""Header-only schema precheck for CSV sources.
+
+Reads only the first few KB of a file (a local read, or a single range
+request for `abfs://` and other fsspec URIs; compressed files are
+decompressed as a stream only as far as needed), parses the header line and
+compares it with the `columns` declared in the source's ODCS contract. A
+source whose header is missing contract columns can then be failed before
+its batch is downloaded, parsed and validated.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .compression import compression_from_extension, compression_from_magic, open_decompressed
+from .logs import get_logger
+from .odcs_validator import validate_contract
+
+logger = get_logger(__name__)
+
+DEFAULT_HEADER_BYTES = 8192
+MAX_HEADER_BYTES = 1024 * 1024
+CSV_SUFFIXES = (".csv", ".txt")
+
+
+class SchemaPrecheckError(ValueError):
+    """Raised when a file header is missing columns declared in the contract."""
+
+    def __init__(self, location: str, missing: List[str], unexpected: List[str]):
+        self.location = location
+        self.missing = missing
+        self.unexpected = unexpected
+        msg = f"{location}: header is missing contract column(s) {missing}"
+        if unexpected:
+            msg += f"; unexpected column(s) {unexpected}"
+        super().__init__(msg)
+
+
+def _read_prefix(location: str, nbytes: int, compression: Optional[str] = None) -> bytes:
+    if "://" in location:
+        import fsspec
+
+        fs, path = fsspec.core.url_to_fs(location)
+        if not compression:
+            return fs.cat_file(path, start=0, end=nbytes)
+        fh = fs.open(path, "rb")
+    else:
+        fh = open(location, "rb")
+    with fh:
+        if not compression:
+            return fh.read(nbytes)
+        # Only the first `nbytes` of decompressed output are produced.
+        with open_decompressed(fh, compression) as stream:
+            chunks, remaining = [], nbytes
+            while remaining > 0:
+                chunk = stream.read(remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            return b"".join(chunks)
+
+
+def read_header_columns(
+    location: str,
+    nbytes: int = DEFAULT_HEADER_BYTES,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+) -> List[str]:
+    """Return the column names from the first line of `location`.
+
+    Reads `nbytes` at a time (doubling up to `MAX_HEADER_BYTES`) until the
+    first newline is found, so only the header is transferred for remote
+    files. Compressed files (recognised by their magic bytes) are
+    decompressed while reading.
+    """
+    size = nbytes
+    compression = None
+    while True:
+        data = _read_prefix(location, size, compression) if compression else _read_prefix(location, size)
+        if compression is None:
+            compression = compression_from_magic(data)
+            if compression:
+                continue
+        if b"\n" in data or len(data) < size or size >= MAX_HEADER_BYTES:
+            break
+        size = min(size * 2, MAX_HEADER_BYTES)
+
+    first_line = data.split(b"\n", 1)[0].rstrip(b"\r")
+    text = first_line.decode(encoding, errors="replace").lstrip("\ufeff")
+    row = next(csv.reader(io.StringIO(text), delimiter=delimiter), [])
+    return [c.strip() for c in row]
+
+
+def contract_columns(contract_path: Union[str, Path]) -> List[str]:
+    """Return the column names declared in an ODCS contract."""
+    data = validate_contract(contract_path)
+    return [c.get("name") for c in data.get("columns", []) if isinstance(c, dict) and c.get("name")]
+
+
+def compare_header(header: List[str], expected: List[str]) -> Dict[str, List[str]]:
+    """Return the contract columns absent from `header` and the header
+    columns not declared in the contract."""
+    present = set(header)
+    declared = set(expected)
+    return {
+        "missing": [c for c in expected if c not in present],
+        "unexpected": [c for c in header if c not in declared],
+    }
+
+
+def precheck_header(
+    location: str,
+    contract_path: Union[str, Path],
+    nbytes: int = DEFAULT_HEADER_BYTES,
+    delimiter: str = ",",
+) -> Optional[Dict[str, List[str]]]:
+    """Compare the header of `location` against the contract's columns.
+
+    Returns the comparison, or None when the check does not apply (not a
+    CSV file, file not reachable, or no columns declared). Raises
+    `SchemaPrecheckError` when contract columns are missing from the header;
+    extra columns are only logged.
+    """
+    name = str(location).lower()
+    ext = compression_from_extension(name)
+    if ext:
+        name = name.rsplit(".", 1)[0]
+    if not name.endswith(CSV_SUFFIXES):
+        return None
+    try:
+        expected = contract_columns(contract_path)
+    except ValueError:
+        # Invalid contracts are reported when the suite is built.
+        return None
+    if not expected:
+        return None
+    try:
+        header = read_header_columns(str(location), nbytes=nbytes, delimiter=delimiter)
+    except (FileNotFoundError, IsADirectoryError):
+        logger.debug("Header precheck skipped; %s is not readable", location)
+        return None
+
+    diff = compare_header(header, expected)
+    if diff["missing"]:
+        raise SchemaPrecheckError(str(location), diff["missing"], diff["unexpected"])
+    if diff["unexpected"]:
+        logger.warning("Header of %s has columns not in the contract: %s", location, diff["unexpected"])
+    return diff
@@ -0,0 +1,168 @@
+"""Bounded prefetch: load the next sources while the current one validates.
+
+`run_prefetched` drives a three-stage pipeline over a list of items:
+
+1. `prepare(item)` runs on the calling thread (it registers objects in the
+   DataContext, which is not safe to do concurrently);
+2. `load(prepared)` runs on up to `depth` background threads, reading or
+   downloading the data for the next sources;
+3. `execute(prepared)` runs on the calling thread, in input order.
+
+Loads are admitted while the estimated size of resident data (loaded ahead
+plus the source currently executing, which stays counted until `execute`
+returns) stays under `max_bytes`; the next source in line is always
+admitted once nothing else is resident, so the pipeline never stalls.
+Estimates come from the on-disk size (see `estimate_bytes`) and are
+replaced by the measured in-memory size when a load returns a DataFrame.
+
+Configured by `DQ_PREFETCH` (number of sources loaded ahead; 0 or unset
+disables the pipeline) and `DQ_PREFETCH_MAX_BYTES`.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Parsed pandas frames are typically several times larger than the CSV or
+# Parquet files they were read from.
+MEMORY_FACTOR = 3
+
+
+def prefetch_settings() -> Tuple[int, int]:
+    """Return `(depth, max_bytes)` from `DQ_PREFETCH` / `DQ_PREFETCH_MAX_BYTES`."""
+    try:
+        depth = max(0, int(os.environ.get("DQ_PREFETCH", "0") or 0))
+    except ValueError:
+        logger.warning("Ignoring invalid DQ_PREFETCH=%r", os.environ.get("DQ_PREFETCH"))
+        depth = 0
+    try:
+        max_bytes = int(os.environ.get("DQ_PREFETCH_MAX_BYTES") or DEFAULT_MAX_BYTES)
+    except ValueError:
+        logger.warning("Ignoring invalid DQ_PREFETCH_MAX_BYTES=%r", os.environ.get("DQ_PREFETCH_MAX_BYTES"))
+        max_bytes = DEFAULT_MAX_BYTES
+    return depth, max_bytes
+
+
+def estimate_bytes(location: Optional[str]) -> int:
+    """Estimate the in-memory size of the data at a local `location`.
+
+    Remote or missing locations return 0 (unknown).
+    """
+    if not location or "://" in str(location):
+        return 0
+    try:
+        if os.path.isdir(location):
+            size = sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(location) for f in files)
+        else:
+            size = os.path.getsize(location)
+    except OSError:
+        return 0
+    return size * MEMORY_FACTOR
+
+
+def frame_bytes(frame: Any) -> Optional[int]:
+    """Return the measured size of a pandas DataFrame, or None."""
+    usage = getattr(frame, "memory_usage", None)
+    if not callable(usage):
+        return None
+    try:
+        return int(usage(deep=True).sum())
+    except Exception:
+        return None
+
+
+class _Slot:
+    __slots__ = ("item", "prepared", "future", "size")
+
+    def __init__(self, item: Any, prepared: Any, size: int):
+        self.item = item
+        self.prepared = prepared
+        self.future: Optional[Future] = None
+        self.size = size
+
+
+def run_prefetched(
+    items: Iterable[Any],
+    prepare: Callable[[Any], Any],
+    load: Callable[[Any], Any],
+    execute: Callable[[Any, Any, Any], Any],
+    depth: int,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    estimate: Callable[[Any], int] = lambda prepared: 0,
+    measure: Callable[[Any], Optional[int]] = lambda prepared: None,
+) -> List[Any]:
+    """Run `execute(item, prepared, loaded)` for every item, in order, with
+    up to `depth` items loading ahead, and return the execute results.
+
+    `prepare` may return None to skip loading (`execute` then receives
+    `prepared=None`). An exception raised by `load` is passed to `execute`
+    as `loaded`. `measure(prepared)`, when it returns a size after loading,
+    replaces the estimate in the memory accounting.
+    """
+    pending = iter(items)
+    window: deque = deque()
+    outcomes: List[Any] = []
+    lock = threading.Lock()
+    state = {"bytes": 0, "exhausted": False}
+
+    def _fill() -> None:
+        # Keep the current item plus `depth` items ahead prepared.
+        while not state["exhausted"] and len(window) < depth + 1:
+            item = next(pending, _Slot)
+            if item is _Slot:
+                state["exhausted"] = True
+                return
+            prepared = prepare(item)
+            window.append(_Slot(item, prepared, estimate(prepared) if prepared is not None else 0))
+
+    def _load(slot: _Slot) -> Any:
+        try:
+            loaded = load(slot.prepared)
+        except Exception as exc:
+            return exc
+        measured = measure(slot.prepared)
+        if measured is not None:
+            with lock:
+                if slot.future is not None:
+                    state["bytes"] += measured - slot.size
+                slot.size = measured
+        return loaded
+
+    def _admit(pool: ThreadPoolExecutor) -> None:
+        for idx, slot in enumerate(window):
+            if slot.prepared is None or slot.future is not None:
+                continue
+            with lock:
+                if state["bytes"] and state["bytes"] + slot.size > max_bytes:
+                    logger.debug("Prefetch paused: %d bytes loaded ahead (cap %d)", state["bytes"], max_bytes)
+                    return
+                state["bytes"] += slot.size
+                slot.future = pool.submit(_load, slot)
+
+    with ThreadPoolExecutor(max_workers=max(1, depth), thread_name_prefix="dq-prefetch") as pool:
+        _fill()
+        while window:
+            _admit(pool)
+            slot = window.popleft()
+            loaded = None
+            if slot.prepared is not None:
+                loaded = slot.future.result() if slot.future is not None else _load(slot)
+            # Start the next loads before validating so I/O overlaps CPU;
+            # this slot's data stays counted until it has been executed.
+            _fill()
+            _admit(pool)
+            try:
+                outcomes.append(execute(slot.item, slot.prepared, loaded))
+            finally:
+                with lock:
+                    if slot.future is not None:
+                        state["bytes"] -= slot.size
+    return outcomes
@@ -0,0 +1,235 @@
+"""Quarantine of failing rows to a partitioned Parquet dataset.
+
+When a batch fails validation, the rows that fail any row-level (column
+map) expectation of its suite are written to::
+
+    <dir>/quarantine/source=<name>/run=<run name>/part-*.parquet
+
+With passing output enabled, the rows that pass them all are written to
+`<dir>/passing/...` whatever the batch result. Each row gets `_dq_row` (its 0-based position in the
+source) and quarantined rows `_dq_failed` (the expectations it failed, for
+example `expect_column_values_to_not_be_null(id)`). Partitioned sources add
+a `partition=<key>` level.
+
+Rows are evaluated with vectorised pandas masks that mirror Great
+Expectations' own column map semantics (missing values only fail the null
+checks), one chunk of at most `chunk_rows` rows at a time, while the batch
+is validated. CSV/Parquet sources with quarantine on are validated as
+dataframes, so the quarantined rows are the rows Great Expectations saw;
+when their suite can be judged per chunk they are read and validated
+`chunk_rows` rows at a time, so only one chunk is held. Nothing is
+collected in Python lists, so extraction uses the memory of one chunk. Aggregate expectations (row counts, column statistics) have no
+failing rows and are ignored; `expect_column_values_to_be_unique` is
+evaluated per chunk.
+
+Enable it per source with `quarantine: true` (or a mapping with `path`,
+`passing` and `chunk_rows`) or for every source with `DQ_QUARANTINE=1`
+(`DQ_QUARANTINE=passing` also writes passing rows). The default directory
+is `gx/uncommitted/quarantine` (`DQ_QUARANTINE_DIR`).
+"""
+from __future__ import annotations
+
+import os
+import re
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+QUARANTINE_DIRNAME = "quarantine"
+DEFAULT_CHUNK_ROWS = 100_000
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class QuarantineSettings(NamedTuple):
+    directory: str
+    passing: bool = False
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+
+
+def default_quarantine_dir(context: Any) -> str:
+    root = getattr(context, "root_directory", None) or os.getcwd()
+    return os.path.join(root, "uncommitted", QUARANTINE_DIRNAME)
+
+
+def quarantine_settings(source_conf: Optional[Dict[str, Any]], context: Any = None) -> Optional[QuarantineSettings]:
+    """Settings for a source, or None when quarantine is off for it."""
+    env = str(os.environ.get("DQ_QUARANTINE", "")).strip().lower()
+    if source_conf and "quarantine" in source_conf:
+        value = source_conf.get("quarantine")
+    else:
+        value = env in ("1", "true", "yes", "on", "passing")
+    if not value:
+        return None
+    options = value if isinstance(value, dict) else {}
+    directory = options.get("path") or os.environ.get("DQ_QUARANTINE_DIR") or default_quarantine_dir(context)
+    root = getattr(context, "root_directory", None)
+    if root and not os.path.isabs(directory):
+        directory = os.path.join(root, directory)
+    try:
+        chunk_rows = max(1, int(options.get("chunk_rows") or DEFAULT_CHUNK_ROWS))
+    except (TypeError, ValueError):
+        raise ValueError(f"quarantine chunk_rows must be an integer, got {options.get('chunk_rows')!r}")
+    return QuarantineSettings(directory=directory, passing=bool(options.get("passing", env == "passing")), chunk_rows=chunk_rows)
+
+
+def _regex(s, kw, negate=False):
+    matched = s.astype(str).str.contains(kw["regex"], regex=True)
+    return s.notna() & (matched if negate else ~matched)
+
+
+def _in_set(s, kw, negate=False):
+    member = s.isin(list(kw.get("value_set") or []))
+    return s.notna() & (member if negate else ~member)
+
+
+def _between(values, kw):
+    import pandas as pd
+
+    low, high = kw.get("min_value"), kw.get("max_value")
+    bad = pd.Series(False, index=values.index)
+    if low is not None:
+        bad = bad | ((values <= low) if kw.get("strict_min") else (values < low))
+    if high is not None:
+        bad = bad | ((values >= high) if kw.get("strict_max") else (values > high))
+    return values.notna() & bad
+
+
+def _lengths_equal(s, kw):
+    return s.notna() & (s.astype(str).str.len() != kw["value"])
+
+
+# Column map expectations: type -> fn(column, kwargs) returning a boolean
+# Series that is True for failing rows.
+ROW_CHECKS: Dict[str, Callable[[Any, Dict[str, Any]], Any]] = {
+    "expect_column_values_to_not_be_null": lambda s, kw: s.isna(),
+    "expect_column_values_to_be_null": lambda s, kw: s.notna(),
+    "expect_column_values_to_match_regex": lambda s, kw: _regex(s, kw),
+    "expect_column_values_to_not_match_regex": lambda s, kw: _regex(s, kw, negate=True),
+    "expect_column_values_to_be_in_set": lambda s, kw: _in_set(s, kw),
+    "expect_column_values_to_not_be_in_set": lambda s, kw: _in_set(s, kw, negate=True),
+    "expect_column_values_to_be_between": lambda s, kw: _between(s, kw),
+    "expect_column_value_lengths_to_be_between": lambda s, kw: _between(s.astype(str).str.len().where(s.notna()), kw),
+    "expect_column_value_lengths_to_equal": lambda s, kw: _lengths_equal(s, kw),
+    "expect_column_values_to_be_unique": lambda s, kw: s.notna() & s.duplicated(keep=False),
+}
+
+
+def expectation_spec(expectation: Any) -> Tuple[Optional[str], Dict[str, Any]]:
+    """`(type, kwargs)` of a GE Expectation, ExpectationConfiguration or dict."""
+    if isinstance(expectation, dict):
+        return expectation.get("type") or expectation.get("expectation_type"), dict(expectation.get("kwargs") or {})
+    kind = getattr(expectation, "type", None) or getattr(expectation, "expectation_type", None)
+    kwargs = getattr(expectation, "kwargs", None)
+    if kwargs is None:
+        configuration = getattr(expectation, "configuration", None)
+        kwargs = getattr(configuration, "kwargs", None)
+    return kind, dict(kwargs or {})
+
+
+def row_checks(suite: Any) -> List[Tuple[str, str, Callable[[Any], Any]]]:
+    """`(label, column, fn)` for each row-level expectation of `suite`."""
+    checks = []
+    for expectation in list(getattr(suite, "expectations", None) or []):
+        kind, kwargs = expectation_spec(expectation)
+        check = ROW_CHECKS.get(kind or "")
+        column = kwargs.get("column")
+        if check is None or not column:
+            continue
+        if kwargs.get("row_condition"):
+            logger.debug("Skipping %s on %s for quarantine: row_condition is not supported", kind, column)
+            continue
+        checks.append((f"{kind}({column})", column, lambda s, check=check, kwargs=kwargs: check(s, kwargs)))
+    return checks
+
+
+def failing_rows(frame: Any, checks: List[Tuple[str, str, Callable[[Any], Any]]]) -> Tuple[Any, Any]:
+    """Return `(failed, labels)` for `frame`: a boolean Series of rows that
+    fail any check, and the `; `-joined labels of the checks each failed."""
+    import pandas as pd
+
+    failed = pd.Series(False, index=frame.index)
+    labels = pd.Series("", index=frame.index, dtype=object)
+    for label, column, check in checks:
+        if column not in frame.columns:
+            continue
+        try:
+            mask = check(frame[column]).fillna(False).astype(bool)
+        except Exception as exc:
+            logger.debug("Could not evaluate %s for quarantine: %s", label, exc)
+            continue
+        if mask.any():
+            labels[mask] = labels[mask] + label + "; "
+            failed |= mask
+    return failed, labels.str.slice(0, -2)
+
+
+class QuarantineWriter:
+    """Writes the failing (and optionally passing) rows of one source run."""
+
+    def __init__(self, settings: QuarantineSettings, suite: Any, source: str, run_name: str, partition_key: Optional[str] = None):
+        self.settings = settings
+        self.checks = row_checks(suite)
+        parts = [f"source={_SAFE.sub('_', source)}"]
+        if partition_key is not None:
+            parts.append(f"partition={_SAFE.sub('_', str(partition_key))}")
+        parts.append(f"run={_SAFE.sub('_', run_name)}")
+        self._subdir = os.path.join(*parts)
+        self.rows_seen = 0
+        self.failing = 0
+        self.passing = 0
+        self.files: List[str] = []
+        if not self.checks:
+            logger.info("ℹ️ No row-level expectations in the suite of %s; nothing will be quarantined", source)
+
+    def write(self, frame: Any, failed: bool = True) -> None:
+        """Consume the next rows of the source. Failing rows are only
+        written when their batch `failed` validation; passing rows (when
+        enabled) always are."""
+        start = self.rows_seen
+        self.rows_seen += len(frame)
+        if not len(frame) or not (self.settings.passing or (failed and self.checks)):
+            return
+        import numpy as np
+
+        step = self.settings.chunk_rows
+        for lo in range(0, len(frame), step):
+            part = frame.iloc[lo:lo + step]
+            failed_rows, labels = failing_rows(part, self.checks)
+            rows = np.arange(start + lo, start + lo + len(part), dtype="int64")
+            if failed and failed_rows.any():
+                out = part[failed_rows].assign(_dq_row=rows[failed_rows.to_numpy()], _dq_failed=labels[failed_rows])
+                self._write_part("quarantine", out)
+                self.failing += len(out)
+            if self.settings.passing and not failed_rows.all():
+                out = part[~failed_rows].assign(_dq_row=rows[~failed_rows.to_numpy()])
+                self._write_part("passing", out)
+                self.passing += len(out)
+
+    def discard_failing(self) -> None:
+        """Remove the failing rows written so far, for a source that turned
+        out to pass once all of its chunks were judged together."""
+        folder = os.path.join(self.settings.directory, "quarantine", "")
+        for path in [p for p in self.files if p.startswith(folder)]:
+            try:
+                os.remove(path)
+            except OSError as exc:
+                logger.warning("Could not remove quarantine file %s: %s", path, exc)
+                continue
+            self.files.remove(path)
+        self.failing = 0
+
+    def _write_part(self, kind: str, frame: Any) -> None:
+        folder = os.path.join(self.settings.directory, kind, self._subdir)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"part-{len(self.files):05d}-{uuid.uuid4().hex[:8]}.parquet")
+        # Dot-prefixed so readers of the dataset skip partial files.
+        tmp = os.path.join(folder, "." + os.path.basename(path) + ".tmp")
+        frame.to_parquet(tmp, index=False, compression="zstd")
+        os.replace(tmp, path)
+        self.files.append(path)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"rows": self.rows_seen, "failing_rows": self.failing, "passing_rows": self.passing, "files": list(self.files)}
@@ -0,0 +1,238 @@
+"""Readers for sources validated as in-memory DataFrames.
+
+Sources with `asset_type: delta` or `asset_type: directory` have no
+per-file Great Expectations pandas asset; they are loaded here into a
+single pandas DataFrame and validated through a dataframe asset. CSV and
+Parquet sources take the same route when the parse cache is enabled (see
+`dq_docker.parse_cache`). Local paths and `abfs://` URIs are supported
+(the latter through `ADLSClient`).
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+DIRECTORY_SUFFIXES = {"csv": (".csv",), "parquet": (".parquet", ".pq")}
+
+
+def split_abfs_uri(uri: str) -> Tuple[str, str]:
+    """Split 'abfs://container/path' into ('container', 'path')."""
+    rest = uri.split("://", 1)[1]
+    container, _, path = rest.partition("/")
+    return container, path
+
+
+def _is_remote(location: str) -> bool:
+    return "://" in str(location)
+
+
+def read_delta(location: str, **reader_options: Any) -> Any:
+    """Read a Delta table (local path or abfs:// URI) into a DataFrame."""
+    if _is_remote(location):
+        from .adls import ADLSClient
+
+        container, path = split_abfs_uri(location)
+        return ADLSClient().read_delta_table(container, path, **reader_options)
+    try:
+        from deltalake import DeltaTable
+    except Exception:  # pragma: no cover - optional dependency
+        raise RuntimeError("Delta support requires the 'deltalake' package. Install it with 'pip install .[delta]'")
+    return DeltaTable(location).to_pandas(**reader_options)
+
+
+def _directory_files(location: str, fmt: str) -> List[str]:
+    suffixes = DIRECTORY_SUFFIXES[fmt]
+    matches = []
+    for root, dirs, files in os.walk(location):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(suffixes):
+                matches.append(os.path.join(root, name))
+    return matches
+
+
+def read_directory(location: str, fmt: str = "csv", max_workers: int = 8, **reader_options: Any) -> Any:
+    """Read and concatenate every `fmt` file below `location`.
+
+    Files are read concurrently and concatenated in sorted path order.
+    """
+    import pandas as pd
+
+    if fmt not in DIRECTORY_SUFFIXES:
+        raise ValueError(f"Unsupported directory format '{fmt}'; expected one of {sorted(DIRECTORY_SUFFIXES)}")
+
+    if _is_remote(location):
+        from .adls import ADLSClient
+
+        container, prefix = split_abfs_uri(location)
+        client = ADLSClient()
+        entries = sorted(e["name"] for e in client.iter_files(container, prefix))
+        paths = [n.split("/", 1)[1] if n.startswith(f"{container}/") else n for n in entries]
+        paths = [p for p in paths if p.lower().endswith(DIRECTORY_SUFFIXES[fmt])]
+        frames = client.read_many(container, paths, fmt=fmt, max_concurrency=max_workers, **reader_options)
+    else:
+        paths = _directory_files(location, fmt)
+        reader = pd.read_parquet if fmt == "parquet" else pd.read_csv
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            frames = list(pool.map(lambda p: reader(p, **reader_options), paths))
+
+    if not frames:
+        raise ValueError(f"No {fmt} files found under {location}")
+    logger.info("Loaded %d %s file(s) from %s", len(frames), fmt, location)
+    return pd.concat(frames, ignore_index=True)
+
+
+# Remote CSVs at least this large are fetched as parallel byte ranges.
+DEFAULT_RANGE_MIN_BYTES = 128 * 1024 * 1024
+# Reader options that change how the first line or row boundaries are
+# interpreted, which a header-prefixed range cannot honour.
+_RANGE_UNSAFE_OPTIONS = frozenset(
+    ("compression", "chunksize", "iterator", "header", "names", "index_col", "skiprows", "skipfooter", "nrows", "storage_options")
+)
+
+
+def range_min_bytes() -> int:
+    """`DQ_ADLS_RANGE_MIN_BYTES`; 0 disables byte-range reads."""
+    try:
+        return max(0, int(os.environ.get("DQ_ADLS_RANGE_MIN_BYTES") or DEFAULT_RANGE_MIN_BYTES))
+    except ValueError:
+        logger.warning("Ignoring invalid DQ_ADLS_RANGE_MIN_BYTES=%r", os.environ.get("DQ_ADLS_RANGE_MIN_BYTES"))
+        return DEFAULT_RANGE_MIN_BYTES
+
+
+def remote_size(location: str) -> int:
+    """Byte size of the `abfs://` object at `location`, or 0 when unknown."""
+    from .adls import ADLSClient
+
+    container, path = split_abfs_uri(location)
+    try:
+        return int(ADLSClient().size(container, path))
+    except Exception as exc:
+        logger.debug("Could not size %s: %s", location, exc)
+        return 0
+
+
+def _range_size(client: Any, container: str, path: str, reader_options: Dict[str, Any]) -> int:
+    """Size of a remote CSV that is read in byte ranges, else 0."""
+    from .compression import compression_from_extension
+
+    threshold = range_min_bytes()
+    if (
+        not threshold
+        or not path.lower().endswith((".csv", ".txt"))
+        or compression_from_extension(path) is not None
+        or _RANGE_UNSAFE_OPTIONS.intersection(reader_options)
+    ):
+        return 0
+    try:
+        size = client.size(container, path)
+    except Exception as exc:
+        logger.debug("Could not size %s/%s for a range read: %s", container, path, exc)
+        return 0
+    return size if size >= threshold else 0
+
+
+def read_remote_csv(client: Any, container: str, path: str, **reader_options: Any) -> Any:
+    """Read a remote CSV, with parallel byte-range requests when it is large.
+
+    Uncompressed `.csv`/`.txt` objects of at least `range_min_bytes()` are
+    read with `ADLSClient.read_csv_ranges` in file order and concatenated;
+    everything else (and files with quoted multi-line fields, by setting
+    `DQ_ADLS_RANGE_MIN_BYTES=0`) goes through `ADLSClient.read_csv`. The
+    whole file is returned as one DataFrame; `iter_file_chunks` streams the
+    ranges to chunked validation instead.
+    """
+    size = _range_size(client, container, path, reader_options)
+    if size:
+        import pandas as pd
+
+        frames = [frame for _, frame in client.read_csv_ranges(container, path, ordered=True, **reader_options)]
+        logger.info("Read %s/%s (%d MiB) in %d byte ranges", container, path, size // (1024 * 1024), len(frames))
+        return pd.concat(frames, ignore_index=True)
+    return client.read_csv(container, path, **reader_options)
+
+
+def read_file(asset_type: str, location: str, **reader_options: Any) -> Any:
+    """Read a single CSV or Parquet file (local path or abfs:// URI)."""
+    if _is_remote(location):
+        from .adls import ADLSClient
+
+        container, path = split_abfs_uri(location)
+        client = ADLSClient()
+        if asset_type == "parquet":
+            return client.read_parquet(container, path, **reader_options)
+        return read_remote_csv(client, container, path, **reader_options)
+    import pandas as pd
+
+    reader = pd.read_parquet if asset_type == "parquet" else pd.read_csv
+    return reader(location, **reader_options)
+
+
+def iter_file_chunks(asset_type: str, location: str, chunk_rows: int, **reader_options: Any) -> Iterator[Any]:
+    """Yield a CSV or Parquet file as DataFrames of at most `chunk_rows` rows.
+
+    Used for sources too large to validate in one piece. CSV files may be
+    local or `abfs://` URIs; large remote CSVs are fetched as parallel byte
+    ranges (see `read_remote_csv`) and yielded in file order as each range
+    arrives, so validation starts with the first range. Parquet files are
+    read one record batch at a time and must be local.
+    """
+    if asset_type == "parquet":
+        if _is_remote(location):
+            raise ValueError("Chunked reading of remote Parquet files is not supported")
+        import pyarrow.parquet as pq
+
+        columns = reader_options.get("columns")
+        for batch in pq.ParquetFile(location).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+    if asset_type != "csv":
+        raise ValueError(f"asset_type '{asset_type}' cannot be read in chunks")
+    if _is_remote(location):
+        from .adls import ADLSClient
+
+        container, path = split_abfs_uri(location)
+        client = ADLSClient()
+        if _range_size(client, container, path, reader_options):
+            for _, frame in client.read_csv_ranges(container, path, ordered=True, **reader_options):
+                for start in range(0, len(frame), chunk_rows):
+                    yield frame.iloc[start:start + chunk_rows]
+            return
+        reader = client.read_csv(container, path, chunksize=chunk_rows, **reader_options)
+    else:
+        import pandas as pd
+
+        reader = pd.read_csv(location, chunksize=chunk_rows, **reader_options)
+    # `closing`: the remote reader may be a generator (compressed objects).
+    with closing(reader):
+        yield from reader
+
+
+def _load(asset_type: str, location: str, options: Dict[str, Any]) -> Any:
+    if asset_type == "delta":
+        return read_delta(location, **options)
+    if asset_type == "directory":
+        fmt = options.pop("format", "csv")
+        return read_directory(location, fmt=fmt, **options)
+    if asset_type in ("csv", "parquet"):
+        return read_file(asset_type, location, **options)
+    raise ValueError(f"asset_type '{asset_type}' is not loaded as a DataFrame")
+
+
+def load_frame(asset_type: str, location: str, reader_options: Optional[Dict[str, Any]] = None, cache: Any = None) -> Any:
+    """Load the DataFrame for `asset_type` at `location`.
+
+    When a `dq_docker.parse_cache.ParseCache` is given, a previously parsed
+    copy of the same input (same fingerprint and reader options) is
+    memory-mapped instead of parsing again.
+    """
+    options = dict(reader_options or {})
+    if cache is None:
+        return _load(asset_type, location, options)
+    return cache.get_or_load(asset_type, location, options, lambda: _load(asset_type, location, dict(options)))
@@ -0,0 +1,185 @@
+"""Per-source result formats with bounded unexpected lists.
+
+`gx_config.RESULT_FORMAT` is the default for every source. A source can
+override it with a `result_format` key, either a name or a mapping::
+
+    result_format: BOOLEAN_ONLY
+
+    result_format:
+      result_format: SUMMARY
+      unexpected_limit: 50
+      unexpected_index_column_names: [customer_id]
+
+`resolve_result_format` compiles that into the dict Great Expectations
+expects. Unexpected value and index lists are capped at `unexpected_limit`
+entries (default `DQ_RESULT_UNEXPECTED_LIMIT`, else 20) through GE's own
+`partial_unexpected_count`, so the cap applies while the metrics are
+computed. `COMPLETE` has no such cap in GE and is therefore downgraded to a
+capped `SUMMARY`, unless the limit is negative (no cap).
+
+`DQ_RESULT_FORMAT` overrides the format name of every source; set it to
+`BOOLEAN_ONLY` for gating runs that only need pass/fail, which skips
+computing unexpected values altogether.
+
+`dq_docker.result_format.ValidationResultsStore` (also available as
+`CompactValidationResultsStore`) serializes one expectation result at a
+time (`iter_result_json`) instead of copying the whole suite result twice,
+and truncates any unexpected list still longer than its `unexpected_limit`.
+Great Expectations recognises the results store by its class name and
+otherwise adds an in-memory one, so the class keeps GE's name and is
+selected with `module_name` in `gx/great_expectations.yml`::
+
+    validation_results_store:
+      class_name: ValidationResultsStore
+      module_name: dq_docker.result_format
+      unexpected_limit: 20
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+
+from great_expectations.util import convert_to_json_serializable
+from great_expectations.data_context.store.validation_results_store import ValidationResultsStore as _GEValidationResultsStore
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+RESULT_FORMATS = ("BOOLEAN_ONLY", "BASIC", "SUMMARY", "COMPLETE")
+DEFAULT_UNEXPECTED_LIMIT = 20
+# Keys of a per-source `result_format` mapping.
+SPEC_KEYS = ("result_format", "unexpected_limit", "unexpected_index_column_names", "exclude_unexpected_values")
+# Lists in an expectation's `result` that grow with the number of failing rows.
+CAPPED_KEYS = (
+    "unexpected_list",
+    "unexpected_index_list",
+    "partial_unexpected_list",
+    "partial_unexpected_index_list",
+    "partial_unexpected_counts",
+    "unexpected_rows",
+)
+
+
+def default_unexpected_limit() -> int:
+    """`DQ_RESULT_UNEXPECTED_LIMIT`, else `DEFAULT_UNEXPECTED_LIMIT`."""
+    raw = os.environ.get("DQ_RESULT_UNEXPECTED_LIMIT")
+    try:
+        return int(raw) if raw not in (None, "") else DEFAULT_UNEXPECTED_LIMIT
+    except ValueError:
+        logger.warning("Ignoring invalid DQ_RESULT_UNEXPECTED_LIMIT=%r", raw)
+        return DEFAULT_UNEXPECTED_LIMIT
+
+
+def _spec(value: Any) -> Dict[str, Any]:
+    if value is None:
+        return {}
+    if isinstance(value, str):
+        return {"result_format": value}
+    if not isinstance(value, dict):
+        raise ValueError(f"result_format must be a name or a mapping, got {type(value).__name__}")
+    spec = dict(value)
+    if "partial_unexpected_count" in spec:
+        spec.setdefault("unexpected_limit", spec.pop("partial_unexpected_count"))
+    unknown = sorted(set(spec) - set(SPEC_KEYS))
+    if unknown:
+        raise ValueError(f"Unknown result_format option(s) {unknown}; expected {list(SPEC_KEYS)}")
+    return spec
+
+
+def resolve_result_format(source_spec: Any = None, default: Any = None) -> Dict[str, Any]:
+    """Compile a source's `result_format` over `default` into a GE result
+    format dict. Raises ValueError for unknown names or options."""
+    spec = _spec(default)
+    spec.update(_spec(source_spec))
+    override = os.environ.get("DQ_RESULT_FORMAT")
+    if override:
+        spec["result_format"] = override
+
+    name = str(spec.get("result_format") or "SUMMARY").strip().upper()
+    if name not in RESULT_FORMATS:
+        raise ValueError(f"Unsupported result_format {name!r}; expected one of {list(RESULT_FORMATS)}")
+    if name == "BOOLEAN_ONLY":
+        return {"result_format": name}
+
+    limit = spec.get("unexpected_limit")
+    try:
+        limit = default_unexpected_limit() if limit is None else int(limit)
+    except (TypeError, ValueError):
+        raise ValueError(f"unexpected_limit must be an integer, got {spec.get('unexpected_limit')!r}")
+    if name == "COMPLETE" and limit >= 0:
+        name = "SUMMARY"
+
+    compiled: Dict[str, Any] = {"result_format": name}
+    if limit >= 0:
+        compiled["partial_unexpected_count"] = limit
+    for key in ("unexpected_index_column_names", "exclude_unexpected_values"):
+        if spec.get(key) is not None:
+            compiled[key] = spec[key]
+    return compiled
+
+
+def cap_result(result: Optional[Dict[str, Any]], limit: int) -> Optional[Dict[str, Any]]:
+    """Return `result` with every list in `CAPPED_KEYS` cut to `limit`
+    entries. A negative limit leaves it unchanged."""
+    if not isinstance(result, dict) or limit < 0:
+        return result
+    capped = dict(result)
+    for key in CAPPED_KEYS:
+        value = capped.get(key)
+        if isinstance(value, list) and len(value) > limit:
+            capped[key] = value[:limit]
+    return capped
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def iter_result_json(suite_result: Any, limit: int = -1) -> Iterator[str]:
+    """Yield the JSON of an `ExpectationSuiteValidationResult` in pieces.
+
+    Only one expectation result is converted at a time, and its unexpected
+    lists are capped with `cap_result`. The joined output loads with the
+    store's `ExpectationSuiteValidationResultSchema`.
+    """
+    header = {
+        "id": str(suite_result.id) if getattr(suite_result, "id", None) else None,
+        "meta": convert_to_json_serializable(suite_result.meta),
+        "statistics": convert_to_json_serializable(suite_result.statistics),
+        "success": suite_result.success,
+        "suite_name": suite_result.suite_name,
+        "suite_parameters": convert_to_json_serializable(suite_result.suite_parameters),
+    }
+    yield "{"
+    for key in sorted(k for k in header if k < "results"):
+        yield f"{_dumps(key)}: {_dumps(header[key])}, "
+    yield '"results": ['
+    for i, result in enumerate(suite_result.results or []):
+        doc = result.to_json_dict()
+        if "result" in doc:
+            doc["result"] = cap_result(doc["result"], limit)
+        yield (", " if i else "") + _dumps(doc)
+    yield "]"
+    for key in sorted(k for k in header if k > "results"):
+        yield f", {_dumps(key)}: {_dumps(header[key])}"
+    yield "}"
+
+
+class ValidationResultsStore(_GEValidationResultsStore):
+    """GE's `ValidationResultsStore` with a streaming, size-bounded serializer."""
+
+    def __init__(self, store_backend=None, runtime_environment=None, store_name=None, unexpected_limit=None) -> None:
+        super().__init__(store_backend=store_backend, runtime_environment=runtime_environment, store_name=store_name)
+        self.unexpected_limit = default_unexpected_limit() if unexpected_limit is None else int(unexpected_limit)
+        if unexpected_limit is not None:
+            self._config["unexpected_limit"] = unexpected_limit
+
+    def serialize(self, value):  # type: ignore[explicit-override]
+        if self.cloud_mode:
+            return super().serialize(value)
+        return "".join(iter_result_json(value, self.unexpected_limit))
+
+
+CompactValidationResultsStore = ValidationResultsStore
@@ -0,0 +1,307 @@
+"""Retention and compaction of the validation results store.
+
+Every checkpoint run adds a validation result to the results store
+(`gx/uncommitted/validations/` by default), and store listings and Data
+Docs rebuilds slow down as it grows. `compact_validation_results` applies a
+`RetentionPolicy` per expectation suite:
+
+- `keep_last`: keep the newest N runs of each suite;
+- `keep_days`: keep results whose run time is within the last X days.
+
+A result is kept when any configured rule keeps it. Expired results are
+flattened to one row per expectation result and appended to a
+zstd-compressed Parquet archive partitioned by suite
+(`<archive_dir>/suite=<name>/part-*.parquet`); only after the archive file
+is written are the store entries deleted. `read_archive` loads the archive
+back into a DataFrame, optionally filtered by suite.
+
+Runs from `scripts/manage_ge_store.py --action compact` and, when
+`DQ_RESULTS_KEEP_LAST` or `DQ_RESULTS_KEEP_DAYS` is set, at the end of
+every `dq-docker-run`.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_DIRNAME = "validations_archive"
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class RetentionPolicy(NamedTuple):
+    keep_last: Optional[int] = None
+    keep_days: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep_last is not None or self.keep_days is not None
+
+
+def retention_policy_from_env() -> RetentionPolicy:
+    """Build a policy from `DQ_RESULTS_KEEP_LAST` / `DQ_RESULTS_KEEP_DAYS`."""
+    def _num(name: str, cast):
+        raw = str(os.environ.get(name, "")).strip()
+        if not raw:
+            return None
+        try:
+            return cast(raw)
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", name, raw)
+            return None
+
+    return RetentionPolicy(keep_last=_num("DQ_RESULTS_KEEP_LAST", int), keep_days=_num("DQ_RESULTS_KEEP_DAYS", float))
+
+
+def _parse_run_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    text = str(value)
+    for fmt in ("%Y%m%dT%H%M%S.%fZ", "%Y%m%dT%H%M%SZ"):
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def split_key(key: Tuple[str, ...]) -> Tuple[str, str, str, str]:
+    """Split a result key into `(suite, run_name, run_time, batch_id)`.
+
+    The suite name is stored as one key part per dot-separated component,
+    so the key is read from the end.
+    """
+    run_name, run_time, batch_id = key[-3:]
+    return ".".join(key[:-3]), run_name, run_time, batch_id
+
+
+def select_expired(keys: List[Tuple[str, ...]], policy: RetentionPolicy, now: Optional[datetime] = None) -> List[Tuple[str, ...]]:
+    """Return the result keys `(*suite, run_name, run_time, batch_id)` that
+    the policy does not keep."""
+    if not policy.enabled:
+        return []
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=policy.keep_days) if policy.keep_days is not None else None
+
+    by_suite: Dict[str, List[Tuple[str, ...]]] = defaultdict(list)
+    for key in keys:
+        if len(key) >= 4:
+            by_suite[split_key(key)[0]].append(key)
+
+    expired = []
+    for suite_keys in by_suite.values():
+        runs = sorted({(k[-2], k[-3]) for k in suite_keys}, reverse=True)
+        recent = set(runs[: policy.keep_last]) if policy.keep_last is not None else set()
+        for key in suite_keys:
+            if (key[-2], key[-3]) in recent:
+                continue
+            run_time = _parse_run_time(key[-2])
+            if cutoff is not None and (run_time is None or run_time >= cutoff):
+                continue
+            expired.append(key)
+    return sorted(expired)
+
+
+def _json(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, sort_keys=True, default=str)
+
+
+def flatten_result(key: Tuple[str, ...], document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten one stored validation result into one row per expectation."""
+    suite, run_name, run_time, batch_id = split_key(key)
+    meta = document.get("meta") or {}
+    run_id = meta.get("run_id") or {}
+    stats = document.get("statistics") or {}
+    base = {
+        "suite": document.get("suite_name") or suite,
+        "run_name": run_id.get("run_name") or (run_name if run_name != "__none__" else None),
+        "run_time": _parse_run_time(run_id.get("run_time")) or _parse_run_time(run_time),
+        "batch_id": batch_id,
+        "validation_success": bool(document.get("success")),
+        "evaluated_expectations": stats.get("evaluated_expectations"),
+        "success_percent": stats.get("success_percent"),
+        "checkpoint_id": meta.get("checkpoint_id"),
+        "ge_version": meta.get("great_expectations_version"),
+    }
+    rows = []
+    for res in document.get("results") or [{}]:
+        config = res.get("expectation_config") or {}
+        kwargs = dict(config.get("kwargs") or {})
+        result = res.get("result") or {}
+        rows.append({
+            **base,
+            "expectation_type": config.get("type") or config.get("expectation_type"),
+            "column": kwargs.get("column"),
+            "kwargs": _json(kwargs),
+            "success": res.get("success"),
+            "element_count": result.get("element_count"),
+            "unexpected_count": result.get("unexpected_count"),
+            "unexpected_percent": result.get("unexpected_percent"),
+            "observed_value": _json(result.get("observed_value")),
+            "result": _json(result),
+            "raised_exception": bool((res.get("exception_info") or {}).get("raised_exception")),
+        })
+    return rows
+
+
+def archive_schema() -> Any:
+    """Arrow schema of every archive file (`suite` is the partition key).
+
+    Fixed so that columns that happen to be all-null in one compaction are
+    not written as the null type, which later files could not be read
+    back together with.
+    """
+    import pyarrow as pa
+
+    return pa.schema([
+        ("run_name", pa.string()),
+        ("run_time", pa.timestamp("us", tz="UTC")),
+        ("batch_id", pa.string()),
+        ("validation_success", pa.bool_()),
+        ("evaluated_expectations", pa.int64()),
+        ("success_percent", pa.float64()),
+        ("checkpoint_id", pa.string()),
+        ("ge_version", pa.string()),
+        ("expectation_type", pa.string()),
+        ("column", pa.string()),
+        ("kwargs", pa.string()),
+        ("success", pa.bool_()),
+        ("element_count", pa.int64()),
+        ("unexpected_count", pa.int64()),
+        ("unexpected_percent", pa.float64()),
+        ("observed_value", pa.string()),
+        ("result", pa.string()),
+        ("raised_exception", pa.bool_()),
+    ])
+
+
+def _write_archive(rows: List[Dict[str, Any]], archive_dir: str) -> List[str]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = archive_schema()
+    by_suite: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_suite[str(row["suite"])].append(row)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    paths = []
+    for suite in sorted(by_suite):
+        folder = os.path.join(archive_dir, f"suite={_SAFE.sub('_', suite)}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet")
+        # Dot-prefixed so readers of the dataset skip partial files.
+        tmp = os.path.join(folder, "." + os.path.basename(path) + ".tmp")
+        table = pa.Table.from_pylist([{name: row.get(name) for name in schema.names} for row in by_suite[suite]], schema=schema)
+        try:
+            pq.write_table(table, tmp, compression="zstd")
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        paths.append(path)
+    return paths
+
+
+def default_archive_dir(context: Any) -> str:
+    root = getattr(context, "root_directory", None) or os.getcwd()
+    return os.path.join(root, "uncommitted", ARCHIVE_DIRNAME)
+
+
+def compact_validation_results(
+    context: Any,
+    policy: RetentionPolicy,
+    archive_dir: Optional[str] = None,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> dict:
+    """Archive and delete the validation results expired by `policy`.
+
+    Returns a summary with the number of results kept and expired, the
+    archive files written and the keys deleted.
+    """
+    summary: Dict[str, Any] = {"kept": 0, "expired": 0, "archived_rows": 0, "archives": [], "deleted": 0, "errors": []}
+    if not policy.enabled:
+        return summary
+    store = getattr(context, "validation_results_store", None)
+    backend = getattr(store, "store_backend", None)
+    if backend is None:
+        summary["errors"].append({"phase": "store", "error": "context has no validation results store"})
+        return summary
+
+    keys = [tuple(k) for k in backend.list_keys() if tuple(k) != backend.STORE_BACKEND_ID_KEY]
+    expired = select_expired(keys, policy, now=now)
+    summary["kept"] = len(keys) - len(expired)
+    summary["expired"] = len(expired)
+    if dry_run or not expired:
+        return summary
+
+    rows, readable = [], []
+    for key in expired:
+        try:
+            document = json.loads(backend.get(key))
+        except Exception as exc:
+            summary["errors"].append({"key": "/".join(key), "error": str(exc)})
+            continue
+        rows.extend(flatten_result(key, document))
+        readable.append(key)
+
+    if not readable:
+        return summary
+    try:
+        summary["archives"] = _write_archive(rows, archive_dir or default_archive_dir(context))
+    except Exception as exc:
+        # Never delete results that were not archived.
+        summary["errors"].append({"phase": "archive", "error": str(exc)})
+        logger.error("❌ Could not write validation results archive: %s", exc)
+        return summary
+    summary["archived_rows"] = len(rows)
+
+    remove_many = getattr(backend, "remove_keys", None)
+    if callable(remove_many):
+        summary["deleted"] = remove_many(readable)
+    else:
+        for key in readable:
+            try:
+                backend.remove_key(key)
+                summary["deleted"] += 1
+            except Exception as exc:
+                summary["errors"].append({"key": "/".join(key), "error": str(exc)})
+    logger.info(
+        "✅ Compacted %d validation result(s) into %d archive file(s); %d kept",
+        summary["deleted"], len(summary["archives"]), summary["kept"],
+    )
+    return summary
+
+
+def read_archive(archive_dir: str, suite: Optional[str] = None) -> Any:
+    """Load archived results as a DataFrame (one row per expectation)."""
+    import pandas as pd
+
+    import pyarrow as pa
+
+    # Reading with the archive schema also casts null-typed columns of
+    # files written before the schema was fixed.
+    schema = archive_schema()
+    if suite is not None:
+        path = os.path.join(archive_dir, f"suite={_SAFE.sub('_', suite)}")
+        frame = pd.read_parquet(path, schema=schema) if os.path.isdir(path) else pd.DataFrame()
+        frame["suite"] = suite
+        return frame
+    if not os.path.isdir(archive_dir):
+        return pd.DataFrame()
+    return pd.read_parquet(archive_dir, schema=schema.append(pa.field("suite", pa.string())), partitioning="hive")
@@ -1,4 +1,7 @@
+import argparse
 import os
+import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 from .expectations import build_expectation_suite
@@ -9,6 +12,9 @@ from .batch_definition import get_batch_and_preview
 from .expectation_suite import add_suite_to_context
 from .validation_definition import create_or_get_validation_definition
 from .checkpoint import create_and_run_checkpoint, repair_ge_store, clear_ge_store
+from .retention import compact_validation_results, retention_policy_from_env
+from .history import RunHistory, default_history_path, history_enabled
+from .namespace import drop_run_scope
 
 from .config import gx_config as cfg
 
@@ -36,17 +42,71 @@ configure_logging()
 logger = get_logger(__name__)
 
 # local helpers (imported at module level so unit tests can monkeypatch them)
-from .context import get_context
+from .context import EphemeralProject, context_mode, get_context
 from .data_docs import ensure_data_docs_site, get_data_docs_urls
 from .validator import run_validations
+from .watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, watch_sources
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="dq-docker-run", description="Run data quality validations.")
+    parser.add_argument("--watch", action="store_true", help="keep running and re-validate sources when their files change")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE, help="seconds of quiet before a burst of changes is validated")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, help="polling interval when inotify is unavailable")
+    # Ignore unknown arguments so `main()` can be called from test runners
+    # and wrappers that leave their own flags in `sys.argv`.
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return args
+
+
+def _apply_retention(context):
+    """Compact expired validation results when a retention policy is set
+    (`DQ_RESULTS_KEEP_LAST` / `DQ_RESULTS_KEEP_DAYS`)."""
+    policy = retention_policy_from_env()
+    if not policy.enabled:
+        return None
+    try:
+        summary = compact_validation_results(context, policy, archive_dir=os.environ.get("DQ_RESULTS_ARCHIVE_DIR") or None)
+        logger.info("Validation results retention summary: %s", summary)
+        return summary
+    except Exception:
+        logger.exception("Validation results compaction failed; continuing.")
+        return None
 
 
-def main():
+def _open_history():
+    """Open the run-history index (`DQ_HISTORY_DB`) unless `DQ_HISTORY=0`."""
+    if not history_enabled():
+        return None
+    try:
+        return RunHistory(default_history_path(PROJECT_ROOT))
+    except Exception:
+        logger.exception("Could not open the run-history index; runs will not be recorded.")
+        return None
+
+
+@contextmanager
+def _recorded_run(history):
+    """Open a run in the history index and finish it even if validation raises."""
+    if history is not None:
+        history.start_run(os.environ.get("DQ_RUN_NAME"))
+    try:
+        yield
+    finally:
+        if history is not None:
+            history.finish_run()
+
+
+def main(argv=None):
     """Orchestrate creating datasources, suites, validation and checkpoint.
 
     The function uses lazy imports of Great Expectations internals so tests
-    can monkeypatch `great_expectations` when needed.
+    can monkeypatch `great_expectations` when needed. With `--watch` the
+    process stays up after the initial run and re-validates sources whose
+    files change, reusing the same context.
     """
+    args = _parse_args(argv)
+
     # Great Expectations is imported at module level; if unavailable the
     # import would have failed earlier and this function will not execute.
 
@@ -90,21 +150,75 @@ def main():
     except Exception:
         logger.debug("Could not determine GE_STORE_ACTION flag; skipping store actions.")
 
+    # Optional ephemeral mode (`DQ_CONTEXT_MODE=ephemeral`): validate
+    # against an in-memory copy of the project and write back only what
+    # changed once the run is over.
+    file_context, ephemeral = context, None
+    if context_mode() == "ephemeral":
+        try:
+            ephemeral = EphemeralProject(context)
+            context = ephemeral.context
+        except Exception:
+            logger.exception("Could not build the ephemeral context; using the file context.")
+
     from dq_docker.data_sources import DATA_SOURCES as ALL_DATA_SOURCES
 
-    urls = run_validations(
-        context,
-        ALL_DATA_SOURCES,
-        cfg.DATA_SOURCE_NAME,
-        PROJECT_ROOT,
-        SOURCE_FOLDER,
-        DATA_DOCS_SITE_NAMES,
-        RESULT_FORMAT,
-    )
+    # Optional tag selection (`DQ_SOURCE_TAGS=finance,daily`) when no single
+    # source is selected; only the matching catalog entries are loaded.
+    tags = [t.strip() for t in os.environ.get("DQ_SOURCE_TAGS", "").split(",") if t.strip()]
+    if tags and not cfg.DATA_SOURCE_NAME and hasattr(ALL_DATA_SOURCES, "select"):
+        ALL_DATA_SOURCES = ALL_DATA_SOURCES.select(tags=tags)
+        logger.info("Selected %d data source(s) tagged %s", len(ALL_DATA_SOURCES), tags)
 
+    history = _open_history()
+    try:
+        _run_and_watch(args, context, file_context, ephemeral, ALL_DATA_SOURCES, history)
+    finally:
+        if history is not None:
+            history.close()
+
+
+def _run_and_watch(args, context, file_context, ephemeral, data_sources, history):
+    """Validate `data_sources` once and, with `--watch`, keep re-validating
+    the sources whose files change."""
+    with _recorded_run(history):
+        urls = run_validations(
+            context,
+            data_sources,
+            cfg.DATA_SOURCE_NAME,
+            PROJECT_ROOT,
+            SOURCE_FOLDER,
+            DATA_DOCS_SITE_NAMES,
+            RESULT_FORMAT,
+            history=history,
+        )
+
+    drop_run_scope(context)
+    if ephemeral is not None:
+        ephemeral.flush()
     if urls is not None:
         logger.info("✅ Data Docs are available at: %s", urls)
 
+    _apply_retention(file_context)
+
+    if args.watch:
+        if cfg.DATA_SOURCE_NAME:
+            watched = {cfg.DATA_SOURCE_NAME: data_sources[cfg.DATA_SOURCE_NAME]}
+        else:
+            watched = dict(data_sources)
+
+        def _revalidate(affected):
+            with _recorded_run(history):
+                urls = run_validations(context, affected, None, PROJECT_ROOT, SOURCE_FOLDER, DATA_DOCS_SITE_NAMES, RESULT_FORMAT, history=history)
+            drop_run_scope(context)
+            if ephemeral is not None:
+                ephemeral.flush()
+            if urls is not None:
+                logger.info("✅ Data Docs are available at: %s", urls)
+            _apply_retention(file_context)
+
+        watch_sources(watched, PROJECT_ROOT, SOURCE_FOLDER, _revalidate, debounce=args.debounce, poll_interval=args.poll_interval)
+
 
 if __name__ == "__main__":
     # Enforce runtime configuration when invoked as a script/module
@@ -0,0 +1,237 @@
+"""Source templates: one YAML file that expands into many data sources.
+
+A per-source YAML file under `dq_docker/config/data_sources/` with a
+top-level `template` mapping is expanded at load time instead of being used
+as a single source::
+
+    template:
+      root: gx/sample_data            # local dir (relative to the project
+                                      # root) or abfs://container/prefix
+      regex: (?P<feed>\\w+)/(?P<feed2>\\w+)_(?P<year>\\d{4})\\.csv
+      # glob: "*/*.csv"               # alternative to `regex`
+      targets: files                  # or `directories`
+      name: ds_{feed}_{year}
+    source:
+      source_folder: "{root}/{parent}"
+      asset_name: "{feed}"
+      batch_definition_name: "{name}"
+      batch_definition_path: "{name}"
+      expectation_suite_name: "{feed}_suite"
+      definition_name: "{feed}_{year}"
+
+Every path below `root` that fully matches `regex` (or `glob`) becomes one
+source. String values in `source` and `name` are formatted with the
+regex's named groups plus `root`, `path` (relative path), `name`
+(basename), `stem` and `parent` (relative parent directory).
+
+Expansions are cached under `DQ_CACHE_DIR` and keyed by a fingerprint of
+the template and the underlying listing (directory mtimes for local roots,
+ETag/last-modified/size for remote ones), so unchanged trees are not
+re-expanded. Listing a remote root is itself the expensive part, so a
+cached remote expansion of the same template is reused without listing
+for `DQ_TEMPLATE_CACHE_TTL` seconds (default 300; 0 lists on every load).
+"""
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import posixpath
+import re
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import cache_dir
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+TEMPLATE_KEY = "template"
+TARGETS = ("files", "directories")
+DEFAULT_REMOTE_TTL = 300.0
+
+
+def is_template(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get(TEMPLATE_KEY), dict)
+
+
+def _project_root() -> str:
+    computed = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    return os.environ.get("DQ_PROJECT_ROOT", computed)
+
+
+def remote_cache_ttl() -> float:
+    """`DQ_TEMPLATE_CACHE_TTL`: seconds a remote expansion is reused unlisted."""
+    try:
+        return max(0.0, float(os.environ.get("DQ_TEMPLATE_CACHE_TTL") or DEFAULT_REMOTE_TTL))
+    except ValueError:
+        logger.warning("Ignoring invalid DQ_TEMPLATE_CACHE_TTL=%r", os.environ.get("DQ_TEMPLATE_CACHE_TTL"))
+        return DEFAULT_REMOTE_TTL
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _list_local(root: str, targets: str) -> Tuple[List[str], List[Any]]:
+    """Return candidate relative paths and the directory mtimes of `root`."""
+    candidates: List[str] = []
+    dir_mtimes: List[Any] = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        full = os.path.join(root, rel_dir) if rel_dir else root
+        dir_mtimes.append((rel_dir, os.stat(full).st_mtime_ns))
+        with os.scandir(full) as it:
+            for entry in it:
+                rel = posixpath.join(rel_dir, entry.name) if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(rel)
+                    if targets == "directories":
+                        candidates.append(rel)
+                elif targets == "files":
+                    candidates.append(rel)
+    return sorted(candidates), sorted(dir_mtimes)
+
+
+def _list_remote(root: str, targets: str) -> Tuple[List[str], List[Any]]:
+    from .adls import ADLSClient
+    from .adls.listing import entry_signature
+    from .readers import split_abfs_uri
+
+    container, prefix = split_abfs_uri(root)
+    base = f"{container}/{prefix.strip('/')}".rstrip("/") + "/"
+    candidates, signatures = set(), []
+    for entry in ADLSClient().iter_files(container, prefix):
+        name = str(entry["name"])
+        rel = name[len(base):] if name.startswith(base) else name
+        signatures.append((rel, entry_signature(entry)))
+        if targets == "files":
+            candidates.add(rel)
+        elif "/" in rel:
+            parts = rel.split("/")[:-1]
+            candidates.update("/".join(parts[: i + 1]) for i in range(len(parts)))
+    return sorted(candidates), sorted(signatures, key=lambda s: s[0])
+
+
+def _compile_matcher(spec: Dict[str, Any]):
+    if spec.get("regex"):
+        pattern = re.compile(spec["regex"])
+        return lambda rel: pattern.fullmatch(rel)
+    if spec.get("glob"):
+        pattern = re.compile(fnmatch.translate(spec["glob"]))
+        return lambda rel: pattern.match(rel)
+    raise ValueError("source template requires either 'regex' or 'glob'")
+
+
+def _format(value: Any, fields: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return value.format(**fields)
+    if isinstance(value, dict):
+        return {k: _format(v, fields) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_format(v, fields) for v in value]
+    return value
+
+
+def _expand(spec: Dict[str, Any], source: Dict[str, Any], candidates: List[str]) -> Dict[str, Dict[str, Any]]:
+    match = _compile_matcher(spec)
+    name_tpl = spec.get("name")
+    if not name_tpl:
+        raise ValueError("source template requires a 'name' pattern")
+    expanded: Dict[str, Dict[str, Any]] = {}
+    for rel in candidates:
+        m = match(rel)
+        if not m:
+            continue
+        fields = {
+            "root": str(spec["root"]).rstrip("/"),
+            "path": rel,
+            "name": posixpath.basename(rel),
+            "stem": posixpath.splitext(posixpath.basename(rel))[0],
+            "parent": posixpath.dirname(rel),
+        }
+        fields.update({k: v or "" for k, v in m.groupdict().items()})
+        key = name_tpl.format(**fields)
+        if key in expanded:
+            raise ValueError(f"Template name '{name_tpl}' produced duplicate source '{key}' (from {rel})")
+        expanded[key] = _format(dict(source), fields)
+    return expanded
+
+
+def _read_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if isinstance(data, dict) and isinstance(data.get("sources"), dict):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def _write_cache(path: str, template: str, fingerprint: str, sources: Dict[str, Dict[str, Any]]) -> None:
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=".template-", dir=os.path.dirname(path))
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"template": template, "fingerprint": fingerprint, "listed_at": time.time(), "sources": sources}, fh)
+        os.replace(tmp, path)
+    except Exception:
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        logger.debug("Could not write template expansion cache %s", path, exc_info=True)
+
+
+def expand_template(data: Dict[str, Any], origin: str = "", project_root: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Expand a template mapping into `{source_name: source_conf}`.
+
+    `origin` identifies the template (usually its file path) for the
+    expansion cache.
+    """
+    spec = dict(data[TEMPLATE_KEY])
+    source = dict(data.get("source") or {})
+    if not spec.get("root"):
+        raise ValueError("source template requires a 'root'")
+    targets = str(spec.get("targets") or "files").lower()
+    if targets not in TARGETS:
+        raise ValueError(f"Unsupported template targets '{targets}'; expected one of {list(TARGETS)}")
+
+    root = str(spec["root"])
+    template = _digest({"spec": spec, "source": source})
+    cache_path = os.path.join(cache_dir("source_templates"), _digest(os.path.abspath(origin) if origin else spec) + ".json")
+    cached = _read_cache(cache_path)
+    if cached.get("template") != template:
+        cached = {}
+
+    if "://" in root:
+        ttl = remote_cache_ttl()
+        if cached and ttl and time.time() - float(cached.get("listed_at") or 0) < ttl:
+            logger.debug("Using cached expansion of %s without listing %s", origin, root)
+            return cached["sources"]
+        candidates, listing = _list_remote(root, targets)
+    else:
+        base = project_root or _project_root()
+        local_root = root if os.path.isabs(root) else os.path.join(base, root)
+        if not os.path.isdir(local_root):
+            logger.warning("Template root %s does not exist; no sources expanded from %s", local_root, origin)
+            return {}
+        candidates, listing = _list_local(local_root, targets)
+
+    fingerprint = _digest({"spec": spec, "source": source, "listing": listing})
+    if cached.get("fingerprint") == fingerprint:
+        logger.debug("Using cached expansion of %s (%d sources)", origin, len(cached["sources"]))
+        if "://" in root:
+            # Restart the TTL so the next loads skip the listing again.
+            _write_cache(cache_path, template, fingerprint, cached["sources"])
+        return cached["sources"]
+
+    expanded = _expand(spec, source, candidates)
+    logger.info("Expanded source template %s into %d source(s)", origin or root, len(expanded))
+    _write_cache(cache_path, template, fingerprint, expanded)
+    return expanded
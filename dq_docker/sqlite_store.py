@@ -0,0 +1,281 @@
+"""SQLite store backend for Great Expectations stores.
+
+`TupleFilesystemStoreBackend` keeps every suite, ValidationDefinition,
+checkpoint and validation result in its own JSON file, so listing keys (and
+anything built on it: store repair, Data Docs indexing) walks ever larger
+directory trees. `SQLiteStoreBackend` keeps the same key/value pairs in one
+SQLite file instead; several stores can share the file, each under its own
+`namespace`. Keys are indexed so listing (optionally by key prefix) is a
+single range scan, and `batch()` groups many writes into one transaction.
+
+Configure it in `gx/great_expectations.yml`::
+
+    validation_results_store:
+      class_name: ValidationResultsStore
+      store_backend:
+        class_name: SQLiteStoreBackend
+        module_name: dq_docker.sqlite_store
+        database: uncommitted/ge_store.sqlite
+        namespace: validations
+
+A relative `database` is resolved against the context's root directory.
+The backend subclasses `TupleStoreBackend`, so Great Expectations applies
+the same defaults (`.json` suffix, data context id) as for the filesystem
+backend.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from great_expectations.data_context.store.tuple_store_backend import TupleStoreBackend
+from great_expectations.exceptions import InvalidKeyError
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+# Key parts are joined with the ASCII unit separator, which cannot occur in
+# GE key elements, so a key prefix maps to a contiguous range of rows.
+SEP = "\x1f"
+_AFTER_SEP = chr(ord(SEP) + 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_objects (
+    namespace TEXT NOT NULL,
+    key_path TEXT NOT NULL,
+    value BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key_path)
+) WITHOUT ROWID
+"""
+
+
+def _join(key: Iterable[str]) -> str:
+    return SEP.join(key)
+
+
+def _split(key_path: str) -> Tuple[str, ...]:
+    return tuple(key_path.split(SEP))
+
+
+class SQLiteStoreBackend(TupleStoreBackend):
+    """Key/value store backend persisted in a single SQLite file."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        database: str = "ge_store.sqlite",
+        namespace: Optional[str] = None,
+        root_directory: Optional[str] = None,
+        filepath_template=None,
+        filepath_prefix=None,
+        filepath_suffix=None,
+        forbidden_substrings=None,
+        platform_specific_separator=False,
+        fixed_length_key=False,
+        suppress_store_backend_id=False,
+        manually_initialize_store_backend_id: str = "",
+        base_public_path=None,
+        store_name=None,
+        timeout: float = 30.0,
+    ) -> None:
+        super().__init__(
+            filepath_template=filepath_template,
+            filepath_prefix=filepath_prefix,
+            filepath_suffix=filepath_suffix,
+            forbidden_substrings=forbidden_substrings,
+            platform_specific_separator=platform_specific_separator,
+            fixed_length_key=fixed_length_key,
+            suppress_store_backend_id=suppress_store_backend_id,
+            manually_initialize_store_backend_id=manually_initialize_store_backend_id,
+            base_public_path=base_public_path,
+            store_name=store_name,
+        )
+        if os.path.isabs(database) or database == ":memory:":
+            self.database = database
+        elif root_directory is not None:
+            self.database = os.path.join(root_directory, database)
+        else:
+            raise ValueError("database must be an absolute path if root_directory is not provided")
+        self.namespace = namespace or store_name or "default"
+        self.timeout = timeout
+        self._local = threading.local()
+        if self.database != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.database)), exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute(_SCHEMA)
+
+        if not self._suppress_store_backend_id:
+            _ = self.store_backend_id
+
+        self._config = {
+            "database": database,
+            "namespace": namespace,
+            "root_directory": root_directory,
+            "filepath_template": filepath_template,
+            "filepath_prefix": filepath_prefix,
+            "filepath_suffix": filepath_suffix,
+            "forbidden_substrings": forbidden_substrings,
+            "platform_specific_separator": platform_specific_separator,
+            "fixed_length_key": fixed_length_key,
+            "suppress_store_backend_id": suppress_store_backend_id,
+            "manually_initialize_store_backend_id": manually_initialize_store_backend_id,
+            "base_public_path": base_public_path,
+            "store_name": store_name,
+            "module_name": self.__class__.__module__,
+            "class_name": self.__class__.__name__,
+        }
+        self._config = {k: v for k, v in self._config.items() if v not in (None, "", False)}
+
+    # -- connections ---------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.database, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            if self.database != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        outermost = self._local.depth == 0
+        if outermost:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if outermost:
+                conn.execute("ROLLBACK")
+            raise
+        self._local.depth -= 1
+        if outermost:
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def batch(self) -> Iterator["SQLiteStoreBackend"]:
+        """Group the writes made inside the block into one transaction.
+
+        Nothing is visible to other connections until the block exits, and
+        an exception rolls every write in the block back.
+        """
+        with self._transaction():
+            yield self
+
+    def set_many(self, items: Iterable[Tuple[Tuple[str, ...], Any]]) -> int:
+        """Write `(key, value)` pairs in a single transaction."""
+        rows = []
+        for key, value in items:
+            key = key if isinstance(key, tuple) else key.to_tuple()
+            self._validate_key(key)
+            self._validate_value(value)
+            rows.append((self.namespace, _join(key), value, time.time()))
+        with self._transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO store_objects VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # -- StoreBackend API ----------------------------------------------
+
+    def _get(self, key):  # type: ignore[override]
+        key = key if isinstance(key, tuple) else key.to_tuple()
+        row = self._connection().execute(
+            "SELECT value FROM store_objects WHERE namespace = ? AND key_path = ?", (self.namespace, _join(key))
+        ).fetchone()
+        if row is None:
+            raise InvalidKeyError(f"Unable to retrieve object from SQLiteStoreBackend with the following Key: {key}")
+        value = row[0]
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def _get_all(self) -> List[Any]:
+        rows = self._connection().execute(
+            "SELECT value FROM store_objects WHERE namespace = ? AND key_path != ? ORDER BY key_path",
+            (self.namespace, _join(self.STORE_BACKEND_ID_KEY)),
+        ).fetchall()
+        return [v.decode("utf-8") if isinstance(v, bytes) else v for (v,) in rows]
+
+    def _set(self, key, value, **kwargs):  # type: ignore[override]
+        key = key if isinstance(key, tuple) else key.to_tuple()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO store_objects VALUES (?, ?, ?, ?)",
+                (self.namespace, _join(key), value, time.time()),
+            )
+        return key
+
+    def _move(self, source_key, dest_key, **kwargs):  # type: ignore[override]
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE OR REPLACE store_objects SET key_path = ?, updated_at = ? WHERE namespace = ? AND key_path = ?",
+                (_join(dest_key), time.time(), self.namespace, _join(source_key)),
+            )
+        return dest_key if cur.rowcount else False
+
+    def list_keys(self, prefix: Tuple = ()) -> List[Tuple]:  # type: ignore[override]
+        conn = self._connection()
+        if prefix:
+            start = _join(prefix) + SEP
+            rows = conn.execute(
+                "SELECT key_path FROM store_objects WHERE namespace = ? AND key_path >= ? AND key_path < ? ORDER BY key_path",
+                (self.namespace, start, start[:-1] + _AFTER_SEP),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT key_path FROM store_objects WHERE namespace = ? ORDER BY key_path", (self.namespace,)
+            ).fetchall()
+        keys = [_split(k) for (k,) in rows]
+        return [k for k in keys if not self.is_ignored_key(k)]
+
+    def remove_key(self, key):  # type: ignore[override]
+        key = key if isinstance(key, tuple) else key.to_tuple()
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "DELETE FROM store_objects WHERE namespace = ? AND key_path = ?", (self.namespace, _join(key))
+            )
+        return bool(cur.rowcount)
+
+    def remove_keys(self, keys: Iterable[Tuple[str, ...]]) -> int:
+        """Delete many keys in one transaction; returns the number removed."""
+        rows = [(self.namespace, _join(k if isinstance(k, tuple) else k.to_tuple())) for k in keys]
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany("DELETE FROM store_objects WHERE namespace = ? AND key_path = ?", rows)
+            return conn.total_changes - before
+
+    def _has_key(self, key):  # type: ignore[override]
+        key = key if isinstance(key, tuple) else key.to_tuple()
+        row = self._connection().execute(
+            "SELECT 1 FROM store_objects WHERE namespace = ? AND key_path = ?", (self.namespace, _join(key))
+        ).fetchone()
+        return row is not None
+
+    def get_url_for_key(self, key, protocol=None) -> str:
+        path = "/".join(key if isinstance(key, tuple) else key.to_tuple())
+        return f"sqlite://{os.path.abspath(self.database)}#{self.namespace}/{self._url_path_escape_special_characters(path)}"
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of keys and bytes stored in this namespace."""
+        count, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM store_objects WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return {"namespace": self.namespace, "keys": count, "bytes": size}
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
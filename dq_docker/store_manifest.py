@@ -0,0 +1,148 @@
+"""Manifest of Great Expectations store entries already verified by repair.
+
+`repair_ge_store` finds stale ValidationDefinitions and Checkpoints by
+deserializing them, which gets slower as the stores grow. The manifest
+records, per store, every entry that deserialized cleanly together with the
+hash of its stored content and the ids it references (datasource, asset,
+batch definition and suite for a ValidationDefinition; ValidationDefinitions
+for a Checkpoint). A later repair re-checks an entry only when it is new,
+its content changed, or something it references no longer exists.
+
+The manifest is a JSON file at `DQ_STORE_MANIFEST` (default
+`<gx root>/uncommitted/store_manifest.json`) and is discarded when the
+Great Expectations version changes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILENAME = "store_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(value: Any) -> str:
+    """sha256 of a stored value as returned by the store backend."""
+    data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def entry_refs(kind: str, value: Any) -> List[str]:
+    """Ids referenced by a stored ValidationDefinition or Checkpoint."""
+    try:
+        doc = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(doc, dict):
+        return []
+    if kind == "validation_definitions":
+        data = doc.get("data") or {}
+        refs = [(data.get(part) or {}).get("id") for part in ("datasource", "asset", "batch_definition")]
+        refs.append((doc.get("suite") or {}).get("id"))
+    else:
+        refs = [vd.get("id") for vd in doc.get("validation_definitions") or [] if isinstance(vd, dict)]
+    return sorted(str(r) for r in refs if r)
+
+
+def entry_id(value: Any) -> Optional[str]:
+    try:
+        doc = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    return str(doc["id"]) if isinstance(doc, dict) and doc.get("id") else None
+
+
+def known_ids(context: Any) -> Optional[Set[str]]:
+    """Ids of the datasources, assets, batch definitions and suites that
+    currently exist, or None when they cannot be enumerated."""
+    ids: Set[str] = set()
+    try:
+        for datasource in context.data_sources.all().values():
+            ids.add(str(datasource.id))
+            for asset in datasource.assets:
+                ids.add(str(asset.id))
+                ids.update(str(bd.id) for bd in getattr(asset, "batch_definitions", []) or [])
+        backend = context.expectations_store.store_backend
+        for key in backend.list_keys():
+            suite_id = entry_id(backend.get(key))
+            if suite_id:
+                ids.add(suite_id)
+    except Exception as exc:
+        logger.debug("Could not enumerate store ids for the repair manifest: %s", exc)
+        return None
+    return ids
+
+
+def default_manifest_path(context: Any) -> Optional[str]:
+    configured = os.environ.get("DQ_STORE_MANIFEST")
+    if configured:
+        return configured
+    root = getattr(context, "root_directory", None)
+    return os.path.join(root, "uncommitted", MANIFEST_FILENAME) if root else None
+
+
+def _ge_version() -> str:
+    try:
+        import great_expectations as gx
+
+        return str(gx.__version__)
+    except Exception:
+        return "unknown"
+
+
+class StoreManifest:
+    """Verified entries per store kind: `{kind: {name: {hash, refs}}}`."""
+
+    def __init__(self, path: Optional[str], entries: Optional[Dict[str, Dict[str, dict]]] = None):
+        self.path = path
+        self.entries: Dict[str, Dict[str, dict]] = entries or {}
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "StoreManifest":
+        if not path or not os.path.exists(path):
+            return cls(path)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                doc = json.load(fh)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable store manifest %s: %s", path, exc)
+            return cls(path)
+        if doc.get("version") != MANIFEST_VERSION or doc.get("ge_version") != _ge_version():
+            logger.info("ℹ️ Store manifest %s is from another version; re-verifying every entry", path)
+            return cls(path)
+        return cls(path, doc.get("entries") or {})
+
+    def verified(self, kind: str, name: str, digest: str, existing: Optional[Set[str]]) -> bool:
+        record = self.entries.get(kind, {}).get(name)
+        if not record or record.get("hash") != digest:
+            return False
+        refs = record.get("refs") or []
+        if not refs:
+            return True
+        return existing is not None and all(r in existing for r in refs)
+
+    def record(self, kind: str, name: str, digest: str, refs: List[str]) -> None:
+        self.entries.setdefault(kind, {})[name] = {"hash": digest, "refs": refs}
+
+    def forget(self, kind: str, name: str) -> None:
+        self.entries.get(kind, {}).pop(name, None)
+
+    def retain(self, kind: str, names: Iterable[str]) -> None:
+        """Drop records of entries no longer in the store."""
+        keep = set(names)
+        self.entries[kind] = {n: r for n, r in self.entries.get(kind, {}).items() if n in keep}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": MANIFEST_VERSION, "ge_version": _ge_version(), "entries": self.entries}, fh, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,149 @@
+"""No-op detection for Great Expectations store writes.
+
+Every run re-adds its expectation suites and ValidationDefinitions and
+calls `checkpoints.add_or_update`, which rewrites the checkpoint, its
+ValidationDefinitions, their suites and the datasource configuration even
+when nothing changed. Before writing, the helpers here serialize the new
+object in memory with the store's own serializer and compare a normalised
+hash of it with the value already stored:
+
+- ids assigned by the store are ignored (the object's own `id`, and for
+  suites the per-expectation ids, which are regenerated on every build);
+- keys are sorted and whitespace is dropped, so formatting differences do
+  not count as changes.
+
+Unchanged objects are not written again. `write_stats()` counts written
+and skipped writes per store for the run summary.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+
+def _strip_ids(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [_strip_ids(v) for v in value]
+    return value
+
+
+def normalized_digest(value: Any, kind: str = "") -> Optional[str]:
+    """sha256 of the canonical JSON of a stored or serialized value, or
+    None when it is not JSON."""
+    try:
+        doc = json.loads(value) if isinstance(value, (str, bytes)) else value
+    except ValueError:
+        return None
+    if not isinstance(doc, dict):
+        return None
+    if kind == "suites":
+        doc = _strip_ids(doc)
+    else:
+        doc = {k: v for k, v in doc.items() if k != "id"}
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def stored_value(store: Any, name: str) -> Optional[Any]:
+    """Raw value stored under `name`, or None when absent or unreadable."""
+    backend = getattr(store, "store_backend", None)
+    if backend is None:
+        return None
+    try:
+        if not backend.has_key((name,)):
+            return None
+        return backend.get((name,))
+    except Exception:
+        return None
+
+
+def stored_id(value: Any) -> Optional[str]:
+    try:
+        doc = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    return doc.get("id") if isinstance(doc, dict) else None
+
+
+def unchanged(store: Any, name: str, obj: Any, kind: str = "") -> Optional[Any]:
+    """Return the stored value when `obj` serializes to the same content,
+    else None (absent, different, or not comparable)."""
+    existing = stored_value(store, name)
+    if existing is None:
+        return None
+    try:
+        candidate = store.serialize(obj)
+    except Exception:
+        return None
+    old, new = normalized_digest(existing, kind), normalized_digest(candidate, kind)
+    return existing if old is not None and old == new else None
+
+
+def checkpoint_unchanged(context: Any, checkpoint: Any) -> bool:
+    """True when the checkpoint, its ValidationDefinitions and their suites
+    are all stored with the same content. Assigns the stored ids to the
+    in-memory objects so they can run without being re-added."""
+    try:
+        stores = (context.checkpoint_store, context.validation_definition_store, context.expectations_store)
+        validation_definitions = list(checkpoint.validation_definitions)
+    except Exception:
+        return False
+    checkpoint_store, vd_store, suite_store = stores
+    matched = []
+    for vd in validation_definitions:
+        suite = getattr(vd, "suite", None)
+        if suite is None or unchanged(suite_store, suite.name, suite, kind="suites") is None:
+            return False
+        existing = unchanged(vd_store, vd.name, vd)
+        if existing is None:
+            return False
+        matched.append((vd, existing))
+    existing = unchanged(checkpoint_store, checkpoint.name, checkpoint)
+    if existing is None:
+        return False
+    for obj, value in matched + [(checkpoint, existing)]:
+        if not getattr(obj, "id", None):
+            obj.id = stored_id(value)
+    return True
+
+
+class WriteStats:
+    """Thread-safe counts of written and skipped writes per store."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _add(self, kind: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(kind, {"written": 0, "skipped": 0})
+            counts[outcome] += 1
+
+    def written(self, kind: str) -> None:
+        self._add(kind, "written")
+
+    def skipped(self, kind: str) -> None:
+        self._add(kind, "skipped")
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = {}
+
+
+_stats = WriteStats()
+
+
+def write_stats() -> WriteStats:
+    return _stats
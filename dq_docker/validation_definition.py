@@ -1,5 +1,6 @@
 from typing import Any, Optional
 from .logs import get_logger
+from .store_writes import stored_id, unchanged, write_stats
 
 # Import the conversion helper so we can attempt to turn simple suite
 # containers into a real GE ExpectationSuite before constructing a
@@ -9,6 +10,32 @@ from .expectation_suite import ensure_real_expectation_suite
 logger = get_logger(__name__)
 
 
+def _batch_definition_ref(batch_definition: Any) -> Optional[tuple]:
+    """(datasource, asset, batch definition) names, or None when unknown."""
+    try:
+        asset = batch_definition.data_asset
+        return (asset.datasource.name, asset.name, batch_definition.name)
+    except Exception:
+        return None
+
+
+def _replace_if_rebound(context: Any, existing: Any, validation_definition: Any) -> Any:
+    """Re-register `validation_definition` when the stored definition of the
+    same name validates a different batch definition, e.g. after a source
+    moved between its file and its dataframe datasource."""
+    stored_ref = _batch_definition_ref(getattr(existing, "data", None))
+    wanted_ref = _batch_definition_ref(getattr(validation_definition, "data", None))
+    if stored_ref is None or wanted_ref is None or stored_ref == wanted_ref:
+        return existing
+    try:
+        context.validation_definitions.delete(validation_definition.name)
+        vd = context.validation_definitions.add(validation_definition)
+    except Exception:
+        logger.debug("Could not rebind Validation Definition '%s' to %s", validation_definition.name, wanted_ref, exc_info=True)
+        return existing
+    logger.info("✅ Validation Definition '%s' now validates %s.", validation_definition.name, "/".join(wanted_ref))
+    return vd
+
 
 def create_or_get_validation_definition(context: Any, name: str, batch_definition: Any, suite: Any) -> Any:
     """Create a ValidationDefinition or reuse an existing one to be idempotent.
@@ -53,8 +80,17 @@ def create_or_get_validation_definition(context: Any, name: str, batch_definitio
     # Keep the original object in case store-add fails; some test harnesses
     # provide lightweight objects that cannot be serialized by GE stores.
     initial_vd = validation_definition
+    stats = write_stats()
+    existing = unchanged(getattr(context, "validation_definition_store", None), name, validation_definition)
+    if existing is not None:
+        # Identical to the stored definition: reuse its id instead of
+        # writing (or deserializing) it again.
+        validation_definition.id = stored_id(existing)
+        stats.skipped("validation_definitions")
+        return validation_definition
     try:
         vd = context.validation_definitions.add(validation_definition)
+        stats.written("validation_definitions")
         logger.info("✅ Validation Definition '%s' created.", name)
         return vd
     except Exception:
@@ -109,4 +145,4 @@ def create_or_get_validation_definition(context: Any, name: str, batch_definitio
             logger.warning("Could not add or find Validation Definition '%s'; returning local object.", name)
             return initial_vd
 
-        return validation_definition
+        return _replace_if_rebound(context, validation_definition, initial_vd)
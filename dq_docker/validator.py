@@ -1,15 +1,43 @@
 import os
+import pickle
 import re
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
 import importlib
 
 from .logs import get_logger
-from .data_source import ensure_pandas_filesystem, ensure_csv_asset
-from .batch_definition import ensure_batch_definition, get_batch_and_preview
+from .data_source import (
+    ASSET_TYPES,
+    FRAME_ASSET_TYPES,
+    ensure_asset,
+    ensure_csv_asset,
+    ensure_pandas_datasource,
+    ensure_pandas_filesystem,
+    filesystem_base_matches,
+    frame_datasource_name,
+)
+from .batch_definition import ensure_batch_definition, ensure_dataframe_batch_definition, get_batch_and_preview
 from .expectations import build_expectation_suite
 from .expectation_suite import add_suite_to_context
 from .validation_definition import create_or_get_validation_definition
 from .checkpoint import create_and_run_checkpoint
+from .compression import compression_from_extension, sniff_local
+from .precheck import SchemaPrecheckError, precheck_header
+from .readers import iter_file_chunks, load_frame, remote_size
+from .partitions import expand_partitions
+from .parse_cache import get_default_parse_cache, parse_cache_enabled
+from .prefetch import estimate_bytes, frame_bytes, prefetch_settings, run_prefetched
+from .memory import Estimate, chunk_rows, contract_column_types, estimate_peak, get_governor
+from .store_writes import write_stats
+from .result_format import resolve_result_format
+from .quarantine import QuarantineWriter, quarantine_settings
+from .chunked import ChunkResults, store_result, table_level_expectations, validate_chunk
+from .namespace import scope_source_conf
+from .batch_transport import ProcessLoader, load_processes
 
 # Eager imports (remove lazy imports)
 import great_expectations as gx  # noqa: F401
@@ -17,198 +45,729 @@ from great_expectations.checkpoint import UpdateDataDocsAction
 
 logger = get_logger(__name__)
 
+# Asset types that can be validated chunk by chunk when too large.
+CHUNKABLE_ASSET_TYPES = ("csv", "parquet")
 
-def run_validations(
-    context,
-    all_data_sources,
-    selected_name,
-    project_root,
-    module_source_folder,
-    data_docs_site_names,
-    result_format,
-):
-    """Run validations for one or more configured data sources.
 
-    Parameters mirror the runtime values in `run_adls_checkpoint.main()` so
-    this function can be unit-tested in isolation.
-    """
-
-    # Select which sources to run
-    if selected_name:
-        sources = [(selected_name, all_data_sources[selected_name])]
-    else:
-        sources = sorted(all_data_sources.items())
-
-    # Allow test harnesses to monkeypatch helper functions on the
-    # `dq_docker.run_adls_checkpoint` module. Prefer using any attributes
-    # that have been set there so unit tests can intercept behavior.
+def _resolve_helpers():
+    """Return the `dq_docker.run_adls_checkpoint` module and the helper
+    functions to use.
 
+    Allow test harnesses to monkeypatch helper functions on the
+    `dq_docker.run_adls_checkpoint` module. Prefer using any attributes
+    that have been set there so unit tests can intercept behavior.
+    """
     rac = importlib.import_module("dq_docker.run_adls_checkpoint")
+    defaults = {
+        "ensure_pandas_filesystem": ensure_pandas_filesystem,
+        "ensure_csv_asset": ensure_csv_asset,
+        "ensure_asset": ensure_asset,
+        "ensure_pandas_datasource": ensure_pandas_datasource,
+        "ensure_dataframe_batch_definition": ensure_dataframe_batch_definition,
+        "load_frame": load_frame,
+        "ensure_batch_definition": ensure_batch_definition,
+        "get_batch_and_preview": get_batch_and_preview,
+        "build_expectation_suite": build_expectation_suite,
+        "add_suite_to_context": add_suite_to_context,
+        "create_or_get_validation_definition": create_or_get_validation_definition,
+        "create_and_run_checkpoint": create_and_run_checkpoint,
+    }
+    return rac, SimpleNamespace(**{name: getattr(rac, name, fn) for name, fn in defaults.items()})
+
+
+def _resolve_source_folder(src_conf, project_root, module_source_folder):
+    sf = src_conf.get("source_folder")
+    remote_source = bool(sf) and "://" in str(sf)
+    source_folder = os.path.join(project_root, sf) if sf and not remote_source and not os.path.isabs(sf) else sf
+    if not remote_source and (not source_folder or not os.path.isdir(source_folder)):
+        if module_source_folder and os.path.isdir(module_source_folder):
+            source_folder = module_source_folder
+    return source_folder
+
+
+def _resolve_contract(project_root, batch_definition_name):
+    batch_stem = Path(batch_definition_name).stem
+    canonical_stem = re.sub(r"_\d{4}$", "", batch_stem)
+    # Prefer YAML contract files if present (support .yml/.yaml),
+    # fall back to the historical .contract.json filename.
+    contracts_dir = Path(project_root) / "contracts"
+    candidates = [f"{canonical_stem}.contract.yml", f"{canonical_stem}.contract.yaml", f"{canonical_stem}.contract.json"]
+    for c in candidates:
+        cand = contracts_dir / c
+        if cand.exists():
+            return cand
+    return contracts_dir / f"{canonical_stem}.contract.json"
+
+
+def prepare_source(context, src_name, src_conf, source_folder, project_root, helpers, frame=False):
+    """Register the datasource, asset, batch definition, suite and
+    ValidationDefinition for one source.
+
+    These steps mutate the DataContext and run serially. Returns a plan
+    (SimpleNamespace) consumed by `load_batch` and `execute_source`, or
+    None when the source must be skipped. With `frame=True` a CSV/Parquet
+    file is loaded by `load_batch` and validated as a dataframe, through
+    the `<source>__frame` datasource (see `frame_datasource_name`), instead
+    of being read by Great Expectations.
+    """
+    h = helpers
+    asset_name = src_conf.get("asset_name")
+    batch_definition_name = src_conf.get("batch_definition_name")
+    batch_definition_path = src_conf.get("batch_definition_path")
+    expectation_suite_name = src_conf.get("expectation_suite_name")
+    definition_name = src_conf.get("definition_name")
+    asset_type = str(src_conf.get("asset_type") or "csv").lower()
+    reader_options = dict(src_conf.get("reader_options") or {})
+
+    if asset_type not in ASSET_TYPES:
+        logger.error("❌ Unsupported asset_type '%s' for %s; expected one of %s", asset_type, src_name, list(ASSET_TYPES))
+        return None
 
-    ensure_pandas_filesystem_fn = getattr(rac, "ensure_pandas_filesystem", ensure_pandas_filesystem)
-    ensure_csv_asset_fn = getattr(rac, "ensure_csv_asset", ensure_csv_asset)
-    ensure_batch_definition_fn = getattr(rac, "ensure_batch_definition", ensure_batch_definition)
-    get_batch_and_preview_fn = getattr(rac, "get_batch_and_preview", get_batch_and_preview)
-    build_expectation_suite_fn = getattr(rac, "build_expectation_suite", build_expectation_suite)
-    add_suite_to_context_fn = getattr(rac, "add_suite_to_context", add_suite_to_context)
-    create_or_get_validation_definition_fn = getattr(rac, "create_or_get_validation_definition", create_or_get_validation_definition)
-    create_and_run_checkpoint_fn = getattr(rac, "create_and_run_checkpoint", create_and_run_checkpoint)
-
-    for src_name, src_conf in sources:
-        logger.info("--- Running validations for data source: %s ---", src_name)
-
-        sf = src_conf.get("source_folder")
-        source_folder = os.path.join(project_root, sf) if sf and not os.path.isabs(sf) else sf
-        asset_name = src_conf.get("asset_name")
-        batch_definition_name = src_conf.get("batch_definition_name")
-        batch_definition_path = src_conf.get("batch_definition_path")
-        expectation_suite_name = src_conf.get("expectation_suite_name")
-        definition_name = src_conf.get("definition_name")
-
-        if not source_folder or not os.path.isdir(source_folder):
-            if module_source_folder and os.path.isdir(module_source_folder):
-                source_folder = module_source_folder
+    try:
+        resolve_result_format(src_conf.get("result_format"))
+    except ValueError as exc:
+        logger.error("❌ Invalid result_format for %s: %s", src_name, exc)
+        return None
+    try:
+        quarantine = quarantine_settings(src_conf, context)
+    except ValueError as exc:
+        logger.error("❌ Invalid quarantine settings for %s: %s", src_name, exc)
+        return None
 
-        data_source = ensure_pandas_filesystem_fn(context, src_name, source_folder)
-        file_customers = ensure_csv_asset_fn(data_source, asset_name)
+    remote_source = bool(source_folder) and "://" in str(source_folder)
+
+    # pandas infers compression from `.gz`/`.zst`/... extensions; for
+    # compressed files without one, pass what the magic bytes say.
+    if asset_type == "csv" and batch_definition_path and source_folder and not remote_source and "compression" not in reader_options:
+        detected = sniff_local(os.path.join(source_folder, batch_definition_path))
+        if detected and not compression_from_extension(batch_definition_path):
+            reader_options["compression"] = detected
+
+    # With the parse cache, CSV/Parquet files are loaded (or memory-mapped
+    # from a previous parse) by `dq_docker.readers` like delta sources.
+    use_parse_cache = parse_cache_enabled(src_conf)
+
+    # With a memory budget (DQ_MEMORY_BUDGET), estimate the peak footprint
+    # for admission control; a CSV/Parquet file that alone exceeds the
+    # budget is validated chunk by chunk as dataframes instead.
+    governor = get_governor()
+    estimate = Estimate(0, 0)
+    rows_per_chunk = 0
+    # Remote CSVs are sized with one metadata request so large ones stream
+    # their byte ranges into chunked validation.
+    if governor is not None and (not remote_source or asset_type == "csv"):
+        location = os.path.join(source_folder, batch_definition_path) if source_folder and batch_definition_path else source_folder
+        contract_path = _resolve_contract(project_root, batch_definition_name) if batch_definition_name else None
+        column_types = contract_column_types(str(contract_path) if contract_path else None)
+        size = remote_size(location) if remote_source and batch_definition_path else None
+        estimate = estimate_peak(location, asset_type, column_types, reader_options, size=size)
+        if governor.oversize(estimate.peak_bytes) and asset_type in CHUNKABLE_ASSET_TYPES and batch_definition_path:
+            rows_per_chunk = chunk_rows(estimate, governor.budget)
+            logger.info(
+                "ℹ️ %s needs ~%d MiB (budget %d MiB); validating in chunks of %d rows",
+                src_name, estimate.peak_bytes // (1024 * 1024), governor.budget // (1024 * 1024), rows_per_chunk,
+            )
+
+    # Remote (`abfs://`) CSV/Parquet files cannot back a pandas_filesystem
+    # datasource, which needs a local base_directory. Quarantined files are
+    # loaded as dataframes so the rows written out are the rows validated.
+    # A datasource registered by a runner with another mount point is left
+    # as it is (rewriting it would re-point every other runner); the file
+    # is loaded here instead.
+    as_frame = (
+        asset_type in FRAME_ASSET_TYPES
+        or bool(rows_per_chunk)
+        or (asset_type in CHUNKABLE_ASSET_TYPES and (use_parse_cache or remote_source or (frame and bool(batch_definition_path))))
+        or (asset_type in CHUNKABLE_ASSET_TYPES and quarantine is not None and bool(batch_definition_path))
+        or (
+            asset_type in CHUNKABLE_ASSET_TYPES
+            and bool(batch_definition_path)
+            and not filesystem_base_matches(context, src_name, source_folder)
+        )
+    )
+
+    if as_frame:
+        # Delta tables, whole directories and remote files are loaded by
+        # `dq_docker.readers` and validated as a runtime dataframe.
+        data_source = h.ensure_pandas_datasource(context, frame_datasource_name(src_name, asset_type))
+        asset = h.ensure_asset(data_source, asset_name, asset_type if asset_type in FRAME_ASSET_TYPES else "dataframe")
+        batch_definition = h.ensure_dataframe_batch_definition(asset, batch_definition_name or asset_name)
+    else:
+        data_source = h.ensure_pandas_filesystem(context, src_name, source_folder)
+        if asset_type == "csv" and not reader_options:
+            asset = h.ensure_csv_asset(data_source, asset_name)
+        else:
+            asset = h.ensure_asset(data_source, asset_name, asset_type, **reader_options)
 
         logger.info("Files: %s", os.listdir(source_folder) if source_folder else [])
 
-        batch_definition = ensure_batch_definition_fn(file_customers, batch_definition_name, batch_definition_path)
-        batch = get_batch_and_preview_fn(batch_definition)
-
-        suite = None
-        if batch_definition_name:
-            batch_stem = Path(batch_definition_name).stem
-            canonical_stem = re.sub(r"_\d{4}$", "", batch_stem)
-            # Prefer YAML contract files if present (support .yml/.yaml),
-            # fall back to the historical .contract.json filename.
-            contracts_dir = Path(project_root) / "contracts"
-            candidates = [f"{canonical_stem}.contract.yml", f"{canonical_stem}.contract.yaml", f"{canonical_stem}.contract.json"]
-            contract_file = None
-            for c in candidates:
-                cand = contracts_dir / c
-                if cand.exists():
-                    contract_file = cand
-                    break
-            if contract_file is None:
-                contract_file = contracts_dir / f"{canonical_stem}.contract.json"
-            try:
-                suite = build_expectation_suite_fn(expectation_suite_name, contract_path=str(contract_file))
-            except ValueError as exc:
-                logger.error("ERROR: expectation contract required but missing or invalid: %s", exc)
-                logger.error("Expected contract path: %s", contract_file)
-                continue
-        else:
-            from types import SimpleNamespace
+        batch_definition = h.ensure_batch_definition(asset, batch_definition_name, batch_definition_path)
 
-            suite = SimpleNamespace()
+    suite = None
+    contract_file = None
+    if batch_definition_name:
+        contract_file = _resolve_contract(project_root, batch_definition_name)
+        try:
+            suite = h.build_expectation_suite(expectation_suite_name, contract_path=str(contract_file))
+        except ValueError as exc:
+            logger.error("ERROR: expectation contract required but missing or invalid: %s", exc)
+            logger.error("Expected contract path: %s", contract_file)
+            return None
+    else:
+        suite = SimpleNamespace()
 
-        suite = add_suite_to_context_fn(context, suite, expectation_suite_name)
-        if batch is not None:
+    # Fail fast on header drift: compare the first line of the file with
+    # the contract's columns before paying for a full load.
+    if asset_type == "csv" and contract_file is not None and batch_definition_path and src_conf.get("header_precheck", True):
+        location = os.path.join(source_folder, batch_definition_path) if source_folder else batch_definition_path
+        try:
+            precheck_header(location, contract_file)
+        except SchemaPrecheckError as exc:
+            logger.error("❌ Header precheck failed for %s: %s", src_name, exc)
+            return None
+
+    # A chunked source is judged chunk by chunk, which is only sound for
+    # row-level expectations.
+    if rows_per_chunk:
+        table_level = table_level_expectations(suite)
+        if table_level:
+            logger.error(
+                "❌ %s exceeds the memory budget and must be validated in chunks, but its suite has table-level "
+                "expectations that cannot be evaluated per chunk: %s",
+                src_name, sorted(set(table_level)),
+            )
+            return None
+
+    # Quarantined files are validated chunk by chunk too when their suite
+    # allows it, so rows are extracted while each chunk is validated and
+    # the whole file is never held.
+    if (
+        not rows_per_chunk
+        and quarantine is not None
+        and asset_type in CHUNKABLE_ASSET_TYPES
+        and batch_definition_path
+        and not table_level_expectations(suite)
+    ):
+        rows_per_chunk = quarantine.chunk_rows
+
+    suite = h.add_suite_to_context(context, suite, expectation_suite_name)
+
+    validation_definition = h.create_or_get_validation_definition(context, definition_name, batch_definition, suite)
+
+    # Prefer the ValidationDefinition object managed by the DataContext
+    # when available. Some GE backends require the registered object to be
+    # used for updates and runs.
+    try:
+        vd_manager = getattr(context, "validation_definitions", None)
+        get_vd = getattr(vd_manager, "get", None) if vd_manager is not None else None
+        if callable(get_vd):
             try:
-                batch.expectation_suite = suite
+                managed_vd = get_vd(definition_name)
+                if managed_vd is not None:
+                    validation_definition = managed_vd
             except Exception:
-                pass
-
-        validation_definition = create_or_get_validation_definition_fn(context, definition_name, batch_definition, suite)
-
-        # Prefer the ValidationDefinition object managed by the DataContext
-        # when available. Some GE backends require the registered object to be
-        # used for updates and runs.
-        try:
-            vd_manager = getattr(context, "validation_definitions", None)
-            get_vd = getattr(vd_manager, "get", None) if vd_manager is not None else None
-            if callable(get_vd):
+                # If deserialization of a stored ValidationDefinition fails
+                # (for example due to a stale asset reference), attempt to
+                # remove the stale store entry and recreate the
+                # ValidationDefinition so execution can continue.
                 try:
-                    managed_vd = get_vd(definition_name)
-                    if managed_vd is not None:
-                        validation_definition = managed_vd
-                except Exception as exc:
-                    # If deserialization of a stored ValidationDefinition fails
-                    # (for example due to a stale asset reference), attempt to
-                    # remove the stale store entry and recreate the
-                    # ValidationDefinition so execution can continue.
-                    try:
-                        msg = str(exc)
-                    except Exception:
-                        msg = ""
-                    try:
-                        delete_fn = getattr(vd_manager, "delete", None)
-                        if callable(delete_fn):
-                            try:
-                                delete_fn(definition_name)
-                                logger.warning("Deleted stale ValidationDefinition from store due to deserialization error: %s", definition_name)
-                            except Exception:
-                                logger.debug("Failed to delete stale ValidationDefinition '%s' from store (continuing)", definition_name)
-                    except Exception:
-                        logger.debug("Error while attempting to cleanup stale ValidationDefinition: %s", definition_name)
-
-                    # Try to recreate a fresh ValidationDefinition from the
-                    # current in-memory objects. If that fails, continue and
-                    # let downstream logic handle it.
-                    try:
-                        validation_definition = create_or_get_validation_definition_fn(context, definition_name, batch_definition, suite)
-                    except Exception:
-                        logger.debug("Could not recreate ValidationDefinition '%s' after cleaning stale store entry; continuing.", definition_name)
+                    delete_fn = getattr(vd_manager, "delete", None)
+                    if callable(delete_fn):
+                        try:
+                            delete_fn(definition_name)
+                            logger.warning("Deleted stale ValidationDefinition from store due to deserialization error: %s", definition_name)
+                        except Exception:
+                            logger.debug("Failed to delete stale ValidationDefinition '%s' from store (continuing)", definition_name)
+                except Exception:
+                    logger.debug("Error while attempting to cleanup stale ValidationDefinition: %s", definition_name)
+
+                # Try to recreate a fresh ValidationDefinition from the
+                # current in-memory objects. If that fails, continue and
+                # let downstream logic handle it.
+                try:
+                    validation_definition = h.create_or_get_validation_definition(context, definition_name, batch_definition, suite)
+                except Exception:
+                    logger.debug("Could not recreate ValidationDefinition '%s' after cleaning stale store entry; continuing.", definition_name)
+    except Exception:
+        pass
+
+    return SimpleNamespace(
+        name=src_name,
+        source=src_name,
+        partition_key=None,
+        asset_type=asset_type,
+        as_frame=as_frame,
+        parse_cache=use_parse_cache,
+        peak_bytes=estimate.peak_bytes,
+        chunk_rows=rows_per_chunk,
+        reader_options=reader_options,
+        result_format=src_conf.get("result_format"),
+        quarantine=quarantine,
+        quarantine_writer=None,
+        source_folder=source_folder,
+        batch_definition_path=batch_definition_path,
+        batch_definition=batch_definition,
+        definition_name=definition_name,
+        suite=suite,
+        validation_definition=validation_definition,
+        batch=None,
+        batch_parameters=None,
+        load_seconds=None,
+        validation_seconds=0.0,
+        validation_results=[],
+    )
+
+
+def _plan_location(plan):
+    if plan.source_folder and plan.batch_definition_path:
+        return os.path.join(plan.source_folder, plan.batch_definition_path)
+    return plan.source_folder or plan.batch_definition_path
+
+
+def load_batch(plan, helpers):
+    """Load the data for a prepared source. Returns False on failure.
+
+    Does not touch the DataContext stores, so it is safe to run in a
+    worker thread. Chunked plans are read chunk by chunk in
+    `execute_source` instead.
+    """
+    if plan.chunk_rows:
+        return True
+    started = time.monotonic()
+    if plan.as_frame:
+        location = _plan_location(plan)
+        cache = {"cache": get_default_parse_cache()} if plan.parse_cache else {}
+        try:
+            plan.batch_parameters = {"dataframe": helpers.load_frame(plan.asset_type, location, plan.reader_options, **cache)}
+        except Exception as exc:
+            logger.error("❌ Failed to load %s data for %s from %s: %s", plan.asset_type, plan.name, location, exc)
+            return False
+    bp = {"batch_parameters": plan.batch_parameters} if plan.batch_parameters else {}
+
+    plan.batch = helpers.get_batch_and_preview(plan.batch_definition, **bp)
+    if plan.batch is not None:
+        try:
+            plan.batch.expectation_suite = plan.suite
         except Exception:
             pass
+    plan.load_seconds = time.monotonic() - started
+    return True
+
+
+def execute_source(context, plan, helpers, data_docs_site_names, result_format, checkpoint_lock=None, history=None):
+    """Run the ValidationDefinition and checkpoint for a loaded plan.
+
+    `checkpoint_lock`, when given, serialises the checkpoint step (store
+    writes and Data Docs rebuilds) between concurrently executing plans.
+    With a `dq_docker.history.RunHistory`, the outcome, timings and
+    per-expectation results are appended to it.
+    The plan's own `result_format` is applied over `result_format` (see
+    `dq_docker.result_format`). With quarantine enabled for the plan, the
+    failing rows of failed batches (and, when enabled, passing rows) are
+    written out (see `dq_docker.quarantine`).
+    Returns `{"success": bool, "validation_success": bool}`.
+    """
+    started_at = time.time()
+    started = time.monotonic()
+    result_format = resolve_result_format(getattr(plan, "result_format", None), result_format)
+    writer = _quarantine_writer(plan)
+    plan.quarantine_writer = writer
+    if plan.chunk_rows:
+        outcome = _execute_chunked(context, plan, helpers, data_docs_site_names, result_format, checkpoint_lock)
+    else:
+        outcome = _execute_once(context, plan, helpers, data_docs_site_names, result_format, checkpoint_lock)
+    if writer is not None:
+        plan.quarantine_writer = None
+        summary = writer.summary()
+        if summary["failing_rows"] or summary["passing_rows"]:
+            logger.info(
+                "ℹ️ Quarantined %d failing row(s) of %s (%d passing) to %s",
+                summary["failing_rows"], plan.name, summary["passing_rows"], plan.quarantine.directory,
+            )
+        outcome["quarantined_rows"] = summary["failing_rows"]
+    if history is not None:
+        try:
+            history.record_source(
+                plan.source,
+                outcome,
+                started_at,
+                time.monotonic() - started + (plan.load_seconds or 0.0),
+                partition_key=plan.partition_key,
+                suite=getattr(plan.suite, "name", None),
+                load_seconds=plan.load_seconds,
+                validation_seconds=plan.validation_seconds,
+                asset_type=plan.asset_type,
+                location=_plan_location(plan),
+                validation_results=plan.validation_results,
+            )
+        except Exception as exc:
+            logger.warning("Could not record run history for %s: %s", plan.name, exc)
+    plan.validation_results = []
+    return outcome
+
+
+def _quarantine_writer(plan):
+    settings = getattr(plan, "quarantine", None)
+    if settings is None:
+        return None
+    from datetime import datetime, timezone
 
-        validation_results = None
-        # Create a run_name for Data Docs grouping. Prefer explicit env var
-        # `DQ_RUN_NAME` but fall back to a deterministic name including the
-        # validation definition and UTC timestamp.
-        from datetime import datetime, timezone
+    run_name = os.environ.get("DQ_RUN_NAME") or f"{plan.definition_name}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+    return QuarantineWriter(settings, plan.suite, plan.source, run_name, partition_key=plan.partition_key)
 
-        env_run_name = os.environ.get("DQ_RUN_NAME")
-        run_time = datetime.now(timezone.utc)
-        default_run_name = f"{definition_name}-{run_time.strftime('%Y%m%dT%H%M%SZ')}"
-        run_name = env_run_name or default_run_name
 
-        # Construct a run_id dictionary that includes the run_name and a
-        # timezone-aware run_time. GE APIs commonly accept a `run_id` mapping
-        # with these keys; prefer passing `run_id` where supported so the
-        # resulting RunIdentifier is complete in Data Docs.
-        run_id = {"run_name": run_name, "run_time": run_time}
+def _execute_chunked(context, plan, helpers, data_docs_site_names, result_format, checkpoint_lock=None):
+    """Validate an oversize source one chunk of `plan.chunk_rows` rows at a
+    time. The source fails when a chunk cannot be read or validated, and
+    otherwise as the combined result over all rows does.
 
-        try:
-            # Try passing `run_id` first, then fall back to `run_name`, then
-            # to calling without args for backwards compatibility with test
-            # doubles or older GE versions.
+    Chunks are validated without touching the stores; their results are
+    combined into one validation result (see `dq_docker.chunked`), which
+    is stored once before a single Data Docs rebuild. Suites with
+    table-level expectations are refused (`prepare_source` already fails
+    such sources before they are planned).
+    """
+    from datetime import datetime, timezone
+
+    location = _plan_location(plan)
+    table_level = table_level_expectations(plan.suite)
+    if table_level:
+        logger.error("❌ Refusing to validate %s in chunks: %s cannot be evaluated per chunk", plan.name, sorted(set(table_level)))
+        return {"success": False, "validation_success": False, "chunks": 0}
+    combined = ChunkResults()
+    writer = getattr(plan, "quarantine_writer", None)
+    read_ok = True
+    validation_started = time.monotonic()
+    try:
+        for chunk in iter_file_chunks(plan.asset_type, location, plan.chunk_rows, **plan.reader_options):
             try:
-                validation_results = validation_definition.run(run_id=run_id)
-            except TypeError:
+                result = validate_chunk(plan.validation_definition, chunk, result_format)
+            except Exception as exc:
+                logger.error("❌ Validation of chunk %d of %s failed to execute: %s", combined.chunks + 1, plan.name, exc)
+                result = None
+            combined.add(result)
+            # Extract rows while the chunk is in memory. The source is only
+            # judged once every chunk is in, so failing rows are written
+            # now and removed below when it passes.
+            if writer is not None and result is not None:
                 try:
-                    validation_results = validation_definition.run(run_name=run_name)
-                except TypeError:
-                    validation_results = validation_definition.run()
-        except Exception:
-            logger.error("ValidationDefinition.run() failed to execute")
-
-        if validation_results and validation_results.get("success"):
-            logger.info("✅ Validation succeeded for %s!", src_name)
-        else:
-            logger.error("❌ Validation failed for %s!", src_name)
+                    writer.write(chunk, failed=True)
+                except Exception as exc:
+                    logger.error("❌ Could not write quarantine rows for %s: %s", plan.name, exc)
+    except Exception as exc:
+        logger.error("❌ Failed to read %s in chunks from %s: %s", plan.name, location, exc)
+        read_ok = False
+    plan.validation_seconds += time.monotonic() - validation_started
+    logger.info("Validated %s in %d chunk(s) of up to %d rows", plan.name, combined.chunks, plan.chunk_rows)
+
+    # Judged from the folded counts, not per chunk (see ChunkResults).
+    result = combined.combined()
+    success = read_ok and combined.success and combined.chunks > 0
+    if writer is not None and success:
+        writer.discard_failing()
+    if result is not None:
+        plan.validation_results.append(result)
+    run_time = datetime.now(timezone.utc)
+    run_id = {"run_name": os.environ.get("DQ_RUN_NAME") or f"{plan.definition_name}-{run_time.strftime('%Y%m%dT%H%M%SZ')}", "run_time": run_time}
+    with checkpoint_lock or nullcontext():
+        try:
+            if store_result(context, plan.validation_definition, result, run_id):
+                context.build_data_docs(site_names=data_docs_site_names)
+        except Exception as exc:
+            logger.error("❌ Could not store the combined result of %s: %s", plan.name, exc)
 
-        action_list = [UpdateDataDocsAction(name="update_data_docs", site_names=data_docs_site_names)]
+    if success:
+        logger.info("✅ Validation succeeded for %s!", plan.name)
+    else:
+        logger.error("❌ Validation failed for %s!", plan.name)
+    return {"success": success, "validation_success": success, "chunks": combined.chunks}
+
+
+def _execute_once(context, plan, helpers, data_docs_site_names, result_format, checkpoint_lock=None):
+    src_name = plan.name
+    definition_name = plan.definition_name
+    validation_definition = plan.validation_definition
+    bp = {"batch_parameters": plan.batch_parameters} if plan.batch_parameters else {}
+    rf = {"result_format": result_format} if result_format else {}
+
+    validation_results = None
+    # Create a run_name for Data Docs grouping. Prefer explicit env var
+    # `DQ_RUN_NAME` but fall back to a deterministic name including the
+    # validation definition and UTC timestamp.
+    from datetime import datetime, timezone
+
+    env_run_name = os.environ.get("DQ_RUN_NAME")
+    run_time = datetime.now(timezone.utc)
+    default_run_name = f"{definition_name}-{run_time.strftime('%Y%m%dT%H%M%SZ')}"
+    run_name = env_run_name or default_run_name
+
+    # Construct a run_id dictionary that includes the run_name and a
+    # timezone-aware run_time. GE APIs commonly accept a `run_id` mapping
+    # with these keys; prefer passing `run_id` where supported so the
+    # resulting RunIdentifier is complete in Data Docs.
+    run_id = {"run_name": run_name, "run_time": run_time}
+
+    validation_started = time.monotonic()
+    try:
+        # Try passing `run_id` first, then fall back to `run_name`, then
+        # to calling without args for backwards compatibility with test
+        # doubles or older GE versions.
+        try:
+            validation_results = validation_definition.run(run_id=run_id, **rf, **bp)
+        except TypeError:
+            try:
+                validation_results = validation_definition.run(run_name=run_name, **rf, **bp)
+            except TypeError:
+                validation_results = validation_definition.run(**bp)
+    except Exception:
+        logger.error("ValidationDefinition.run() failed to execute")
+    plan.validation_seconds += time.monotonic() - validation_started
+    if validation_results is not None:
+        plan.validation_results.append(validation_results)
+
+    validation_success = bool(validation_results and validation_results.get("success"))
+    if validation_success:
+        logger.info("✅ Validation succeeded for %s!", src_name)
+    else:
+        logger.error("❌ Validation failed for %s!", src_name)
 
-        # Call create_and_run_checkpoint in a backwards-compatible way:
-        # prefer passing `run_id` (rich) then `run_name`, but fall back to
-        # older signatures that don't accept these kwargs (test harnesses may
-        # monkeypatch a function without the new kwarg).
+    # Quarantine only batches that were validated; a run that raised has no
+    # result to judge the rows by.
+    writer = getattr(plan, "quarantine_writer", None)
+    if writer is not None and validation_results is not None and plan.batch_parameters and "dataframe" in plan.batch_parameters:
+        try:
+            writer.write(plan.batch_parameters["dataframe"], failed=not validation_success)
+        except Exception as exc:
+            logger.error("❌ Could not write quarantine rows for %s: %s", src_name, exc)
+
+    action_list = [UpdateDataDocsAction(name="update_data_docs", site_names=data_docs_site_names)]
+
+    # Call create_and_run_checkpoint in a backwards-compatible way:
+    # prefer passing `run_id` (rich) then `run_name`, but fall back to
+    # older signatures that don't accept these kwargs (test harnesses may
+    # monkeypatch a function without the new kwarg).
+    fn = helpers.create_and_run_checkpoint
+    with checkpoint_lock or nullcontext():
         try:
             try:
-                results = create_and_run_checkpoint_fn(context, definition_name, validation_definition, action_list, result_format, run_id=run_id)
+                results = fn(context, definition_name, validation_definition, action_list, result_format, run_id=run_id, **bp)
             except TypeError:
                 try:
-                    results = create_and_run_checkpoint_fn(context, definition_name, validation_definition, action_list, result_format, run_name=run_name)
+                    results = fn(context, definition_name, validation_definition, action_list, result_format, run_name=run_name, **bp)
                 except TypeError:
-                    results = create_and_run_checkpoint_fn(context, definition_name, validation_definition, action_list, result_format)
+                    results = fn(context, definition_name, validation_definition, action_list, result_format)
         except Exception:
             results = None
 
-        if not results or "success" not in results:
-            logger.error("❌ Checkpoint run did not return success status for %s.", src_name)
+    if not results or "success" not in results:
+        logger.error("❌ Checkpoint run did not return success status for %s.", src_name)
+
+    return {"success": validation_success, "validation_success": validation_success}
+
+
+def run_source(context, src_name, src_conf, source_folder, project_root, helpers, data_docs_site_names, result_format, history=None):
+    """Prepare, load and execute a single (non-partitioned) source."""
+    plan = prepare_source(context, src_name, src_conf, source_folder, project_root, helpers)
+    if plan is None:
+        return {"success": False, "error": "prepare"}
+    if not load_batch(plan, helpers):
+        return {"success": False, "error": "load"}
+    return execute_source(context, plan, helpers, data_docs_site_names, result_format, history=history)
+
+
+def run_sources_prefetched(context, items, project_root, helpers, data_docs_site_names, result_format, depth, max_bytes, history=None):
+    """Run `(src_name, src_conf, source_folder)` items through the prefetch
+    pipeline (see `dq_docker.prefetch`) and return `{src_name: outcome}`.
+
+    Sources are prepared and executed on the calling thread in order while
+    up to `depth` following sources are loaded in the background, within
+    `max_bytes` of estimated data loaded ahead. With a memory governor the
+    cap is also bounded by its budget and its peak estimates are used.
+    CSV/Parquet files are loaded into dataframes by the background load,
+    so validation and the checkpoint never read them a second time. They
+    are validated through the separately named frame datasource; the
+    source's `pandas_filesystem` datasource is neither used nor replaced.
+    """
+    governor = get_governor()
+    if governor is not None:
+        max_bytes = min(max_bytes, governor.budget)
+
+    def _prepare(item):
+        src_name, src_conf, source_folder = item
+        logger.info("--- Running validations for data source: %s ---", src_name)
+        return prepare_source(context, src_name, src_conf, source_folder, project_root, helpers, frame=True)
+
+    def _estimate(plan):
+        if governor is not None:
+            return _admitted_bytes(plan, governor)
+        return estimate_bytes(_plan_location(plan))
+
+    def _measure(plan):
+        return frame_bytes((plan.batch_parameters or {}).get("dataframe"))
+
+    def _execute(item, plan, loaded):
+        src_name = item[0]
+        if plan is None:
+            return src_name, {"success": False, "error": "prepare"}
+        if isinstance(loaded, Exception):
+            logger.error("❌ Failed to load batch for %s: %s", src_name, loaded)
+            return src_name, {"success": False, "error": "load"}
+        if loaded is False:
+            return src_name, {"success": False, "error": "load"}
+        return src_name, execute_source(context, plan, helpers, data_docs_site_names, result_format, history=history)
+
+    outcomes = run_prefetched(
+        items,
+        _prepare,
+        lambda plan: load_batch(plan, helpers),
+        _execute,
+        depth=depth,
+        max_bytes=max_bytes,
+        estimate=_estimate,
+        measure=_measure,
+    )
+    return dict(outcomes)
+
+
+def _admitted_bytes(plan, governor):
+    # A chunked source holds about half the budget at a time (quarantined
+    # sources chunked under the budget, less).
+    return min(governor.budget // 2, plan.peak_bytes) if plan.chunk_rows else plan.peak_bytes
+
+
+def _process_loader(helpers):
+    """With `DQ_LOAD_PROCESSES`, return a `ProcessLoader` and route
+    `helpers.load_frame` through it so prefetched sources and partitions
+    are parsed in worker processes and handed back via shared memory."""
+    workers = load_processes()
+    if not workers:
+        return None
+    load = helpers.load_frame
+    try:
+        pickle.dumps(load)
+    except Exception:
+        logger.warning("DQ_LOAD_PROCESSES ignored: %r cannot be sent to worker processes", load)
+        return None
+    loader = ProcessLoader(workers)
+
+    def _load_frame(asset_type, location, reader_options=None, cache=None):
+        if cache is not None:
+            # Parse-cache hits are already memory-mapped in this process.
+            return load(asset_type, location, reader_options, cache=cache)
+        return loader.load(load, asset_type, location, reader_options)
+
+    helpers.load_frame = _load_frame
+    logger.info("Loading dataframes in %d worker process(es)", workers)
+    return loader
+
+
+def _partition_workers(src_conf, count):
+    configured = src_conf.get("partition_workers")
+    if configured:
+        return max(1, int(configured))
+    return max(1, min(count, os.cpu_count() or 1, 8))
+
+
+def run_partitions(context, src_name, partitions, source_folder, project_root, helpers, data_docs_site_names, result_format, max_workers=1, history=None):
+    """Validate `(partition_key, conf)` pairs and return results keyed by
+    partition.
+
+    Context registration runs serially; loading and validation of the
+    prepared partitions then run on `max_workers` threads, with checkpoint
+    runs serialised so store writes and Data Docs rebuilds do not race.
+    All partitions share the source's datasource and asset and differ only
+    in their batch definition.
+    """
+    results = {}
+    plans = []
+    for key, conf in partitions:
+        logger.info("Preparing partition %s of %s", key, src_name)
+        plan = prepare_source(context, src_name, dict(conf), source_folder, project_root, helpers)
+        if plan is None:
+            results[key] = {"success": False, "error": "prepare"}
+        else:
+            plan.name, plan.partition_key = f"{src_name}[{key}]", key
+            plans.append((key, plan))
+
+    lock = threading.Lock()
+    governor = get_governor()
+
+    def _one(item):
+        key, plan = item
+        with governor.admit(_admitted_bytes(plan, governor), plan.name) if governor else nullcontext():
+            if not load_batch(plan, helpers):
+                return key, {"success": False, "error": "load"}
+            return key, execute_source(context, plan, helpers, data_docs_site_names, result_format, checkpoint_lock=lock, history=history)
+
+    if max_workers > 1 and len(plans) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dq-partition") as pool:
+            outcomes = list(pool.map(_one, plans))
+    else:
+        outcomes = [_one(item) for item in plans]
+    results.update(outcomes)
+    return {key: results[key] for key, _ in partitions if key in results}
+
+
+def _record_early_failures(history, names, results):
+    # Sources that failed before validation (prepare/load/partitions) were
+    # not recorded by `execute_source`.
+    for name in names:
+        outcome = results.get(name) or {}
+        entries = [(None, outcome)] if "success" in outcome else list(outcome.items())
+        for key, entry in entries:
+            if isinstance(entry, dict) and entry.get("error"):
+                try:
+                    history.record_failure(name, entry["error"], partition_key=key)
+                except Exception as exc:
+                    logger.warning("Could not record run history for %s: %s", name, exc)
+
+
+def run_validations(
+    context,
+    all_data_sources,
+    selected_name,
+    project_root,
+    module_source_folder,
+    data_docs_site_names,
+    result_format,
+    results=None,
+    history=None,
+):
+    """Run validations for one or more configured data sources.
+
+    Parameters mirror the runtime values in `run_adls_checkpoint.main()` so
+    this function can be unit-tested in isolation. When a `results` dict is
+    supplied it is filled with `{source: outcome}`; partitioned sources map
+    to `{partition_key: outcome}` instead. Outcomes are also appended to
+    `history` (a `dq_docker.history.RunHistory`) when given.
+    """
+
+    # Select which sources to run
+    if selected_name:
+        sources = [(selected_name, all_data_sources[selected_name])]
+    else:
+        sources = sorted(all_data_sources.items())
+
+    rac, helpers = _resolve_helpers()
+    if results is None:
+        results = {}
+    write_stats().reset()
+    loader = _process_loader(helpers)
+    try:
+        _run_sources(context, sources, project_root, module_source_folder, helpers, data_docs_site_names, result_format, results, history)
+    finally:
+        if loader is not None:
+            loader.close()
+
+    if history is not None:
+        _record_early_failures(history, [name for name, _ in sources], results)
+
+    writes = write_stats().snapshot()
+    if writes:
+        logger.info(
+            "ℹ️ Store writes: %d written, %d skipped as unchanged %s",
+            sum(c["written"] for c in writes.values()), sum(c["skipped"] for c in writes.values()), writes,
+        )
 
     try:
         logger.info(context.list_data_docs_sites())
@@ -227,3 +786,54 @@ def run_validations(
         return get_data_docs_urls(context)
     except Exception:
         return None
+
+
+def _run_sources(context, sources, project_root, module_source_folder, helpers, data_docs_site_names, result_format, results, history):
+    """Validate `(src_name, src_conf)` pairs into `results`."""
+    # With DQ_PREFETCH=K, consecutive plain sources are queued and run
+    # through a pipeline that loads the next K sources in the background.
+    depth, max_bytes = prefetch_settings()
+    queued = []
+
+    def _flush():
+        if queued:
+            results.update(run_sources_prefetched(
+                context, list(queued), project_root, helpers, data_docs_site_names, result_format, depth, max_bytes, history=history
+            ))
+            queued.clear()
+
+    for src_name, src_conf in sources:
+        # DQ_NAMESPACE: per-source (and per-run) suite/definition names.
+        src_conf = scope_source_conf(src_name, src_conf)
+        source_folder = _resolve_source_folder(src_conf, project_root, module_source_folder)
+
+        try:
+            partitions = expand_partitions(src_conf, source_folder)
+        except Exception as exc:
+            logger.error("❌ Could not resolve partitions for %s: %s", src_name, exc)
+            results[src_name] = {"success": False, "error": "partitions"}
+            continue
+
+        if partitions is None and depth:
+            queued.append((src_name, src_conf, source_folder))
+            continue
+        _flush()
+
+        logger.info("--- Running validations for data source: %s ---", src_name)
+        if partitions is None:
+            results[src_name] = run_source(
+                context, src_name, src_conf, source_folder, project_root, helpers, data_docs_site_names, result_format, history=history
+            )
+            continue
+
+        if not partitions:
+            logger.warning("No partitions matched for %s", src_name)
+        workers = _partition_workers(src_conf, len(partitions))
+        by_partition = run_partitions(
+            context, src_name, partitions, source_folder, project_root, helpers, data_docs_site_names, result_format,
+            max_workers=workers, history=history,
+        )
+        results[src_name] = by_partition
+        failed = sorted(k for k, v in by_partition.items() if not v.get("success"))
+        logger.info("Partition results for %s: %d validated, %d failed %s", src_name, len(by_partition), len(failed), failed or "")
+    _flush()
@@ -2,7 +2,7 @@
 """Manage Great Expectations store entries for this project.
 
 Usage examples:
-  # Repair stores (non-destructive)
+  # Repair stores (non-destructive); --full ignores the verified-entries manifest
   python scripts/manage_ge_store.py --action repair
 
   # Clear stores (destructive) with confirmation
@@ -11,21 +11,31 @@ Usage examples:
   # Clear then repair
   python scripts/manage_ge_store.py --action repair_and_clear --force
 
+  # Archive validation results beyond the last 20 runs per suite to Parquet
+  python scripts/manage_ge_store.py --action compact --keep-last 20
+
 This script uses the project's installed Great Expectations environment and
-the package helpers implemented in `dq_docker.checkpoint`.
+the package helpers implemented in `dq_docker.checkpoint` and
+`dq_docker.retention`.
 """
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 import importlib
 
 
 def main(argv=None):
     parser = argparse.ArgumentParser(description="Manage Great Expectations store entries for dq_docker")
-    parser.add_argument("--action", "-a", required=True, choices=["none", "repair", "clear", "repair_and_clear", "clear_and_repair"], help="Store action to perform")
+    parser.add_argument("--action", "-a", required=True, choices=["none", "repair", "clear", "repair_and_clear", "clear_and_repair", "compact"], help="Store action to perform")
     parser.add_argument("--force", "-f", action="store_true", help="Bypass confirmation for destructive operations (clear)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
+    parser.add_argument("--full", action="store_true", help="repair: re-check every entry instead of only new or changed ones")
+    parser.add_argument("--keep-last", type=int, default=None, help="compact: keep the newest N runs per suite (default DQ_RESULTS_KEEP_LAST)")
+    parser.add_argument("--keep-days", type=float, default=None, help="compact: keep results newer than X days (default DQ_RESULTS_KEEP_DAYS)")
+    parser.add_argument("--archive-dir", default=None, help="compact: Parquet archive directory (default gx/uncommitted/validations_archive)")
+    parser.add_argument("--dry-run", action="store_true", help="compact: report what would be archived without changing the store")
     args = parser.parse_args(argv)
 
     try:
@@ -47,6 +57,9 @@ def main(argv=None):
         raise
 
     action = args.action.lower()
+    if action == "compact":
+        return _compact(ctx, args)
+
     do_clear = "clear" in action
     do_repair = "repair" in action
 
@@ -73,7 +86,7 @@ def main(argv=None):
     if do_repair:
         print("Running repair_ge_store()...")
         try:
-            res = chk.repair_ge_store(ctx, verbose=args.verbose)
+            res = chk.repair_ge_store(ctx, verbose=args.verbose, use_manifest=not args.full)
             print("repair_ge_store result:", res)
             for k in ("validation_definitions_deleted", "checkpoints_deleted", "errors"):
                 summary[k].extend(res.get(k, []))
@@ -86,5 +99,23 @@ def main(argv=None):
     return 0
 
 
+def _compact(ctx, args):
+    retention = importlib.import_module("dq_docker.retention")
+    env_policy = retention.retention_policy_from_env()
+    policy = retention.RetentionPolicy(
+        keep_last=args.keep_last if args.keep_last is not None else env_policy.keep_last,
+        keep_days=args.keep_days if args.keep_days is not None else env_policy.keep_days,
+    )
+    if not policy.enabled:
+        print("ERROR: compact needs --keep-last and/or --keep-days (or DQ_RESULTS_KEEP_LAST / DQ_RESULTS_KEEP_DAYS).", file=sys.stderr)
+        return 2
+    archive_dir = args.archive_dir or os.environ.get("DQ_RESULTS_ARCHIVE_DIR") or None
+    print(f"Running compact_validation_results() with {policy}...")
+    summary = retention.compact_validation_results(ctx, policy, archive_dir=archive_dir, dry_run=args.dry_run)
+    print("Summary:")
+    print(summary)
+    return 1 if summary.get("errors") else 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
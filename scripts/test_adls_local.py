@@ -89,6 +89,26 @@ def list_files(client, container: str, path: str = "") -> None:
         raise
 
 
+def bench_ranges(client, container: str, path: str, chunk_size: int, workers: int) -> None:
+    """Time a sequential `read_csv` against the parallel byte-range reader."""
+    import time
+
+    print(f"Benchmarking container='{container}' path='{path}'")
+    t0 = time.perf_counter()
+    df = client.read_csv(container, path)
+    seq = time.perf_counter() - t0
+    print(f" - read_csv:        {len(df)} rows in {seq:.2f}s")
+
+    t0 = time.perf_counter()
+    rows = 0
+    chunks = 0
+    for _, chunk in client.read_csv_ranges(container, path, chunk_size=chunk_size, max_workers=workers):
+        rows += len(chunk)
+        chunks += 1
+    par = time.perf_counter() - t0
+    print(f" - read_csv_ranges: {rows} rows in {chunks} chunks in {par:.2f}s ({workers} workers)")
+
+
 def main(argv=None):
     p = argparse.ArgumentParser(description="Local ADLS test helper")
     p.add_argument("--check", action="store_true", help="Check dependencies and env vars")
@@ -96,6 +116,9 @@ def main(argv=None):
     p.add_argument("--container", "-c", help="ADLS container name to operate on")
     p.add_argument("--path", "-p", default="", help="Path inside container")
     p.add_argument("--list", action="store_true", help="List files (will perform network I/O)")
+    p.add_argument("--bench-ranges", action="store_true", help="Compare read_csv with read_csv_ranges on --path (network I/O)")
+    p.add_argument("--chunk-size", type=int, default=64 * 1024 * 1024, help="Byte-range size for --bench-ranges")
+    p.add_argument("--workers", type=int, default=8, help="Parallel workers for --bench-ranges")
     # Note: Azurite support was removed in this branch revert.
 
     args = p.parse_args(argv)
@@ -116,6 +139,17 @@ def main(argv=None):
     if args.list and not args.container:
         p.error("--list requires --container")
 
+    if args.bench_ranges:
+        if not args.container or not args.path:
+            p.error("--bench-ranges requires --container and --path")
+        try:
+            client = make_client_from_env_or_kv(args.vault_url)
+        except Exception as exc:
+            print(f"Failed to create ADLS client: {exc}")
+            sys.exit(1)
+        bench_ranges(client, args.container, args.path, args.chunk_size, args.workers)
+        return
+
     if args.list:
         # Create ADLS client (Key Vault or env) and perform listing
         try:
@@ -0,0 +1,43 @@
+import fsspec
+import pytest
+
+from dq_docker.adls import listing
+
+
+@pytest.fixture
+def memfs():
+    fs = fsspec.filesystem("memory")
+    for day in ("2024/01/01", "2024/01/02", "2024/02/01"):
+        fs.pipe(f"/lake/sales/{day}/part-0.csv", b"a\n1\n")
+        fs.pipe(f"/lake/sales/{day}/part-1.csv", b"a\n2\n")
+    yield fs
+    fs.rm("/lake", recursive=True)
+
+
+def test_iter_files_recurses_all_partitions(memfs):
+    names = sorted(e["name"] for e in listing.iter_files(memfs, "/lake/sales", max_workers=4))
+    assert len(names) == 6
+    assert names[0] == "/lake/sales/2024/01/01/part-0.csv"
+    assert all(n.endswith(".csv") for n in names)
+
+
+def test_snapshot_only_yields_new_or_changed(memfs, tmp_path):
+    snap = str(tmp_path / "listing.json")
+
+    first = list(listing.iter_changed_files(memfs, "/lake/sales", snapshot_path=snap))
+    assert len(first) == 6
+
+    assert list(listing.iter_changed_files(memfs, "/lake/sales", snapshot_path=snap)) == []
+
+    memfs.pipe("/lake/sales/2024/02/01/part-1.csv", b"a\n2\n3\n")
+    memfs.pipe("/lake/sales/2024/02/02/part-0.csv", b"a\n4\n")
+    changed = sorted(e["name"] for e in listing.iter_changed_files(memfs, "/lake/sales", snapshot_path=snap))
+    assert changed == ["/lake/sales/2024/02/01/part-1.csv", "/lake/sales/2024/02/02/part-0.csv"]
+
+
+def test_interrupted_walk_does_not_save_snapshot(memfs, tmp_path):
+    snap = tmp_path / "listing.json"
+    gen = listing.iter_changed_files(memfs, "/lake/sales", snapshot_path=str(snap))
+    next(gen)
+    gen.close()
+    assert not snap.exists()
@@ -0,0 +1,50 @@
+import fsspec
+import pandas as pd
+import pytest
+
+from dq_docker.adls import ranges
+
+
+@pytest.fixture
+def memfs():
+    fs = fsspec.filesystem("memory")
+    lines = ["id,name,score"] + [f"{i},name_{i},{i * 1.5}" for i in range(1000)]
+    fs.pipe("/bench/big.csv", ("\n".join(lines) + "\n").encode())
+    yield fs
+    fs.rm("/bench", recursive=True)
+
+
+def test_plan_byte_ranges_aligns_to_newlines(memfs):
+    header, spans = ranges.plan_byte_ranges(memfs, "/bench/big.csv", chunk_size=1000, probe=16)
+    data = memfs.cat_file("/bench/big.csv")
+
+    assert header == b"id,name,score\n"
+    assert spans[0][0] == len(header)
+    assert spans[-1][1] == len(data)
+    for (start, end), (nxt, _) in zip(spans, spans[1:]):
+        assert end == nxt
+        assert data[end - 1:end] == b"\n"
+
+
+def test_iter_csv_ranges_reassembles_file(memfs):
+    chunks = list(ranges.iter_csv_ranges(memfs, "/bench/big.csv", chunk_size=2048, max_workers=4))
+
+    assert len(chunks) > 1
+    frames = [df for _, df in sorted(chunks, key=lambda c: c[0])]
+    combined = pd.concat(frames, ignore_index=True)
+    assert list(combined.columns) == ["id", "name", "score"]
+    assert combined["id"].tolist() == list(range(1000))
+
+
+def test_iter_csv_ranges_ordered_yields_file_order(memfs):
+    chunks = list(ranges.iter_csv_ranges(memfs, "/bench/big.csv", chunk_size=512, max_workers=4, ordered=True))
+
+    assert [idx for idx, _ in chunks] == list(range(len(chunks)))
+    assert pd.concat([df for _, df in chunks], ignore_index=True)["id"].tolist() == list(range(1000))
+
+
+def test_header_only_object_has_no_ranges(memfs):
+    memfs.pipe("/bench/empty.csv", b"id,name\n")
+    header, spans = ranges.plan_byte_ranges(memfs, "/bench/empty.csv", chunk_size=4)
+    assert header == b"id,name\n"
+    assert spans == []
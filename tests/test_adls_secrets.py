@@ -0,0 +1,175 @@
+import json
+import os
+import sys
+import threading
+import types
+
+from dq_docker.adls import secrets
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Secret:
+    def __init__(self, value):
+        self.value = value
+
+
+class _CountingClient:
+    def __init__(self, prefix="v1"):
+        self.prefix = prefix
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_secret(self, name):
+        with self.lock:
+            self.calls.append(name)
+        if name == "absent":
+            raise KeyError(name)
+        return _Secret(f"{name}-{self.prefix}")
+
+
+def test_fetch_secrets_returns_values_and_errors():
+    client = _CountingClient()
+    values = secrets.fetch_secrets(client.get_secret, ["a", "b", "absent"])
+    assert values["a"] == "a-v1"
+    assert values["b"] == "b-v1"
+    assert isinstance(values["absent"], KeyError)
+    assert sorted(client.calls) == ["a", "absent", "b"]
+
+
+def test_secret_cache_ttl_and_refresh_ahead():
+    clock = _Clock()
+    cache = secrets.SecretCache(ttl=100, refresh_margin=20, clock=clock)
+    client = _CountingClient()
+
+    assert cache.get_many("https://kv", ["a", "b"], lambda: client)["a"] == "a-v1"
+    assert cache.get_many("https://kv", ["a", "b"], lambda: client)["b"] == "b-v1"
+    assert len(client.calls) == 2
+
+    # Inside the refresh window: served from cache, refreshed in background.
+    clock.now += 85
+    client.prefix = "v2"
+    values = cache.get_many("https://kv", ["a"], lambda: client)
+    assert values["a"] == "a-v1"
+    for t in threading.enumerate():
+        if t.name == "dq-secret-refresh":
+            t.join()
+    assert cache.get_many("https://kv", ["a"], lambda: client)["a"] == "a-v2"
+
+    # Expired entries are fetched synchronously.
+    clock.now += 500
+    client.prefix = "v3"
+    assert cache.get_many("https://kv", ["b"], lambda: client)["b"] == "b-v3"
+
+
+def test_secret_cache_fresh_hit_does_not_refresh(monkeypatch):
+    clock = _Clock()
+    # The default 120s margin is clamped to ttl / 2 for short TTLs.
+    cache = secrets.SecretCache(ttl=60, clock=clock)
+    assert cache.refresh_margin == 30
+    client = _CountingClient()
+    refreshes = []
+    monkeypatch.setattr(cache, "_refresh_in_background", lambda *a: refreshes.append(a))
+
+    cache.get_many("https://kv", ["a"], lambda: client)
+    clock.now += 29
+    assert cache.get_many("https://kv", ["a"], lambda: client)["a"] == "a-v1"
+    assert refreshes == [] and client.calls == ["a"]
+
+    clock.now += 1
+    cache.get_many("https://kv", ["a"], lambda: client)
+    assert len(refreshes) == 1
+
+
+def test_secret_cache_removes_temp_file_on_failed_write(tmp_path, monkeypatch):
+    path = tmp_path / "kv-cache.json"
+    cache = secrets.SecretCache(ttl=100, shared_path=str(path), shared_names=["a"])
+
+    def fail(*a, **k):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(secrets.json, "dump", fail)
+    cache.get_many("https://kv", ["a"], lambda: _CountingClient())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_secret_cache_shared_between_instances(tmp_path):
+    path = str(tmp_path / "kv-cache.json")
+    first = secrets.SecretCache(ttl=100, shared_path=path, shared_names=["a"])
+    first.get_many("https://kv", ["a", "b"], lambda: _CountingClient())
+    assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+    with open(path, encoding="utf-8") as fh:
+        assert list(json.load(fh)) == ["https://kv|a"]
+
+    other_client = _CountingClient(prefix="other")
+    second = secrets.SecretCache(ttl=100, shared_path=path, shared_names=["a"])
+    values = second.get_many("https://kv", ["a", "b"], lambda: other_client)
+    assert values == {"a": "a-v1", "b": "b-other"}
+    assert other_client.calls == ["b"]
+
+
+def test_secret_cache_shares_nothing_without_opt_in(tmp_path):
+    path = tmp_path / "kv-cache.json"
+    cache = secrets.SecretCache(ttl=100, shared_path=str(path))
+    assert cache.get_many("https://kv", ["adls-client-secret"], lambda: _CountingClient())["adls-client-secret"] == "adls-client-secret-v1"
+    assert not path.exists()
+
+
+def test_cached_credential_reuses_tokens_until_near_expiry():
+    clock = _Clock()
+    issued = []
+
+    class FakeCredential:
+        def get_token(self, *scopes, **kwargs):
+            issued.append(scopes)
+            return types.SimpleNamespace(token=f"t{len(issued)}", expires_on=clock.now + 3600)
+
+        def get_token_info(self, *scopes, **kwargs):
+            raise AssertionError("SDK clients must use the cached get_token path")
+
+        def close(self):
+            return "closed"
+
+    cred = secrets.CachedCredential(FakeCredential(), refresh_margin=300, clock=clock)
+    assert cred.get_token("https://vault.azure.net/.default").token == "t1"
+    assert cred.get_token("https://vault.azure.net/.default").token == "t1"
+    assert cred.get_token("https://storage.azure.com/.default").token == "t2"
+    assert not hasattr(cred, "get_token_info")
+    assert cred.close() == "closed"
+
+    clock.now += 3400
+    assert cred.get_token("https://vault.azure.net/.default").token == "t3"
+
+
+def test_from_key_vault_with_cache_skips_repeat_fetches(monkeypatch):
+    import importlib
+
+    created = []
+
+    class FakeSecretClient(_CountingClient):
+        def __init__(self, vault_url, credential=None):
+            super().__init__()
+            created.append(credential)
+
+    azure_identity = types.ModuleType("azure.identity")
+    azure_identity.DefaultAzureCredential = lambda: types.SimpleNamespace(get_token=lambda *s, **k: None)
+    azure_kv_secrets = types.ModuleType("azure.keyvault.secrets")
+    azure_kv_secrets.SecretClient = FakeSecretClient
+    monkeypatch.setitem(sys.modules, "azure.identity", azure_identity)
+    monkeypatch.setitem(sys.modules, "azure.keyvault.secrets", azure_kv_secrets)
+
+    client_mod = importlib.import_module("dq_docker.adls.client")
+    cache = secrets.SecretCache(ttl=600)
+    for _ in range(3):
+        client = client_mod.ADLSClient.from_key_vault("https://kv", cache=cache)
+
+    assert len(created) == 1
+    assert isinstance(created[0], secrets.CachedCredential)
+    assert os.environ["AZURE_CLIENT_ID"] == "adls-client-id-v1"
+    assert client.storage_account == "adls-account-name-v1"
@@ -138,3 +138,60 @@ def test_read_delta_table_requires_deltalake(monkeypatch):
     # If deltalake is not installed, we should get a RuntimeError
     with pytest.raises(RuntimeError):
         client.read_delta_table("container", "some/table/path")
+
+
+def _csv_payload(value):
+    return f"a,b\n{value},{value * 10}\n".encode()
+
+
+def test_read_many_preserves_order_with_sync_fs(monkeypatch):
+    import time
+
+    class FakeFS:
+        def cat_file(self, path):
+            # Finish out of order to make sure results are re-ordered.
+            idx = int(path.rsplit("_", 1)[1].split(".")[0])
+            time.sleep(0.01 * (3 - idx))
+            return _csv_payload(idx)
+
+    fake_fs = FakeFS()
+    fake_core = types.SimpleNamespace(url_to_fs=lambda uri: (fake_fs, uri.split("//", 1)[1]))
+    monkeypatch.setattr(adls_client_mod, "fsspec", types.SimpleNamespace(core=fake_core))
+
+    client = ADLSClient()
+    frames = client.read_many("container", [f"dir/part_{i}.csv" for i in range(4)], max_concurrency=4)
+
+    assert [int(df["a"].iloc[0]) for df in frames] == [0, 1, 2, 3]
+
+
+def test_read_many_async_fs_bounds_concurrency(monkeypatch):
+    import asyncio
+    import fsspec.asyn
+
+    state = {"in_flight": 0, "peak": 0, "paths": []}
+
+    class FakeAsyncFS:
+        async_impl = True
+
+        def __init__(self):
+            self.loop = fsspec.asyn.get_loop()
+
+        async def _cat_file(self, path):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            state["paths"].append(path)
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return _csv_payload(len(state["paths"]))
+
+    fake_fs = FakeAsyncFS()
+    fake_core = types.SimpleNamespace(url_to_fs=lambda uri: (fake_fs, uri.split("//", 1)[1]))
+    monkeypatch.setattr(adls_client_mod, "fsspec", types.SimpleNamespace(core=fake_core))
+
+    client = ADLSClient()
+    table = client.read_many("container", [f"p/{i}.csv" for i in range(10)], max_concurrency=3, as_arrow=True)
+
+    assert state["peak"] <= 3
+    assert state["paths"][0] == "container/p/0.csv"
+    assert table.num_rows == 10
+    assert table.column_names == ["a", "b"]
@@ -0,0 +1,131 @@
+import os
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from dq_docker import batch_transport
+from dq_docker.batch_transport import BatchTransport, SharedBatch
+
+
+def _mixed_frame(*args):
+    # Runs in a worker process; an object column Arrow cannot convert.
+    return pd.DataFrame({"id": [1, 2], "value": ["a", 2.5]})
+
+
+def test_publish_and_attach_zero_copy(tmp_path):
+    frame = pd.DataFrame({"a": range(1000), "b": [float(i) for i in range(1000)]})
+    with BatchTransport(str(tmp_path)) as transport:
+        batch = transport.publish(frame)
+        allocated = pa.total_allocated_bytes()
+        table = batch.attach(["b"])
+
+        assert table.column_names == ["b"]
+        # Buffers are views on the mapped file, not Arrow heap allocations.
+        assert pa.total_allocated_bytes() == allocated
+        pd.testing.assert_frame_equal(batch.to_pandas(), frame)
+
+
+def test_close_and_sweep_remove_published_files(tmp_path):
+    transport = BatchTransport(str(tmp_path))
+    first = transport.publish(pd.DataFrame({"a": [1]}))
+    second = transport.publish(pd.DataFrame({"a": [2]}))
+    transport.release(first)
+    assert not os.path.exists(first.path) and os.path.exists(second.path)
+    transport.close()
+    assert os.listdir(tmp_path) == []
+
+    # A batch left behind by a process that no longer exists is swept.
+    ns = batch_transport.pid_namespace()
+    stale = tmp_path / f"{batch_transport.PREFIX}{ns}-999999999-abc{batch_transport.SUFFIX}"
+    stale.write_bytes(b"")
+    live = tmp_path / f"{batch_transport.PREFIX}{ns}-{os.getpid()}-abc{batch_transport.SUFFIX}"
+    live.write_bytes(b"")
+    assert batch_transport.sweep_stale(str(tmp_path)) == [str(stale)]
+    assert live.exists()
+
+
+def test_sweep_uses_age_for_other_pid_namespaces(tmp_path):
+    # PID 1 is alive here, but in another container it is a different
+    # process; only the file age decides.
+    foreign = tmp_path / f"{batch_transport.PREFIX}nsother-999999999-abc{batch_transport.SUFFIX}"
+    old = tmp_path / f"{batch_transport.PREFIX}nsother-1-def{batch_transport.SUFFIX}"
+    for path in (foreign, old):
+        path.write_bytes(b"")
+    os.utime(old, (1, 1))
+
+    assert batch_transport.sweep_stale(str(tmp_path), max_age=3600) == [str(old)]
+    assert foreign.exists()
+
+
+def test_process_loader_hands_frames_back_through_shared_memory(tmp_path):
+    from dq_docker.readers import load_frame
+
+    pd.DataFrame({"id": range(100), "name": [f"n{i}" for i in range(100)]}).to_csv(tmp_path / "a.csv", index=False)
+    shm = tmp_path / "shm"
+    with batch_transport.ProcessLoader(1, str(shm)) as loader:
+        frame = loader.load(load_frame, "csv", str(tmp_path / "a.csv"), {})
+        assert os.listdir(shm) == []
+
+    assert frame["id"].sum() == 4950 and frame["name"].iloc[-1] == "n99"
+
+
+def test_process_loader_loads_in_process_when_arrow_conversion_fails(tmp_path):
+    shm = tmp_path / "shm"
+    with batch_transport.ProcessLoader(1, str(shm)) as loader:
+        frame = loader.load(_mixed_frame)
+        assert os.listdir(shm) == []
+
+    assert frame["value"].tolist() == ["a", 2.5]
+
+
+def test_handle_is_picklable():
+    import pickle
+
+    batch = SharedBatch("/dev/shm/x.arrow", 3, ["a"])
+    assert pickle.loads(pickle.dumps(batch)) == batch
+
+
+def test_run_validations_loads_frames_in_worker_processes(tmp_path, monkeypatch):
+    import types
+
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.readers import load_frame
+    from dq_docker.validator import run_validations
+
+    monkeypatch.setenv("DQ_LOAD_PROCESSES", "1")
+    monkeypatch.setenv("DQ_SHM_DIR", str(tmp_path / "shm"))
+    (tmp_path / "data").mkdir()
+    pd.DataFrame({"id": [1, 2, 3]}).to_csv(tmp_path / "data" / "part.csv", index=False)
+    seen, loads = {}, []
+    real_load = batch_transport.ProcessLoader.load
+
+    def counting_load(self, fn, *args, **kwargs):
+        loads.append(args[:2])
+        return real_load(self, fn, *args, **kwargs)
+
+    class FakeVD:
+        def run(self, **kwargs):
+            seen["vd"] = kwargs["batch_parameters"]["dataframe"]
+            return {"success": True}
+
+    monkeypatch.setattr(batch_transport.ProcessLoader, "load", counting_load)
+    monkeypatch.setattr(rac, "load_frame", load_frame, raising=False)
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: object(), raising=False)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda bd, batch_parameters=None: None)
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD())
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", lambda *a, **kw: {"success": True})
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    sources = {"ds_dir": {"source_folder": str(tmp_path / "data"), "asset_type": "directory", "asset_name": "parts", "definition_name": "parts_def"}}
+    results = {}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+
+    assert results["ds_dir"]["success"] is True
+    assert loads == [("directory", str(tmp_path / "data"))]
+    assert seen["vd"]["id"].tolist() == [1, 2, 3]
+    assert os.listdir(tmp_path / "shm") == []
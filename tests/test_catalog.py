@@ -0,0 +1,56 @@
+import pytest
+
+from dq_docker import catalog as catalog_mod
+from dq_docker.catalog import SourceCatalog
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DQ_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_catalog_lookup_by_name_and_tag(tmp_path):
+    _write(tmp_path / "ds" / "ds_a.yml", "source_folder: a\ntags: [finance, daily]\n")
+    _write(tmp_path / "ds" / "ds_b.yml", "source_folder: b\ntags: daily\n")
+    _write(tmp_path / "ds" / "ds_c.yml.template", "source_folder: c\n")
+    _write(tmp_path / "legacy.yml", "ds_x:\n  source_folder: x\n")
+
+    cat = SourceCatalog(str(tmp_path / "ds"), files=[str(tmp_path / "legacy.yml")])
+    assert list(cat) == ["ds_a", "ds_b", "ds_x"]
+    assert cat["ds_b"]["source_folder"] == "b"
+    assert "ds_c" not in cat
+    assert sorted(cat.by_tag("daily")) == ["ds_a", "ds_b"]
+    assert list(cat.select(tags=["finance"])) == ["ds_a"]
+    assert dict(cat)["ds_x"] == {"source_folder": "x"}
+
+
+def test_catalog_is_lazy_and_reuses_compiled_artifact(tmp_path, monkeypatch):
+    _write(tmp_path / "ds" / "ds_a.yml", "source_folder: a\n")
+    reads = []
+    real_read = catalog_mod._read_yaml
+    monkeypatch.setattr(catalog_mod, "_read_yaml", lambda p: reads.append(p) or real_read(p))
+
+    cat = SourceCatalog(str(tmp_path / "ds"))
+    assert reads == []
+    assert cat["ds_a"] == {"source_folder": "a"}
+    assert len(reads) == 1
+
+    # A second process-level catalog reuses the compiled artifact.
+    assert SourceCatalog(str(tmp_path / "ds"))["ds_a"] == {"source_folder": "a"}
+    assert len(reads) == 1
+
+    _write(tmp_path / "ds" / "ds_a.yml", "source_folder: changed\n")
+    cat.refresh()
+    assert cat["ds_a"] == {"source_folder": "changed"}
+    assert len(reads) == 2
+
+
+def test_catalog_missing_directory_raises_on_access(tmp_path):
+    cat = SourceCatalog(str(tmp_path / "missing"))
+    with pytest.raises(RuntimeError):
+        cat["ds_a"]
@@ -0,0 +1,80 @@
+import gzip
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+from dq_docker import compression
+from dq_docker.precheck import precheck_header, read_header_columns
+
+
+CSV = b"id,name\n" + b"".join(b"%d,n%d\n" % (i, i) for i in range(5000))
+
+
+def _zstd(data):
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def test_detect_compression_from_extension_and_magic():
+    assert compression.detect_compression("a.csv.gz") == "gzip"
+    assert compression.detect_compression("a.CSV.ZST") == "zstd"
+    assert compression.detect_compression("landed/blob", head=gzip.compress(b"x")[:6]) == "gzip"
+    assert compression.detect_compression("a.csv", head=b"id,name") is None
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_read_csv_stream_full_and_chunked(codec):
+    payload = gzip.compress(CSV) if codec == "gzip" else _zstd(CSV)
+
+    df = compression.read_csv_stream(io.BytesIO(payload), codec)
+    assert len(df) == 5000 and list(df.columns) == ["id", "name"]
+
+    chunks = list(compression.read_csv_stream(io.BytesIO(payload), codec, chunksize=1000))
+    assert [len(c) for c in chunks] == [1000] * 5
+    assert chunks[-1]["id"].iloc[-1] == 4999
+
+
+def test_abandoned_chunk_iterator_closes_stream():
+    source = io.BytesIO(gzip.compress(CSV))
+    chunks = compression.read_csv_stream(source, "gzip", chunksize=1000)
+    assert len(next(chunks)) == 1000
+
+    del chunks
+    assert source.closed
+    assert not [t for t in threading.enumerate() if t.name == "dq-decompress"]
+
+
+def test_adls_read_csv_decompresses_by_magic(monkeypatch):
+    fsspec = pytest.importorskip("fsspec")
+    import dq_docker.adls.client as client_mod
+
+    # Other tests reload the client module against a fake fsspec.
+    monkeypatch.setattr(client_mod, "fsspec", fsspec)
+    monkeypatch.setattr(client_mod, "pd", pd)
+    fs = fsspec.filesystem("memory")
+    fs.pipe("/box/landed/customers", gzip.compress(CSV))
+    monkeypatch.setattr(client_mod.ADLSClient, "path", lambda self, c, p: f"memory://{c}/{p}")
+
+    df = client_mod.ADLSClient().read_csv("box", "landed/customers")
+    assert len(df) == 5000
+
+
+def test_header_precheck_reads_compressed_header(tmp_path):
+    from pathlib import Path
+
+    from dq_docker.precheck import SchemaPrecheckError
+
+    contract = Path(__file__).resolve().parents[1] / "contracts" / "customers.contract.yml"
+    sample = Path(__file__).resolve().parents[1] / "gx" / "sample_data" / "customers" / "customers_2019.csv"
+
+    good = tmp_path / "customers_2024.csv.gz"
+    good.write_bytes(gzip.compress(sample.read_bytes()))
+    assert precheck_header(str(good), contract) == {"missing": [], "unexpected": []}
+
+    bad = tmp_path / "customers_2025.csv.gz"
+    bad.write_bytes(gzip.compress(CSV))
+    assert read_header_columns(str(bad)) == ["id", "name"]
+    with pytest.raises(SchemaPrecheckError):
+        precheck_header(str(bad), contract)
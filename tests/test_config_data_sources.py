@@ -1,11 +1,12 @@
 import importlib
 import os
+from collections.abc import Mapping
 
 
 def test_data_sources_mapping_keys():
     mod = importlib.import_module("dq_docker.config.data_sources")
     ds = mod.DATA_SOURCES
-    assert isinstance(ds, dict)
+    assert isinstance(ds, Mapping)
     assert "ds_sample_data" in ds
     required = {
         "source_folder",
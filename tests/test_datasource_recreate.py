@@ -1,7 +1,13 @@
+import sys
 import types
 import importlib
 
+import great_expectations as gx
+import pandas as pd
+import pytest
+
 import dq_docker.data_source as ds_mod
+from dq_docker.validation_definition import create_or_get_validation_definition
 
 
 class FakeDatasource:
@@ -52,3 +58,68 @@ def test_ensure_pandas_filesystem_recreates_when_base_dir_differs():
     assert mgr.added_with[0] == "ds_sample_data"
     assert mgr.added_with[1].endswith("gx/sample_data/customers")
     assert result is not None
+
+
+def test_source_registered_at_another_mount_point_is_loaded_as_a_frame(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import _resolve_helpers, prepare_source
+
+    monkeypatch.setitem(sys.modules, "great_expectations", gx)
+    monkeypatch.setattr(rac, "build_expectation_suite", lambda name, contract_path: gx.ExpectationSuite(name=name))
+    for folder, value in (("a", 1), ("b", 2)):
+        (tmp_path / folder).mkdir()
+        pd.DataFrame({"x": [value]}).to_csv(tmp_path / folder / "f.csv", index=False)
+    ctx = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    ds = ctx.data_sources.add_pandas_filesystem(name="src", base_directory=str(tmp_path / "a"))
+    ds.add_csv_asset("asset").add_batch_definition_path(name="f.csv", path="f.csv")
+    assert ds_mod.filesystem_base_matches(ctx, "src", str(tmp_path / "a"))
+    assert not ds_mod.filesystem_base_matches(ctx, "src", str(tmp_path / "b"))
+    assert ds_mod.filesystem_base_matches(ctx, "other", str(tmp_path / "b"))
+
+    ctx = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    conf = {"asset_name": "asset", "batch_definition_name": "f.csv", "batch_definition_path": "f.csv",
+            "expectation_suite_name": "suite", "definition_name": "vd", "header_precheck": False}
+    plan = prepare_source(ctx, "src", conf, str(tmp_path / "b"), str(tmp_path), _resolve_helpers()[1])
+
+    assert plan.as_frame and plan.batch_definition.data_asset.datasource.name == "src__frame"
+    # The datasource other runners use is neither rebased nor rewritten.
+    reloaded = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    kept = reloaded.data_sources.get("src")
+    assert kept.id == ds.id and str(kept.base_directory) == str(tmp_path / "a")
+
+
+def test_frame_datasource_does_not_replace_filesystem_datasource(tmp_path):
+    (tmp_path / "a").mkdir()
+    pd.DataFrame({"x": [1]}).to_csv(tmp_path / "a" / "f.csv", index=False)
+    ctx = gx.get_context(mode="ephemeral")
+    files = ds_mod.ensure_pandas_filesystem(ctx, "src", str(tmp_path / "a"))
+
+    frame = ds_mod.ensure_pandas_datasource(ctx, ds_mod.frame_datasource_name("src", "csv"))
+    assert frame.name == "src__frame" and frame.type == "pandas"
+    again = ds_mod.ensure_pandas_filesystem(ctx, "src", str(tmp_path / "a"))
+    assert again.id == files.id and again.type == "pandas_filesystem"
+    assert ds_mod.frame_datasource_name("src", "delta") == "src"
+
+
+def test_ensure_pandas_filesystem_refuses_other_datasource_types(tmp_path):
+    ctx = gx.get_context(mode="ephemeral")
+    ctx.data_sources.add_pandas(name="src")
+    with pytest.raises(ValueError, match="pandas_filesystem"):
+        ds_mod.ensure_pandas_filesystem(ctx, "src", str(tmp_path))
+    assert ctx.data_sources.get("src").type == "pandas"
+
+
+def test_validation_definition_follows_source_between_datasources(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "great_expectations", gx)
+    (tmp_path / "f.csv").write_text("x\n1\n")
+    ctx = gx.get_context(mode="ephemeral")
+    suite = ctx.suites.add(gx.ExpectationSuite(name="suite"))
+    files = ds_mod.ensure_pandas_filesystem(ctx, "src", str(tmp_path))
+    file_bd = files.add_csv_asset("asset").add_batch_definition_path(name="f.csv", path="f.csv")
+    create_or_get_validation_definition(ctx, "vd", file_bd, suite)
+
+    frame = ds_mod.ensure_pandas_datasource(ctx, "src__frame")
+    frame_bd = frame.add_dataframe_asset("asset").add_batch_definition_whole_dataframe("f.csv")
+    create_or_get_validation_definition(ctx, "vd", frame_bd, suite)
+
+    assert ctx.validation_definitions.get("vd").batch_definition.data_asset.datasource.name == "src__frame"
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import great_expectations as gx
+import great_expectations.checkpoint as gx_checkpoint
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+import yaml
+
+from dq_docker.context import EphemeralProject
+
+
+@pytest.fixture
+def file_context(tmp_path, monkeypatch):
+    # Other tests replace these modules with fakes; Data Docs builds import them.
+    monkeypatch.setitem(sys.modules, "great_expectations", gx)
+    monkeypatch.setitem(sys.modules, "great_expectations.checkpoint", gx_checkpoint)
+    (tmp_path / "data").mkdir()
+    pd.DataFrame({"id": [1, 2, None]}).to_csv(tmp_path / "data" / "x.csv", index=False)
+    ctx = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    asset = ctx.data_sources.add_pandas_filesystem("ds", base_directory=str(tmp_path / "data")).add_csv_asset("x")
+    bd = asset.add_batch_definition_path("x.csv", path="x.csv")
+    suite = ctx.suites.add(gx.ExpectationSuite("suite", expectations=[gxe.ExpectColumnValuesToNotBeNull(column="id")]))
+    ctx.validation_definitions.add(gx.ValidationDefinition(name="vd", data=bd, suite=suite))
+    return ctx
+
+
+def _mtimes(directory):
+    return {f: os.stat(os.path.join(directory, f)).st_mtime_ns for f in os.listdir(directory)}
+
+
+def test_run_stays_in_memory_until_flushed(file_context):
+    root = file_context.root_directory
+    suites_dir = os.path.join(root, "expectations")
+    before = _mtimes(suites_dir)
+
+    project = EphemeralProject(file_context)
+    ctx = project.context
+    result = ctx.validation_definitions.get("vd").run()
+    assert result.success is False
+    ctx.suites.add(gx.ExpectationSuite("new_suite"))
+    ctx.data_sources.get("ds").add_csv_asset("y")
+
+    assert file_context.validation_results_store.store_backend.list_keys() == []
+    with open(os.path.join(root, "great_expectations.yml")) as fh:
+        assert list(yaml.safe_load(fh)["fluent_datasources"]["ds"]["assets"]) == ["x"]
+
+    summary = project.flush()
+
+    assert summary["errors"] == [] and summary["datasources"] == 1
+    assert summary["expectations_store"] == {"written": 1, "removed": 0}
+    assert summary["validation_definition_store"] == {"written": 0, "removed": 0}
+    assert len(file_context.validation_results_store.store_backend.list_keys()) == 1
+    assert _mtimes(suites_dir).items() >= before.items()
+    reloaded = gx.get_context(mode="file", project_root_dir=os.path.dirname(root))
+    assert [a.name for a in reloaded.data_sources.get("ds").assets] == ["x", "y"]
+
+    again = project.flush()
+    assert again["expectations_store"]["written"] == 0 and again["validation_results_store"]["written"] == 0
+
+
+def _validation_pages(root):
+    site = os.path.join(root, "uncommitted", "data_docs", "local_site", "validations")
+    return sorted(os.path.relpath(os.path.join(d, f), site) for d, _, files in os.walk(site) for f in files)
+
+
+def test_data_docs_keep_earlier_ephemeral_runs(file_context):
+    file_context.checkpoints.add(
+        gx.Checkpoint(name="cp", validation_definitions=[file_context.validation_definitions.get("vd")], actions=[gx_checkpoint.UpdateDataDocsAction(name="docs")])
+    )
+    pages = []
+    for run_name in ("first", "second"):
+        project = EphemeralProject(file_context)
+        project.context.checkpoints.get("cp").run(run_id=gx.RunIdentifier(run_name=run_name))
+        project.flush()
+        pages.append(_validation_pages(file_context.root_directory))
+
+    assert len(pages[0]) == 1 and pages[0][0].startswith(os.path.join("suite", "first"))
+    assert len(pages[1]) == 2 and pages[0][0] in pages[1]
@@ -0,0 +1,100 @@
+import json
+import types
+
+import pandas as pd
+import pytest
+
+from dq_docker import history_cli
+from dq_docker.history import RunHistory
+
+
+def _result(success, unexpected):
+    return {
+        "success": success,
+        "results": [{
+            "success": success,
+            "expectation_config": {"type": "expect_column_values_to_not_be_null", "kwargs": {"column": "id"}},
+            "result": {"element_count": 10, "unexpected_count": unexpected},
+        }],
+    }
+
+
+@pytest.fixture
+def fake_runtime(monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+
+    outcomes = {"ds_good": _result(True, 0), "ds_bad": _result(False, 4)}
+
+    class FakeVD:
+        def __init__(self, name):
+            self.name = name
+
+        def run(self, **kwargs):
+            return outcomes[self.name]
+
+    def missing_contract(name, contract_path):
+        raise ValueError(f"contract not found: {contract_path}")
+
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda ctx, name, folder: object())
+    monkeypatch.setattr(rac, "ensure_csv_asset", lambda ds, name: object())
+    monkeypatch.setattr(rac, "ensure_batch_definition", lambda asset, name, path: object())
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda *a, **k: None)
+    monkeypatch.setattr(rac, "build_expectation_suite", missing_contract)
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD(name))
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", lambda *a, **kw: {"success": True})
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+
+def test_runs_are_indexed_and_queryable(tmp_path, fake_runtime, capsys):
+    from dq_docker.validator import run_validations
+
+    (tmp_path / "data").mkdir()
+    pd.DataFrame({"id": [1]}).to_csv(tmp_path / "data" / "x.csv", index=False)
+    sources = {
+        name: {"source_folder": str(tmp_path / "data"), "batch_definition_path": "x.csv", "asset_name": name, "definition_name": name}
+        for name in ("ds_good", "ds_bad")
+    }
+    sources["ds_missing"] = dict(sources["ds_good"], batch_definition_name="missing.csv", definition_name="ds_good")
+    db = str(tmp_path / "history.sqlite")
+
+    history = RunHistory(db)
+    for _ in range(2):
+        history.start_run("nightly")
+        run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, history=history)
+        history.finish_run()
+    history.close()
+
+    assert history_cli.main(["--db", db, "--json", "failures"]) == 0
+    failures = json.loads(capsys.readouterr().out)
+    assert [(f["source"], f["failed"]) for f in failures] == [("ds_bad", 2), ("ds_missing", 2)]
+
+    assert history_cli.main(["--db", db, "--json", "durations", "ds_good"]) == 0
+    durations = json.loads(capsys.readouterr().out)
+    assert len(durations) == 2 and all(d["success"] == 1 and d["input_fingerprint"] for d in durations)
+
+    assert history_cli.main(["--db", db, "--json", "expectations"]) == 0
+    expectations = json.loads(capsys.readouterr().out)
+    assert expectations == [{
+        "source": "ds_bad", "expectation_type": "expect_column_values_to_not_be_null", "column_name": "id",
+        "evaluated": 2, "failed": 2, "unexpected": 8,
+    }]
+
+    assert history_cli.main(["--db", db, "runs"]) == 0
+    assert "nightly" in capsys.readouterr().out
+
+
+def test_cli_reports_missing_database(tmp_path, capsys):
+    assert history_cli.main(["--db", str(tmp_path / "none.sqlite"), "runs"]) == 1
+    assert "No run history" in capsys.readouterr().err
+
+
+def test_run_is_finished_when_validation_raises():
+    from dq_docker.run_adls_checkpoint import _recorded_run
+
+    history = RunHistory(":memory:")
+    with pytest.raises(RuntimeError):
+        with _recorded_run(history):
+            raise RuntimeError("boom")
+    assert [r["finished_at"] is not None for r in history.query("SELECT finished_at FROM runs")] == [True]
+    history.close()
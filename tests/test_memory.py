@@ -0,0 +1,177 @@
+import threading
+import time
+import types
+
+import great_expectations as gx
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+
+from dq_docker import memory
+from dq_docker.chunked import ChunkResults, store_result, validate_chunk
+from dq_docker.memory import Estimate, MemoryGovernor, estimate_peak
+
+
+def test_budget_is_a_fraction_of_the_cgroup_limit(tmp_path, monkeypatch):
+    limit = tmp_path / "memory.max"
+    limit.write_text("1073741824\n")
+    monkeypatch.setattr(memory, "CGROUP_V2_LIMIT", str(limit))
+    monkeypatch.setenv("DQ_MEMORY_BUDGET", "0.5")
+    assert memory.memory_budget() == 512 * 1024 * 1024
+
+    monkeypatch.setenv("DQ_MEMORY_BUDGET", "1000000")
+    assert memory.memory_budget() == 1000000
+    monkeypatch.delenv("DQ_MEMORY_BUDGET")
+    assert memory.memory_budget() is None
+
+
+def test_unlimited_cgroup_falls_back_to_physical_memory(tmp_path, monkeypatch):
+    limit = tmp_path / "memory.max"
+    limit.write_text("max\n")
+    monkeypatch.setattr(memory, "CGROUP_V2_LIMIT", str(limit))
+    monkeypatch.setattr(memory, "CGROUP_V1_LIMIT", str(tmp_path / "missing"))
+    assert memory.memory_limit() > 0
+
+
+def test_estimate_uses_declared_types_and_usecols(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("id,name\n" + "".join(f"{i},name{i}\n" for i in range(1000)))
+    types_ = {"id": "integer", "name": "string"}
+
+    full = estimate_peak(str(path), "csv", types_)
+    ids_only = estimate_peak(str(path), "csv", types_, {"usecols": ["id"]})
+
+    assert full.rows > 0
+    assert ids_only.peak_bytes < full.peak_bytes
+    assert estimate_peak("abfs://c/x.csv", "csv", types_) == Estimate(0, 0)
+    assert estimate_peak("abfs://c/x.csv", "csv", types_, size=path.stat().st_size) == full
+
+
+def test_governor_admits_within_budget_and_oversize_alone():
+    governor = MemoryGovernor(100)
+    order = []
+
+    def second():
+        with governor.admit(60, "b"):
+            order.append("b")
+
+    with governor.admit(60, "a"):
+        t = threading.Thread(target=second)
+        t.start()
+        time.sleep(0.1)
+        order.append("a-done")
+    t.join(5)
+    assert order == ["a-done", "b"]
+
+    # An oversize request is admitted once nothing else is running.
+    other = MemoryGovernor(100)
+    with other.admit(500, "huge"):
+        assert other.in_use == 500
+    assert other.in_use == 0
+
+
+def test_oversize_source_is_validated_in_chunks(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    (tmp_path / "data").mkdir()
+    pd.DataFrame({"id": range(5000)}).to_csv(tmp_path / "data" / "big.csv", index=False)
+    monkeypatch.setenv("DQ_MEMORY_BUDGET", "1000")
+    sizes = []
+
+    class FakeVD:
+        def run(self, **kwargs):
+            sizes.append(len(kwargs["batch_parameters"]["dataframe"]))
+            return {"success": True}
+
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda *a: pytest.fail("file asset not expected"))
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: asset_type, raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: asset, raising=False)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda *a, **k: pytest.fail("whole batch loaded"))
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD())
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", lambda *a, **kw: {"success": True})
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    results = {}
+    sources = {"ds_big": {"source_folder": str(tmp_path / "data"), "batch_definition_path": "big.csv", "asset_name": "big"}}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+
+    assert results["ds_big"] == {"success": True, "validation_success": True, "chunks": 5}
+    assert sizes == [1000] * 5
+
+
+def test_chunk_results_are_stored_once(tmp_path):
+    ctx = gx.get_context(mode="ephemeral")
+    bd = ctx.data_sources.add_pandas("ds").add_dataframe_asset("big").add_batch_definition_whole_dataframe("bd")
+    suite = ctx.suites.add(gx.ExpectationSuite("s", expectations=[
+        gxe.ExpectColumnValuesToNotBeNull(column="id"),
+        gxe.ExpectColumnValuesToBeBetween(column="id", min_value=0, max_value=100),
+    ]))
+    vd = ctx.validation_definitions.add(gx.ValidationDefinition(name="vd", data=bd, suite=suite))
+    frame = pd.DataFrame({"id": [1, 2, None, 4, 500, 6]})
+
+    combined = ChunkResults()
+    assert [combined.add(validate_chunk(vd, frame.iloc[i:i + 2])) for i in (0, 2, 4)] == [True, False, False]
+    result = combined.combined()
+    assert ctx.validation_results_store.list_keys() == []
+    assert store_result(ctx, vd, result, {"run_name": "r1"})
+
+    assert len(ctx.validation_results_store.list_keys()) == 1
+    assert result.success is False and result.meta["chunks"] == 3
+    not_null, between = (r.result for r in result.results)
+    assert not_null["element_count"] == 6 and not_null["unexpected_count"] == 1
+    assert between["unexpected_count"] == 1 and between["missing_count"] == 1
+    assert between["unexpected_percent"] == pytest.approx(20.0)
+    assert between["partial_unexpected_list"] == [500.0]
+
+
+def test_chunk_results_are_judged_from_the_folded_counts_and_mostly():
+    ctx = gx.get_context(mode="ephemeral")
+    bd = ctx.data_sources.add_pandas("ds").add_dataframe_asset("big").add_batch_definition_whole_dataframe("bd")
+    suite = ctx.suites.add(gx.ExpectationSuite("s", expectations=[
+        gxe.ExpectColumnValuesToBeBetween(column="id", min_value=0, max_value=100, mostly=0.75),
+    ]))
+    vd = ctx.validation_definitions.add(gx.ValidationDefinition(name="vd", data=bd, suite=suite))
+    frame = pd.DataFrame({"id": [1, 500, 3, 4, 5, 6]})
+
+    combined = ChunkResults()
+    # The first chunk alone is 50% valid; the table is 5/6 valid.
+    assert [combined.add(validate_chunk(vd, frame.iloc[i:i + 2])) for i in (0, 2, 4)] == [False, True, True]
+    result = combined.combined()
+    assert result.success is True and combined.success is True
+    assert result.results[0].success is True and result.statistics["successful_expectations"] == 1
+
+    failing = ChunkResults()
+    for i in (0, 2, 4):
+        failing.add(validate_chunk(vd, pd.DataFrame({"id": [500, 500, 1, 2, 3, 4]}).iloc[i:i + 2]))
+    assert failing.combined().success is False and failing.success is False
+
+
+def test_chunked_source_with_table_level_expectations_fails(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    (tmp_path / "data").mkdir()
+    pd.DataFrame({"id": range(5000)}).to_csv(tmp_path / "data" / "big.csv", index=False)
+    monkeypatch.setenv("DQ_MEMORY_BUDGET", "1000")
+    suite = gx.ExpectationSuite("s", expectations=[
+        gxe.ExpectColumnValuesToNotBeNull(column="id"),
+        gxe.ExpectColumnValuesToBeUnique(column="id"),
+    ])
+
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: asset_type, raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: asset, raising=False)
+    monkeypatch.setattr(rac, "build_expectation_suite", lambda name, contract_path: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda *a: pytest.fail("chunked despite table-level expectations"))
+
+    results = {}
+    sources = {"ds_big": {
+        "source_folder": str(tmp_path / "data"), "batch_definition_path": "big.csv", "batch_definition_name": "big.csv", "asset_name": "big",
+        "header_precheck": False,
+    }}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+
+    assert results["ds_big"] == {"success": False, "error": "prepare"}
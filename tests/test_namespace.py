@@ -0,0 +1,134 @@
+import json
+import threading
+
+import great_expectations as gx
+import yaml
+
+from dq_docker.atomic_store import AtomicFilesystemStoreBackend
+from dq_docker.checkpoint import clear_ge_store
+from dq_docker.namespace import drop_run_scope, scope_source_conf
+
+
+def test_scope_source_conf(monkeypatch):
+    monkeypatch.setenv("DQ_RUN_SCOPE", "r 1")
+    conf = {"definition_name": "adls_checkpoint", "expectation_suite_name": "adls_data_quality_suite", "asset_name": "a"}
+
+    assert scope_source_conf("ds_customers", conf, mode="none") is conf
+    assert scope_source_conf("ds_customers", conf, mode="source") == dict(
+        conf, definition_name="adls_checkpoint-ds_customers", expectation_suite_name="adls_data_quality_suite-ds_customers"
+    )
+    scoped = scope_source_conf("ds/orders", conf, mode="run")
+    assert scoped["definition_name"] == "adls_checkpoint-ds_orders-r_1"
+    assert scoped["expectation_suite_name"] == "adls_data_quality_suite-ds_orders"
+    assert conf["definition_name"] == "adls_checkpoint"
+
+
+def test_drop_run_scope_removes_only_that_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("DQ_NAMESPACE", "run")
+    monkeypatch.setenv("DQ_RUN_SCOPE", "r1")
+    ctx = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    bd = ctx.data_sources.add_pandas("ds").add_dataframe_asset("asset").add_batch_definition_whole_dataframe("bd")
+    suite = ctx.suites.add(gx.ExpectationSuite("suite-ds"))
+    created = scope_source_conf("ds", {"definition_name": "cp"})["definition_name"]
+    for name in (created, "cp-ds-r1-2024", "cp-other-r1", "cp-ds-r2"):
+        vd = ctx.validation_definitions.add(gx.ValidationDefinition(name=name, data=bd, suite=suite))
+        ctx.checkpoints.add(gx.Checkpoint(name=name, validation_definitions=[vd]))
+
+    # The current run drops only what it created; another runner's entry
+    # with the same scope survives.
+    dropped = drop_run_scope(ctx)
+    assert dropped["checkpoints"] == dropped["validation_definitions"] == ["cp-ds-r1"]
+
+    # An explicit scope matches the exact suffix.
+    dropped = drop_run_scope(ctx, scope="r1")
+    assert dropped["checkpoints"] == dropped["validation_definitions"] == ["cp-other-r1"]
+    assert sorted(c.name for c in ctx.checkpoints.all()) == ["cp-ds-r1-2024", "cp-ds-r2"]
+    monkeypatch.setenv("DQ_NAMESPACE", "source")
+    assert drop_run_scope(ctx) == {}
+
+
+def test_atomic_backend_never_exposes_partial_files(tmp_path):
+    backend = AtomicFilesystemStoreBackend(base_directory=str(tmp_path / "store"), filepath_suffix=".json")
+    payloads = [json.dumps({"writer": i, "pad": "x" * 200_000}) for i in range(4)]
+    errors = []
+    done = threading.Event()
+
+    def write(payload):
+        for _ in range(20):
+            backend.set(("shared",), payload)
+
+    def read():
+        while not done.is_set():
+            try:
+                if backend.has_key(("shared",)):
+                    json.loads(backend.get(("shared",)))
+            except Exception as exc:
+                errors.append(exc)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    writers = [threading.Thread(target=write, args=(p,)) for p in payloads]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    done.set()
+    reader.join()
+
+    assert errors == []
+    assert json.loads(backend.get(("shared",)))["writer"] in range(4)
+    assert [k for k in backend.list_keys() if k != backend.STORE_BACKEND_ID_KEY] == [("shared",)]
+    assert backend.remove_key(("shared",)) and backend.remove_key(("shared",)) is False
+
+
+def test_atomic_backend_from_project_config(tmp_path):
+    gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    path = tmp_path / "gx" / "great_expectations.yml"
+    config = yaml.safe_load(path.read_text())
+    for name in ("checkpoint_store", "validation_definition_store"):
+        config["stores"][name]["store_backend"].update(class_name="AtomicFilesystemStoreBackend", module_name="dq_docker.atomic_store")
+    path.write_text(yaml.safe_dump(config))
+
+    ctx = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    assert isinstance(ctx.checkpoint_store.store_backend, AtomicFilesystemStoreBackend)
+    bd = ctx.data_sources.add_pandas("ds").add_dataframe_asset("asset").add_batch_definition_whole_dataframe("bd")
+    vd = ctx.validation_definitions.add(gx.ValidationDefinition(name="vd", data=bd, suite=ctx.suites.add(gx.ExpectationSuite("s"))))
+    ctx.checkpoints.add(gx.Checkpoint(name="cp", validation_definitions=[vd]))
+    assert ctx.checkpoints.get("cp").validation_definitions[0].name == "vd"
+
+    result = clear_ge_store(ctx)
+    assert result["checkpoints_deleted"] == ["cp"] and result["errors"] == []
+
+
+def test_save_project_config_merges_concurrent_datasources(tmp_path):
+    from great_expectations.datasource.fluent import PandasDatasource
+
+    from dq_docker.context import save_project_config
+
+    gx.get_context(mode="file", project_root_dir=str(tmp_path)).data_sources.add_pandas("ds_old")
+    first = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    loaded = set(first.data_sources.all())
+    # Another runner adds a datasource, and this one deletes one.
+    gx.get_context(mode="file", project_root_dir=str(tmp_path)).data_sources.add_pandas("ds_b")
+    first.data_sources.all().pop("ds_old")
+    ds_a = PandasDatasource(name="ds_a")
+    ds_a.add_dataframe_asset("asset")
+    first.data_sources.all().set_datasource("ds_a", ds_a)
+
+    assert save_project_config(first, loaded=loaded)
+
+    path = tmp_path / "gx" / "great_expectations.yml"
+    assert set(yaml.safe_load(path.read_text())["fluent_datasources"]) == {"ds_a", "ds_b"}
+    assert [p.name for p in path.parent.iterdir() if p.name.endswith(".tmp")] == []
+    reloaded = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    assert set(reloaded.data_sources.all()) == {"ds_a", "ds_b"}
+    assert "asset" in [a.name for a in reloaded.data_sources.get("ds_a").assets]
+
+
+def test_shipped_project_uses_atomic_stores():
+    from pathlib import Path
+
+    config = yaml.safe_load((Path(__file__).resolve().parents[1] / "gx" / "great_expectations.yml").read_text())
+    backends = [store["store_backend"] for store in config["stores"].values()]
+    assert len(backends) == 4
+    assert all(b["class_name"] == "AtomicFilesystemStoreBackend" and b["module_name"] == "dq_docker.atomic_store" for b in backends)
@@ -0,0 +1,85 @@
+import os
+import types
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from dq_docker import readers
+from dq_docker.parse_cache import ParseCache
+
+
+def _csv(path, rows):
+    pd.DataFrame({"id": range(rows), "name": [f"n{i}" for i in range(rows)]}).to_csv(path, index=False)
+
+
+def test_second_load_is_served_from_the_cache(tmp_path, monkeypatch):
+    src = tmp_path / "customers.csv"
+    _csv(src, 50)
+    cache = ParseCache(str(tmp_path / "cache"))
+
+    first = readers.load_frame("csv", str(src), {}, cache=cache)
+    monkeypatch.setattr(readers, "read_file", lambda *a, **k: pytest.fail("input parsed again"))
+    second = readers.load_frame("csv", str(src), {}, cache=cache)
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_changed_input_or_options_miss_the_cache(tmp_path):
+    src = tmp_path / "customers.csv"
+    _csv(src, 10)
+    cache = ParseCache(str(tmp_path / "cache"))
+    key = cache.key("csv", str(src), {})
+
+    assert cache.key("csv", str(src), {"sep": ";"}) != key
+    _csv(src, 11)
+    os.utime(src, ns=(1, 1))
+    assert cache.key("csv", str(src), {}) != key
+
+
+def test_eviction_keeps_cache_within_bound(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache"), max_bytes=10**9)
+    frame = pd.DataFrame({"x": range(20000)})
+    paths = [cache.put(f"k{i}", frame) for i in range(3)]
+    entry_size = os.path.getsize(paths[0])
+    os.utime(paths[0], ns=(1, 1))  # least recently used
+
+    cache.max_bytes = entry_size * 2
+    removed = cache.evict()
+
+    assert removed == [paths[0]]
+    assert cache.get("k0") is None
+    assert cache.get("k2")["x"].tolist() == list(range(20000))
+
+
+def test_run_validations_loads_csv_through_cache(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    monkeypatch.setenv("DQ_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "data").mkdir()
+    _csv(tmp_path / "data" / "orders.csv", 5)
+    seen = []
+
+    class FakeVD:
+        def run(self, **kwargs):
+            seen.append(kwargs["batch_parameters"]["dataframe"])
+            return {"success": True}
+
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda *a: pytest.fail("filesystem datasource not expected"))
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: asset_type, raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: asset, raising=False)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda bd, batch_parameters=None: None)
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD())
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", lambda *a, **kw: {"success": True})
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    sources = {"ds_orders": {"source_folder": str(tmp_path / "data"), "batch_definition_path": "orders.csv", "asset_name": "orders", "parse_cache": True}}
+    for _ in range(2):
+        run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {})
+
+    assert [len(df) for df in seen] == [5, 5]
+    assert len(list((tmp_path / "cache" / "parsed").glob("*.arrow"))) == 1
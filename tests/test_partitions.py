@@ -0,0 +1,93 @@
+import threading
+import types
+
+import pytest
+
+from dq_docker import partitions
+
+
+def _write_partitions(root):
+    (root / "2023").mkdir(parents=True)
+    (root / "2024").mkdir(parents=True)
+    for rel in ("2023/customers_2023-11.csv", "2024/customers_2024-01.csv", "2023/customers_2023-12.csv", "2024/notes.txt"):
+        (root / rel).write_text("id\n1\n")
+
+
+REGEX = r"(?P<year>\d{4})/customers_(?P=year)-(?P<month>\d{2})\.csv"
+
+
+def test_discover_partitions_orders_by_named_groups(tmp_path):
+    _write_partitions(tmp_path)
+    found = partitions.discover_partitions(str(tmp_path), REGEX)
+    assert [p.key for p in found] == ["2023-11", "2023-12", "2024-01"]
+    assert found[-1].path == "2024/customers_2024-01.csv"
+
+
+def test_expand_partitions_modes(tmp_path):
+    _write_partitions(tmp_path)
+    conf = {"batch_definition_regex": REGEX, "definition_name": "customers_def"}
+
+    latest = partitions.expand_partitions(conf, str(tmp_path))
+    assert [(k, c["batch_definition_path"], c["definition_name"]) for k, c in latest] == [
+        ("2024-01", "2024/customers_2024-01.csv", "customers_def")
+    ]
+
+    every = partitions.expand_partitions(dict(conf, partition_mode="all"), str(tmp_path))
+    assert [c["definition_name"] for _, c in every] == [
+        "customers_def-2023-11",
+        "customers_def-2023-12",
+        "customers_def-2024-01",
+    ]
+
+    assert partitions.expand_partitions({"batch_definition_path": "x.csv"}, str(tmp_path)) is None
+    with pytest.raises(ValueError):
+        partitions.expand_partitions(dict(conf, partition_mode="oldest"), str(tmp_path))
+
+
+def test_run_validations_all_partitions_keyed_by_partition(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    _write_partitions(tmp_path / "data")
+    threads = set()
+
+    class FakeVD:
+        def __init__(self, name):
+            self.name = name
+
+        def run(self, **kwargs):
+            threads.add(threading.current_thread().name)
+            return {"success": not self.name.endswith("2023-12")}
+
+    registered = []
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda ctx, name, folder: registered.append(("datasource", name)))
+    monkeypatch.setattr(rac, "ensure_csv_asset", lambda ds, name: registered.append(("asset", name)))
+    monkeypatch.setattr(rac, "ensure_batch_definition", lambda asset, name, path: path)
+    monkeypatch.setattr(rac, "build_expectation_suite", lambda name, contract_path=None: types.SimpleNamespace())
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda bd: None)
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD(name))
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", lambda *a, **kw: {"success": True})
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    sources = {
+        "ds_customers": {
+            "source_folder": str(tmp_path / "data"),
+            "asset_name": "customers",
+            "batch_definition_regex": REGEX,
+            "partition_mode": "all",
+            "partition_workers": 3,
+            "definition_name": "customers_def",
+            "header_precheck": False,
+        }
+    }
+    results = {}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+
+    assert {k: v["success"] for k, v in results["ds_customers"].items()} == {
+        "2023-11": True,
+        "2023-12": False,
+        "2024-01": True,
+    }
+    assert all(name.startswith("dq-partition") for name in threads)
+    assert set(registered) == {("datasource", "ds_customers"), ("asset", "customers")}
@@ -0,0 +1,74 @@
+import types
+from pathlib import Path
+
+import pytest
+
+from dq_docker import precheck
+
+CONTRACT = Path(__file__).resolve().parents[1] / "contracts" / "customers.contract.yml"
+SAMPLE = Path(__file__).resolve().parents[1] / "gx" / "sample_data" / "customers" / "customers_2019.csv"
+
+
+def test_sample_header_matches_contract():
+    diff = precheck.precheck_header(str(SAMPLE), CONTRACT)
+    assert diff == {"missing": [], "unexpected": []}
+
+
+def test_renamed_column_fails_fast(tmp_path):
+    header = SAMPLE.read_text().splitlines()[0].replace("email", "e_mail")
+    f = tmp_path / "customers_2021.csv"
+    f.write_text(header + "\n1,a\n")
+
+    with pytest.raises(precheck.SchemaPrecheckError) as excinfo:
+        precheck.precheck_header(str(f), CONTRACT)
+    assert excinfo.value.missing == ["email"]
+    assert excinfo.value.unexpected == ["e_mail"]
+
+
+def test_only_reads_header_prefix(tmp_path, monkeypatch):
+    f = tmp_path / "wide.csv"
+    f.write_bytes(b"\xef\xbb\xbf" + b"a,b\r\n" + b"1,2\n" * 100000)
+    reads = []
+    real = precheck._read_prefix
+    monkeypatch.setattr(precheck, "_read_prefix", lambda loc, n: reads.append(n) or real(loc, n))
+
+    assert precheck.read_header_columns(str(f), nbytes=16) == ["a", "b"]
+    assert reads == [16]
+
+
+def test_non_csv_and_missing_files_are_skipped(tmp_path):
+    assert precheck.precheck_header(str(tmp_path / "data.parquet"), CONTRACT) is None
+    assert precheck.precheck_header(str(tmp_path / "absent.csv"), CONTRACT) is None
+
+
+def test_run_validations_skips_batch_on_header_drift(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    (tmp_path / "contracts").mkdir()
+    (tmp_path / "contracts" / "customers.contract.yml").write_text(CONTRACT.read_text())
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "customers_2021.csv").write_text("customer_id,first_name\n1,a\n")
+
+    calls = []
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda ctx, name, base: object())
+    monkeypatch.setattr(rac, "ensure_csv_asset", lambda ds, name: object())
+    monkeypatch.setattr(rac, "ensure_batch_definition", lambda asset, name, path: object())
+    monkeypatch.setattr(rac, "build_expectation_suite", lambda name, contract_path=None: types.SimpleNamespace())
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda bd: calls.append("get_batch"))
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    sources = {
+        "ds_drift": {
+            "source_folder": str(data_dir),
+            "asset_name": "customers",
+            "batch_definition_name": "customers_2021.csv",
+            "batch_definition_path": "customers_2021.csv",
+            "expectation_suite_name": "suite",
+            "definition_name": "def",
+        }
+    }
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {})
+
+    assert calls == []
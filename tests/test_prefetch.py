@@ -0,0 +1,152 @@
+import os
+import threading
+import types
+
+import pytest
+
+from dq_docker import prefetch
+
+
+def test_run_prefetched_loads_ahead_in_order():
+    loaded_ahead = threading.Event()
+    started = []
+
+    def load(p):
+        started.append(p)
+        if {1, 2} <= set(started):
+            loaded_ahead.set()
+        return p * 10
+
+    def execute(item, prepared, loaded):
+        if item == 0:
+            # The next two sources load while the first one validates.
+            assert loaded_ahead.wait(5)
+        return loaded
+
+    assert prefetch.run_prefetched(range(4), lambda i: i, load, execute, depth=2) == [0, 10, 20, 30]
+
+
+def test_run_prefetched_respects_memory_cap():
+    started = []
+    gate = threading.Event()
+
+    def load(p):
+        started.append(p)
+        if p == 0:
+            gate.wait(5)
+        return p
+
+    def execute(item, prepared, loaded):
+        # While the head loads, nothing else may be admitted: each item is
+        # estimated at the full cap.
+        if item == 0:
+            assert started == [0]
+        return loaded
+
+    def estimate(p):
+        return 100
+
+    timer = threading.Timer(0.2, gate.set)
+    timer.start()
+    out = prefetch.run_prefetched(range(3), lambda i: i, load, execute, depth=2, max_bytes=100, estimate=estimate)
+    timer.cancel()
+    assert out == [0, 1, 2]
+
+
+def test_run_prefetched_peak_stays_within_cap():
+    lock = threading.Lock()
+    resident = {"now": 0, "peak": 0}
+
+    def load(p):
+        with lock:
+            resident["now"] += 60
+            resident["peak"] = max(resident["peak"], resident["now"])
+        return p
+
+    def execute(item, prepared, loaded):
+        # Give loads admitted while this source validates time to start.
+        threading.Event().wait(0.05)
+        with lock:
+            resident["now"] -= 60
+        return loaded
+
+    out = prefetch.run_prefetched(range(4), lambda i: i, load, execute, depth=3, max_bytes=100, estimate=lambda p: 60)
+    assert out == [0, 1, 2, 3]
+    assert resident["peak"] == 60
+
+
+def test_run_prefetched_passes_load_errors_and_skipped_items():
+    def load(p):
+        raise OSError("boom")
+
+    seen = []
+    prefetch.run_prefetched(
+        ["a", "b"],
+        lambda i: None if i == "a" else i,
+        load,
+        lambda item, prepared, loaded: seen.append((item, prepared, type(loaded).__name__)),
+        depth=1,
+    )
+    assert seen == [("a", None, "NoneType"), ("b", "b", "OSError")]
+
+
+def test_run_validations_prefetch_reads_each_source_once(tmp_path, monkeypatch):
+    import pandas as pd
+
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.readers import load_frame
+    from dq_docker.validator import run_validations
+
+    monkeypatch.setenv("DQ_PREFETCH", "2")
+    reads = []
+    real_read_csv = pd.read_csv
+
+    def counting_read_csv(path, *a, **kw):
+        reads.append((os.path.basename(str(path)), threading.current_thread().name))
+        return real_read_csv(path, *a, **kw)
+
+    def read_unless_frame(path, batch_parameters):
+        # Stand-in for Great Expectations: a path batch reads the file.
+        frame = (batch_parameters or {}).get("dataframe")
+        return counting_read_csv(os.path.join(str(tmp_path), path)) if frame is None else frame
+
+    class FakeVD:
+        def __init__(self, bd):
+            self.bd = bd
+
+        def run(self, batch_parameters=None, **kwargs):
+            read_unless_frame(self.bd, batch_parameters)
+            return {"success": True}
+
+    def fake_checkpoint(context, name, vd, actions, result_format, run_id=None, batch_parameters=None):
+        read_unless_frame(vd.bd, batch_parameters)
+        return {"success": True}
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda *a: pytest.fail("filesystem datasource not expected"))
+    frame_datasources = []
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: frame_datasources.append(name), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: name, raising=False)
+    monkeypatch.setattr(rac, "load_frame", load_frame, raising=False)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda bd, batch_parameters=None: read_unless_frame(bd, batch_parameters))
+    monkeypatch.setattr(rac, "build_expectation_suite", lambda name, contract_path=None: types.SimpleNamespace())
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD(bd))
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", fake_checkpoint)
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    for i in range(3):
+        pd.DataFrame({"id": [i]}).to_csv(tmp_path / f"f{i}.csv", index=False)
+    sources = {
+        f"ds_{i}": {"source_folder": str(tmp_path), "batch_definition_path": f"f{i}.csv", "batch_definition_name": f"f{i}.csv", "asset_name": f"a{i}", "header_precheck": False}
+        for i in range(3)
+    }
+    results = {}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+
+    assert results == {f"ds_{i}": {"success": True, "validation_success": True} for i in range(3)}
+    assert sorted(name for name, _ in reads) == ["f0.csv", "f1.csv", "f2.csv"]
+    assert all(thread.startswith("dq-prefetch") for _, thread in reads)
+    # The source names stay with their pandas_filesystem datasources.
+    assert frame_datasources == ["ds_0__frame", "ds_1__frame", "ds_2__frame"]
@@ -0,0 +1,182 @@
+import types
+
+import great_expectations as gx
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+
+from dq_docker.quarantine import QuarantineSettings, QuarantineWriter, quarantine_settings
+
+
+def _suite():
+    return gx.ExpectationSuite(
+        "s",
+        expectations=[
+            gxe.ExpectColumnValuesToNotBeNull(column="id"),
+            gxe.ExpectColumnValuesToBeBetween(column="amount", min_value=0, max_value=100),
+            gxe.ExpectColumnValuesToMatchRegex(column="code", regex=r"^[A-Z]{3}$"),
+            gxe.ExpectTableRowCountToBeBetween(min_value=1),
+        ],
+    )
+
+
+def _frame():
+    return pd.DataFrame({
+        "id": [1, None, 3, 4, 5],
+        "amount": [10, 20, 500, None, -1],
+        "code": ["ABC", "DEF", "GHI", "jkl", "MNO"],
+    })
+
+
+def test_writer_streams_failing_and_passing_rows(tmp_path):
+    settings = QuarantineSettings(directory=str(tmp_path), passing=True, chunk_rows=2)
+    writer = QuarantineWriter(settings, _suite(), "orders", "nightly")
+    frame = _frame()
+    writer.write(frame.iloc[:3])
+    writer.write(frame.iloc[3:], failed=False)
+    writer.write(frame)
+
+    failing = pd.read_parquet(tmp_path / "quarantine").sort_values("_dq_row")
+    assert failing["_dq_row"].tolist() == [1, 2, 6, 7, 8, 9]
+    assert failing["_dq_failed"].tolist()[:2] == [
+        "expect_column_values_to_not_be_null(id)",
+        "expect_column_values_to_be_between(amount)",
+    ]
+    assert failing["_dq_failed"].iloc[-1] == "expect_column_values_to_be_between(amount)"
+    assert set(failing["source"].astype(str)) == {"orders"} and set(failing["run"].astype(str)) == {"nightly"}
+
+    passing = pd.read_parquet(tmp_path / "passing")
+    assert sorted(passing["_dq_row"]) == [0, 5]
+    assert writer.summary()["rows"] == 10 and writer.summary()["failing_rows"] == 6
+
+
+def test_settings_from_source_and_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv("DQ_QUARANTINE", raising=False)
+    monkeypatch.delenv("DQ_QUARANTINE_DIR", raising=False)
+    context = types.SimpleNamespace(root_directory=str(tmp_path))
+
+    assert quarantine_settings({}, context) is None
+    assert quarantine_settings({"quarantine": True}, context).directory == str(tmp_path / "uncommitted" / "quarantine")
+    custom = quarantine_settings({"quarantine": {"path": "q", "passing": True, "chunk_rows": 10}}, context)
+    assert custom == QuarantineSettings(str(tmp_path / "q"), True, 10)
+    with pytest.raises(ValueError):
+        quarantine_settings({"quarantine": {"chunk_rows": "many"}}, context)
+
+    monkeypatch.setenv("DQ_QUARANTINE", "passing")
+    assert quarantine_settings({}, context).passing is True
+    assert quarantine_settings({"quarantine": False}, context) is None
+
+
+def _file_source_runtime(monkeypatch, run):
+    import dq_docker.run_adls_checkpoint as rac
+
+    class FakeVD:
+        def run(self, **kwargs):
+            return run(kwargs)
+
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda *a: pytest.fail("file asset not expected"))
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: asset_type, raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: asset, raising=False)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda *a, **k: None)
+    monkeypatch.setattr(rac, "build_expectation_suite", lambda name, contract_path: _suite())
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD())
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", lambda *a, **kw: {"success": True})
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+
+def _run_file_source(tmp_path):
+    from dq_docker.validator import run_validations
+
+    (tmp_path / "data").mkdir()
+    _frame().to_csv(tmp_path / "data" / "orders.csv", index=False)
+    sources = {"orders": {
+        "source_folder": str(tmp_path / "data"), "batch_definition_path": "orders.csv", "batch_definition_name": "orders.csv",
+        "asset_name": "orders", "definition_name": "orders", "header_precheck": False,
+        "quarantine": {"path": str(tmp_path / "out"), "chunk_rows": 2},
+    }}
+    results = {}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+    return results
+
+
+def test_failed_file_source_is_quarantined(tmp_path, monkeypatch):
+    monkeypatch.delenv("DQ_QUARANTINE", raising=False)
+    monkeypatch.setenv("DQ_RUN_NAME", "r1")
+    validated = []
+
+    def run(kwargs):
+        validated.append(kwargs["batch_parameters"]["dataframe"])
+        return {"success": False, "results": []}
+
+    _file_source_runtime(monkeypatch, run)
+    results = _run_file_source(tmp_path)
+
+    assert results["orders"]["quarantined_rows"] == 4
+    failing = pd.read_parquet(tmp_path / "out" / "quarantine" / "source=orders" / "run=r1")
+    assert sorted(failing["_dq_row"]) == [1, 2, 3, 4]
+    # The quarantined rows come from the frame that was validated.
+    assert len(validated) == 1 and failing.sort_values("_dq_row")["code"].tolist() == validated[0]["code"].iloc[1:].tolist()
+    assert not (tmp_path / "out" / "passing").exists()
+
+
+def test_source_whose_validation_raised_is_not_quarantined(tmp_path, monkeypatch):
+    monkeypatch.delenv("DQ_QUARANTINE", raising=False)
+    monkeypatch.setenv("DQ_RUN_NAME", "r1")
+
+    def run(kwargs):
+        raise RuntimeError("validation crashed")
+
+    _file_source_runtime(monkeypatch, run)
+    results = _run_file_source(tmp_path)
+
+    assert results["orders"]["success"] is False and results["orders"]["quarantined_rows"] == 0
+    assert not (tmp_path / "out" / "quarantine").exists()
+
+
+def test_passing_rows_are_written_whatever_the_batch_result(tmp_path):
+    settings = QuarantineSettings(directory=str(tmp_path), passing=True, chunk_rows=2)
+    writer = QuarantineWriter(settings, _suite(), "orders", "nightly")
+    writer.write(_frame(), failed=False)
+
+    assert not (tmp_path / "quarantine").exists()
+    assert pd.read_parquet(tmp_path / "passing")["_dq_row"].tolist() == [0]
+    assert writer.summary()["failing_rows"] == 0 and writer.summary()["passing_rows"] == 1
+
+
+@pytest.mark.parametrize("passed", [False, True])
+def test_quarantined_file_source_is_extracted_chunk_by_chunk(tmp_path, monkeypatch, passed):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    monkeypatch.delenv("DQ_QUARANTINE", raising=False)
+    monkeypatch.setenv("DQ_RUN_NAME", "r1")
+    row_level = gx.ExpectationSuite("s", expectations=list(_suite().expectations)[:3])
+    validated = []
+
+    def run(kwargs):
+        validated.append(len(kwargs["batch_parameters"]["dataframe"]))
+        return {"success": passed, "results": []}
+
+    _file_source_runtime(monkeypatch, run)
+    monkeypatch.setattr(rac, "build_expectation_suite", lambda name, contract_path: row_level)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda *a, **k: pytest.fail("whole batch loaded"))
+    (tmp_path / "data").mkdir()
+    _frame().to_csv(tmp_path / "data" / "orders.csv", index=False)
+    sources = {"orders": {
+        "source_folder": str(tmp_path / "data"), "batch_definition_path": "orders.csv", "batch_definition_name": "orders.csv",
+        "asset_name": "orders", "definition_name": "orders", "header_precheck": False,
+        "quarantine": {"path": str(tmp_path / "out"), "chunk_rows": 2, "passing": True},
+    }}
+    results = {}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+
+    assert validated == [2, 2, 1] and results["orders"]["chunks"] == 3
+    assert pd.read_parquet(tmp_path / "out" / "passing")["_dq_row"].tolist() == [0]
+    if passed:
+        assert results["orders"]["quarantined_rows"] == 0
+        assert list((tmp_path / "out" / "quarantine").rglob("*.parquet")) == []
+    else:
+        assert results["orders"]["quarantined_rows"] == 4
+        assert sorted(pd.read_parquet(tmp_path / "out" / "quarantine")["_dq_row"]) == [1, 2, 3, 4]
@@ -0,0 +1,184 @@
+import types
+
+import pandas as pd
+import pytest
+
+from dq_docker import readers
+from dq_docker import data_source as ds_mod
+
+
+def _write_parts(root):
+    (root / "2024" / "01").mkdir(parents=True)
+    (root / "2024" / "02").mkdir(parents=True)
+    pd.DataFrame({"id": [1, 2]}).to_csv(root / "2024" / "01" / "part-0.csv", index=False)
+    pd.DataFrame({"id": [3]}).to_csv(root / "2024" / "02" / "part-0.csv", index=False)
+    (root / "README.txt").write_text("not data")
+
+
+def test_read_directory_concatenates_in_path_order(tmp_path):
+    _write_parts(tmp_path)
+    df = readers.read_directory(str(tmp_path), fmt="csv", max_workers=2)
+    assert df["id"].tolist() == [1, 2, 3]
+
+
+def test_read_directory_without_matches_raises(tmp_path):
+    with pytest.raises(ValueError):
+        readers.read_directory(str(tmp_path), fmt="parquet")
+
+
+def test_read_delta_local_table(tmp_path):
+    deltalake = pytest.importorskip("deltalake")
+    deltalake.write_deltalake(str(tmp_path / "tbl"), pd.DataFrame({"id": [1, 2, 3]}))
+    df = readers.load_frame("delta", str(tmp_path / "tbl"))
+    assert sorted(df["id"].tolist()) == [1, 2, 3]
+
+
+def test_split_abfs_uri():
+    assert readers.split_abfs_uri("abfs://box/a/b.csv") == ("box", "a/b.csv")
+
+
+def test_ensure_asset_dispatches_on_type():
+    added = []
+
+    class FakeDS:
+        def get(self, name):
+            return None
+
+        def add_csv_asset(self, name, **kw):
+            added.append(("csv", kw))
+
+        def add_parquet_asset(self, name, **kw):
+            added.append(("parquet", kw))
+
+        def add_dataframe_asset(self, name):
+            added.append(("dataframe", {}))
+
+    ds = FakeDS()
+    ds_mod.ensure_asset(ds, "a", "csv", sep=";")
+    ds_mod.ensure_asset(ds, "b", "parquet")
+    ds_mod.ensure_asset(ds, "c", "delta")
+    assert added == [("csv", {"sep": ";"}), ("parquet", {}), ("dataframe", {})]
+    with pytest.raises(ValueError):
+        ds_mod.ensure_asset(ds, "d", "xlsx")
+
+
+def test_run_validations_passes_dataframe_for_directory_sources(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    _write_parts(tmp_path / "data")
+    seen = {}
+
+    class FakeVD:
+        def run(self, **kwargs):
+            seen["vd"] = kwargs.get("batch_parameters")
+            return {"success": True}
+
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda *a: pytest.fail("filesystem datasource not expected"))
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: object(), raising=False)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda bd, batch_parameters=None: seen.setdefault("batch", batch_parameters))
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD())
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    def fake_checkpoint(context, name, vd, actions, result_format, run_id=None, batch_parameters=None):
+        seen["checkpoint"] = batch_parameters
+        return {"success": True}
+
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", fake_checkpoint)
+
+    sources = {"ds_dir": {"source_folder": str(tmp_path / "data"), "asset_type": "directory", "asset_name": "parts", "definition_name": "parts_def"}}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {})
+
+    for key in ("batch", "vd", "checkpoint"):
+        assert seen[key]["dataframe"]["id"].tolist() == [1, 2, 3]
+
+
+def test_remote_csv_uses_byte_ranges_above_threshold(monkeypatch):
+    calls = []
+
+    class FakeClient:
+        def size(self, container, path):
+            return 300 if "big" in path else 10
+
+        def read_csv_ranges(self, container, path, ordered=False, **kwargs):
+            calls.append(("ranges", path))
+            assert ordered
+            return iter([(0, pd.DataFrame({"id": [1, 2]})), (1, pd.DataFrame({"id": [3, 4]}))])
+
+        def read_csv(self, container, path, **kwargs):
+            calls.append(("read_csv", path))
+            return pd.DataFrame({"id": [0]})
+
+    monkeypatch.setenv("DQ_ADLS_RANGE_MIN_BYTES", "100")
+    client = FakeClient()
+
+    assert readers.read_remote_csv(client, "box", "big.csv")["id"].tolist() == [1, 2, 3, 4]
+    readers.read_remote_csv(client, "box", "small.csv")
+    readers.read_remote_csv(client, "box", "big.csv.gz")
+    readers.read_remote_csv(client, "box", "big.csv", skiprows=1)
+    monkeypatch.setenv("DQ_ADLS_RANGE_MIN_BYTES", "0")
+    readers.read_remote_csv(client, "box", "big.csv")
+    assert calls == [("ranges", "big.csv")] + [("read_csv", p) for p in ("small.csv", "big.csv.gz", "big.csv", "big.csv")]
+
+
+def test_remote_csv_chunks_stream_byte_ranges_in_order(monkeypatch):
+    import dq_docker.adls as adls
+
+    ranges_read = []
+
+    class FakeClient:
+        def size(self, container, path):
+            return 300
+
+        def read_csv_ranges(self, container, path, ordered=False, **kwargs):
+            assert ordered
+            for idx, ids in enumerate(([1, 2, 3], [4, 5])):
+                ranges_read.append(idx)
+                yield idx, pd.DataFrame({"id": ids})
+
+    monkeypatch.setattr(adls, "ADLSClient", FakeClient)
+    monkeypatch.setenv("DQ_ADLS_RANGE_MIN_BYTES", "100")
+    chunks = readers.iter_file_chunks("csv", "abfs://box/big.csv", 2)
+
+    # The first chunk is available before the second range is read.
+    assert next(chunks)["id"].tolist() == [1, 2]
+    assert ranges_read == [0]
+    assert [c["id"].tolist() for c in chunks] == [[3], [4, 5]]
+
+
+def test_remote_csv_source_is_validated_as_dataframe(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    loaded, seen = [], {}
+
+    class FakeVD:
+        def run(self, **kwargs):
+            seen["vd"] = kwargs.get("batch_parameters")
+            return {"success": True}
+
+    def fake_load(asset_type, location, reader_options, **kw):
+        loaded.append((asset_type, location))
+        return pd.DataFrame({"id": [1]})
+
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda *a: pytest.fail("filesystem datasource not expected"))
+    monkeypatch.setattr(rac, "ensure_pandas_datasource", lambda ctx, name: object(), raising=False)
+    monkeypatch.setattr(rac, "ensure_asset", lambda ds, name, asset_type, **kw: seen.setdefault("asset_type", asset_type), raising=False)
+    monkeypatch.setattr(rac, "ensure_dataframe_batch_definition", lambda asset, name: object(), raising=False)
+    monkeypatch.setattr(rac, "load_frame", fake_load, raising=False)
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda bd, batch_parameters=None: None)
+    monkeypatch.setattr(rac, "add_suite_to_context", lambda ctx, suite, name: suite)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD())
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", lambda *a, **kw: {"success": True})
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    sources = {"remote": {"source_folder": "abfs://box/landing", "batch_definition_path": "orders.parquet", "asset_type": "parquet", "asset_name": "orders", "definition_name": "orders_def"}}
+    results = {}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {}, results=results)
+
+    assert results["remote"]["success"] is True
+    assert loaded == [("parquet", "abfs://box/landing/orders.parquet")]
+    assert seen["asset_type"] == "dataframe" and seen["vd"]["dataframe"]["id"].tolist() == [1]
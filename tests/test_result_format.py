@@ -0,0 +1,120 @@
+import json
+import types
+
+import great_expectations as gx
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+import yaml
+
+from dq_docker.result_format import CompactValidationResultsStore, iter_result_json, resolve_result_format
+
+
+def test_resolve_result_format(monkeypatch):
+    monkeypatch.delenv("DQ_RESULT_FORMAT", raising=False)
+    monkeypatch.delenv("DQ_RESULT_UNEXPECTED_LIMIT", raising=False)
+    default = {"result_format": "SUMMARY"}
+
+    assert resolve_result_format(None, default) == {"result_format": "SUMMARY", "partial_unexpected_count": 20}
+    assert resolve_result_format("boolean_only", default) == {"result_format": "BOOLEAN_ONLY"}
+    assert resolve_result_format({"result_format": "COMPLETE", "unexpected_limit": 5}, default) == {
+        "result_format": "SUMMARY",
+        "partial_unexpected_count": 5,
+    }
+    assert resolve_result_format({"result_format": "COMPLETE", "unexpected_limit": -1}) == {"result_format": "COMPLETE"}
+    with pytest.raises(ValueError):
+        resolve_result_format("VERBOSE")
+    with pytest.raises(ValueError):
+        resolve_result_format({"max_rows": 3})
+
+    monkeypatch.setenv("DQ_RESULT_UNEXPECTED_LIMIT", "3")
+    monkeypatch.setenv("DQ_RESULT_FORMAT", "BOOLEAN_ONLY")
+    assert resolve_result_format({"result_format": "SUMMARY", "unexpected_limit": 5}) == {"result_format": "BOOLEAN_ONLY"}
+    monkeypatch.delenv("DQ_RESULT_FORMAT")
+    assert resolve_result_format("BASIC")["partial_unexpected_count"] == 3
+
+
+@pytest.fixture
+def complete_result():
+    ctx = gx.get_context(mode="ephemeral")
+    bd = ctx.data_sources.add_pandas("ds").add_dataframe_asset("a").add_batch_definition_whole_dataframe("bd")
+    suite = ctx.suites.add(
+        gx.ExpectationSuite("s", expectations=[gxe.ExpectColumnValuesToBeBetween(column="x", min_value=0, max_value=1)])
+    )
+    vd = ctx.validation_definitions.add(gx.ValidationDefinition(name="vd", data=bd, suite=suite))
+    frame = pd.DataFrame({"x": range(500)})
+    return vd.run(batch_parameters={"dataframe": frame}, result_format={"result_format": "COMPLETE"})
+
+
+def test_streamed_json_round_trips_through_the_store(complete_result):
+    store = CompactValidationResultsStore(unexpected_limit=-1)
+    text = store.serialize(complete_result)
+    assert json.loads(text) == json.loads(json.dumps(complete_result.to_json_dict()))
+    assert store.deserialize(text).to_json_dict() == complete_result.to_json_dict()
+
+
+def test_streamed_json_caps_unexpected_lists(complete_result):
+    assert len(complete_result.results[0].result["unexpected_index_list"]) == 498
+    doc = json.loads("".join(iter_result_json(complete_result, limit=10)))
+    result = doc["results"][0]["result"]
+    assert len(result["unexpected_list"]) == 10 and len(result["unexpected_index_list"]) == 10
+    assert result["unexpected_count"] == 498
+
+    store = CompactValidationResultsStore(unexpected_limit=10)
+    assert store.config["unexpected_limit"] == 10
+    assert len(store.deserialize(store.serialize(complete_result)).results[0].result["unexpected_list"]) == 10
+
+
+def test_source_result_format_reaches_validation_and_checkpoint(tmp_path, monkeypatch):
+    import dq_docker.run_adls_checkpoint as rac
+    from dq_docker.validator import run_validations
+
+    monkeypatch.delenv("DQ_RESULT_FORMAT", raising=False)
+    monkeypatch.delenv("DQ_RESULT_UNEXPECTED_LIMIT", raising=False)
+    seen = {}
+
+    class FakeVD:
+        def __init__(self, name):
+            self.name = name
+
+        def run(self, **kwargs):
+            seen[("run", self.name)] = kwargs.get("result_format")
+            return {"success": True, "results": []}
+
+    def fake_checkpoint(ctx, name, vd, actions, result_format, **kwargs):
+        seen[("checkpoint", name)] = result_format
+        return {"success": True}
+
+    monkeypatch.setattr(rac, "ensure_pandas_filesystem", lambda ctx, name, folder: object())
+    monkeypatch.setattr(rac, "ensure_csv_asset", lambda ds, name: object())
+    monkeypatch.setattr(rac, "ensure_batch_definition", lambda asset, name, path: object())
+    monkeypatch.setattr(rac, "get_batch_and_preview", lambda *a, **k: None)
+    monkeypatch.setattr(rac, "create_or_get_validation_definition", lambda ctx, name, bd, suite: FakeVD(name))
+    monkeypatch.setattr(rac, "create_and_run_checkpoint", fake_checkpoint)
+    monkeypatch.setattr(rac, "get_data_docs_urls", lambda ctx: {})
+
+    (tmp_path / "data").mkdir()
+    pd.DataFrame({"id": [1]}).to_csv(tmp_path / "data" / "x.csv", index=False)
+    base = {"source_folder": str(tmp_path / "data"), "batch_definition_path": "x.csv"}
+    sources = {
+        "gate": dict(base, asset_name="gate", definition_name="gate", result_format="BOOLEAN_ONLY"),
+        "wide": dict(base, asset_name="wide", definition_name="wide", result_format={"unexpected_limit": 100}),
+        "bad": dict(base, asset_name="bad", definition_name="bad", result_format="VERBOSE"),
+    }
+    results = {}
+    run_validations(types.SimpleNamespace(), sources, None, str(tmp_path), None, ["local_site"], {"result_format": "SUMMARY"}, results=results)
+
+    assert seen[("run", "gate")] == seen[("checkpoint", "gate")] == {"result_format": "BOOLEAN_ONLY"}
+    assert seen[("run", "wide")] == {"result_format": "SUMMARY", "partial_unexpected_count": 100}
+    assert ("run", "bad") not in seen and results["bad"]["success"] is False
+
+
+def test_compact_store_loads_from_project_config(tmp_path):
+    gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    path = tmp_path / "gx" / "great_expectations.yml"
+    config = yaml.safe_load(path.read_text())
+    config["stores"]["validation_results_store"].update(module_name="dq_docker.result_format", unexpected_limit=5)
+    path.write_text(yaml.safe_dump(config))
+
+    store = gx.get_context(mode="file", project_root_dir=str(tmp_path)).validation_results_store
+    assert isinstance(store, CompactValidationResultsStore) and store.unexpected_limit == 5
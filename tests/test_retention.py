@@ -0,0 +1,118 @@
+import json
+import types
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from great_expectations.data_context.store import InMemoryStoreBackend
+
+from dq_docker.retention import RetentionPolicy, compact_validation_results, flatten_result, read_archive, select_expired
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+def _result(suite, day, success=True):
+    return json.dumps({
+        "suite_name": suite,
+        "success": success,
+        "statistics": {"evaluated_expectations": 1, "success_percent": 100.0 if success else 0.0},
+        "meta": {"run_id": {"run_name": f"run-{day}", "run_time": f"2026-10-{day:02d}T00:00:00+00:00"}},
+        "results": [{
+            "success": success,
+            "expectation_config": {"type": "expect_column_values_to_not_be_null", "kwargs": {"column": "id"}},
+            "result": {"element_count": 10, "unexpected_count": 0 if success else 3},
+        }],
+    })
+
+
+def _key(suite, day):
+    # Suite names are stored as one key part per dot-separated component.
+    return (*suite.split("."), f"run-{day}", f"202610{day:02d}T000000.000000Z", "ds-asset")
+
+
+def _context(tmp_path, days):
+    backend = InMemoryStoreBackend()
+    for suite in ("customers", "orders"):
+        for day in days:
+            backend.set(_key(suite, day), _result(suite, day, success=day % 2 == 0))
+    return types.SimpleNamespace(validation_results_store=types.SimpleNamespace(store_backend=backend), root_directory=str(tmp_path))
+
+
+def test_select_expired_keeps_last_runs_or_recent_days():
+    keys = [_key("customers", d) for d in range(1, 11)]
+    assert select_expired(keys, RetentionPolicy(keep_last=3), now=NOW) == sorted(keys[:7])
+    # Either rule keeps a result: the last 3 runs, or anything from the last 14 days.
+    assert select_expired(keys, RetentionPolicy(keep_last=3, keep_days=14), now=NOW) == sorted(keys[:4])
+    assert select_expired(keys, RetentionPolicy(), now=NOW) == []
+
+
+def test_dotted_suite_names_are_read_from_the_end_of_the_key():
+    orders = [_key("sales.orders", d) for d in range(1, 4)]
+    returns = [_key("sales.returns", d) for d in range(1, 4)]
+    assert select_expired(orders + returns, RetentionPolicy(keep_last=1), now=NOW) == sorted(orders[:2] + returns[:2])
+
+    row = flatten_result(orders[0], {"results": [{}]})[0]
+    assert (row["suite"], row["run_name"], row["batch_id"]) == ("sales.orders", "run-1", "ds-asset")
+    assert row["run_time"] == datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def test_compaction_archives_then_deletes(tmp_path):
+    context = _context(tmp_path, range(1, 6))
+    backend = context.validation_results_store.store_backend
+
+    summary = compact_validation_results(context, RetentionPolicy(keep_last=2), now=NOW)
+
+    assert summary["expired"] == 6 and summary["deleted"] == 6 and summary["kept"] == 4
+    assert not summary["errors"]
+    remaining = [k for k in backend.list_keys() if k != backend.STORE_BACKEND_ID_KEY]
+    assert sorted(k[1] for k in remaining) == ["run-4", "run-4", "run-5", "run-5"]
+
+    archive = read_archive(str(tmp_path / "uncommitted" / "validations_archive"))
+    assert len(archive) == 6
+    customers = read_archive(str(tmp_path / "uncommitted" / "validations_archive"), suite="customers")
+    assert sorted(customers["run_name"]) == ["run-1", "run-2", "run-3"]
+    assert customers.set_index("run_name").loc["run-1", "unexpected_count"] == 3
+
+
+def test_dry_run_and_archive_failure_keep_results(tmp_path, monkeypatch):
+    context = _context(tmp_path, range(1, 4))
+    backend = context.validation_results_store.store_backend
+    before = len(backend.list_keys())
+
+    assert compact_validation_results(context, RetentionPolicy(keep_last=1), dry_run=True)["expired"] == 4
+    assert len(backend.list_keys()) == before
+
+    import dq_docker.retention as retention
+
+    monkeypatch.setattr(retention, "_write_archive", lambda rows, d: (_ for _ in ()).throw(OSError("disk full")))
+    summary = compact_validation_results(context, RetentionPolicy(keep_last=1))
+    assert summary["deleted"] == 0 and summary["errors"]
+    assert len(backend.list_keys()) == before
+
+
+def test_archives_with_different_null_patterns_read_back_together(tmp_path):
+    import pandas as pd
+
+    backend = InMemoryStoreBackend()
+    # No run name, checkpoint id or observed value: all-null columns.
+    bare = json.loads(_result("customers", 1))
+    bare["meta"] = {}
+    backend.set(("customers", "__none__", "20261001T000000.000000Z", "ds-asset"), json.dumps(bare))
+    context = types.SimpleNamespace(validation_results_store=types.SimpleNamespace(store_backend=backend), root_directory=str(tmp_path))
+    assert compact_validation_results(context, RetentionPolicy(keep_days=1), now=NOW)["deleted"] == 1
+
+    full = json.loads(_result("customers", 2))
+    full["meta"]["checkpoint_id"] = "cp-1"
+    full["results"][0]["result"]["observed_value"] = 7
+    backend.set(_key("customers", 2), json.dumps(full))
+    assert compact_validation_results(context, RetentionPolicy(keep_days=1), now=NOW)["deleted"] == 1
+
+    archive_dir = tmp_path / "uncommitted" / "validations_archive"
+    archive = read_archive(str(archive_dir)).sort_values("run_time")
+    assert archive["run_name"].tolist() == [None, "run-2"]
+    assert archive["checkpoint_id"].tolist() == [None, "cp-1"]
+    assert archive["observed_value"].tolist() == [None, "7"]
+    assert len(read_archive(str(archive_dir), suite="customers")) == 2
+    assert len(pd.read_parquet(archive_dir)) == 2
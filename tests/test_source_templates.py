@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from dq_docker import source_templates
+
+
+TEMPLATE = {
+    "template": {
+        "root": "feeds",
+        "regex": r"(?P<feed>[a-z]+)/(?P=feed)_(?P<year>\d{4})\.csv",
+        "name": "ds_{feed}_{year}",
+    },
+    "source": {
+        "source_folder": "{root}/{parent}",
+        "asset_name": "{feed}",
+        "batch_definition_path": "{name}",
+        "reader_options": {"sep": ","},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DQ_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _touch(root, rel):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("id\n1\n")
+
+
+def test_expand_template_formats_named_groups(tmp_path):
+    _touch(tmp_path, "feeds/orders/orders_2024.csv")
+    _touch(tmp_path, "feeds/orders/readme.md")
+    _touch(tmp_path, "feeds/customers/customers_2023.csv")
+
+    sources = source_templates.expand_template(TEMPLATE, origin="t.yml", project_root=str(tmp_path))
+
+    assert sorted(sources) == ["ds_customers_2023", "ds_orders_2024"]
+    assert sources["ds_orders_2024"] == {
+        "source_folder": "feeds/orders",
+        "asset_name": "orders",
+        "batch_definition_path": "orders_2024.csv",
+        "reader_options": {"sep": ","},
+    }
+
+
+def test_expansion_is_cached_until_listing_changes(tmp_path, monkeypatch):
+    _touch(tmp_path, "feeds/orders/orders_2024.csv")
+    first = source_templates.expand_template(TEMPLATE, origin="t.yml", project_root=str(tmp_path))
+
+    calls = []
+    real_expand = source_templates._expand
+    monkeypatch.setattr(source_templates, "_expand", lambda *a: calls.append(a) or real_expand(*a))
+
+    assert source_templates.expand_template(TEMPLATE, origin="t.yml", project_root=str(tmp_path)) == first
+    assert calls == []
+
+    _touch(tmp_path, "feeds/orders/orders_2025.csv")
+    os.utime(tmp_path / "feeds" / "orders", ns=(1, 1))
+    refreshed = source_templates.expand_template(TEMPLATE, origin="t.yml", project_root=str(tmp_path))
+    assert sorted(refreshed) == ["ds_orders_2024", "ds_orders_2025"]
+    assert len(calls) == 1
+
+
+def test_glob_directories_and_duplicate_names(tmp_path):
+    _touch(tmp_path, "feeds/a/x.csv")
+    _touch(tmp_path, "feeds/b/x.csv")
+    spec = {"template": {"root": "feeds", "glob": "*", "targets": "directories", "name": "ds_{path}"}, "source": {"source_folder": "{root}/{path}"}}
+    assert sorted(source_templates.expand_template(spec, project_root=str(tmp_path))) == ["ds_a", "ds_b"]
+
+    spec["template"]["name"] = "ds_same"
+    with pytest.raises(ValueError):
+        source_templates.expand_template(spec, origin="dup.yml", project_root=str(tmp_path))
+
+
+def test_remote_expansion_skips_listing_within_ttl(monkeypatch):
+    listings = []
+
+    def fake_list_remote(root, targets):
+        listings.append(root)
+        return ["orders/orders_2024.csv"], [("orders/orders_2024.csv", "etag-1")]
+
+    monkeypatch.setattr(source_templates, "_list_remote", fake_list_remote)
+    spec = dict(TEMPLATE, template=dict(TEMPLATE["template"], root="abfs://box/feeds"))
+
+    first = source_templates.expand_template(spec, origin="remote.yml")
+    assert source_templates.expand_template(spec, origin="remote.yml") == first == {
+        "ds_orders_2024": dict(TEMPLATE["source"], source_folder="abfs://box/feeds/orders", asset_name="orders", batch_definition_path="orders_2024.csv")
+    }
+    assert len(listings) == 1
+
+    changed = dict(spec, source=dict(spec["source"], asset_name="{feed}_v2"))
+    assert source_templates.expand_template(changed, origin="remote.yml")["ds_orders_2024"]["asset_name"] == "orders_v2"
+    assert len(listings) == 2
+
+    monkeypatch.setenv("DQ_TEMPLATE_CACHE_TTL", "0")
+    source_templates.expand_template(changed, origin="remote.yml")
+    assert len(listings) == 3
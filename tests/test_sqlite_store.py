@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from great_expectations.exceptions import InvalidKeyError
+
+from dq_docker.sqlite_store import SQLiteStoreBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    b = SQLiteStoreBackend(database="store.sqlite", namespace="validations", root_directory=str(tmp_path), filepath_suffix=".json")
+    yield b
+    b.close()
+
+
+def test_set_get_and_prefix_listing(backend):
+    backend.set(("suite_a", "run1", "t1", "batch"), '{"a": 1}')
+    backend.set(("suite_a", "run2", "t2", "batch"), '{"a": 2}')
+    backend.set(("suite_ab", "run1", "t1", "batch"), '{"b": 1}')
+
+    assert backend.get(("suite_a", "run1", "t1", "batch")) == '{"a": 1}'
+    assert backend.list_keys(("suite_a",)) == [("suite_a", "run1", "t1", "batch"), ("suite_a", "run2", "t2", "batch")]
+    assert len([k for k in backend.list_keys() if k != backend.STORE_BACKEND_ID_KEY]) == 3
+    assert backend.has_key(("suite_ab", "run1", "t1", "batch"))
+    with pytest.raises(InvalidKeyError):
+        backend.get(("missing",))
+
+
+def test_move_and_remove(backend):
+    backend.set(("a",), "1")
+    assert backend.move(("a",), ("b",)) == ("b",)
+    assert not backend.has_key(("a",)) and backend.get(("b",)) == "1"
+    assert backend.remove_key(("b",)) is True
+    assert backend.remove_key(("b",)) is False
+
+
+def test_batch_is_transactional(backend, tmp_path):
+    with pytest.raises(RuntimeError):
+        with backend.batch():
+            backend.set(("x",), "1")
+            backend.set(("y",), "2")
+            raise RuntimeError("boom")
+    assert not backend.has_key(("x",))
+
+    seen_during = []
+    with backend.batch():
+        backend.set(("x",), "1")
+        # Other connections do not see uncommitted writes.
+        other = threading.Thread(target=lambda: seen_during.append(backend.has_key(("x",))))
+        other.start()
+        other.join()
+    assert seen_during == [False]
+    assert backend.has_key(("x",))
+
+    assert backend.set_many([(("k", str(i)), str(i)) for i in range(100)]) == 100
+    assert len(backend.list_keys(("k",))) == 100
+    assert backend.remove_keys([("k", str(i)) for i in range(50)]) == 50
+
+
+def test_namespaces_share_one_file_and_keep_backend_id(tmp_path):
+    a = SQLiteStoreBackend(database=str(tmp_path / "s.sqlite"), namespace="expectations")
+    b = SQLiteStoreBackend(database=str(tmp_path / "s.sqlite"), namespace="checkpoints")
+    a.set(("suite",), "{}")
+    assert b.list_keys() == [b.STORE_BACKEND_ID_KEY]
+    assert a.store_backend_id != b.store_backend_id
+
+    again = SQLiteStoreBackend(database=str(tmp_path / "s.sqlite"), namespace="expectations")
+    assert again.store_backend_id == a.store_backend_id
+    assert again.config["class_name"] == "SQLiteStoreBackend"
+    assert again.config["module_name"] == "dq_docker.sqlite_store"
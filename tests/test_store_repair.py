@@ -0,0 +1,90 @@
+import glob
+import os
+import threading
+
+import great_expectations as gx
+import pytest
+
+from dq_docker.checkpoint import clear_ge_store, repair_ge_store
+
+
+@pytest.fixture
+def context(tmp_path):
+    ctx = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    bd = ctx.data_sources.add_pandas("ds").add_dataframe_asset("asset").add_batch_definition_whole_dataframe("bd")
+    for name in ("a", "b"):
+        suite = ctx.suites.add(gx.ExpectationSuite(f"suite_{name}"))
+        vd = ctx.validation_definitions.add(gx.ValidationDefinition(name=f"vd_{name}", data=bd, suite=suite))
+        ctx.checkpoints.add(gx.Checkpoint(name=f"cp_{name}", validation_definitions=[vd]))
+    return ctx
+
+
+def test_repair_skips_verified_entries(context, tmp_path):
+    manifest = str(tmp_path / "manifest.json")
+
+    first = repair_ge_store(context, manifest_path=manifest)
+    assert (first["checked"], first["skipped"], first["errors"]) == (4, 0, [])
+
+    second = repair_ge_store(context, manifest_path=manifest)
+    assert (second["checked"], second["skipped"]) == (0, 4)
+
+    assert repair_ge_store(context, manifest_path=manifest, use_manifest=False)["checked"] == 4
+
+
+def test_repair_rechecks_changed_entries(context, tmp_path):
+    manifest = str(tmp_path / "manifest.json")
+    repair_ge_store(context, manifest_path=manifest)
+
+    context.validation_definition_store.store_backend.set(("vd_b",), '{"name": "vd_b"}')
+    result = repair_ge_store(context, manifest_path=manifest)
+
+    # vd_b changed and no longer deserializes; cp_b references its old id.
+    assert result["validation_definitions_deleted"] == ["vd_b"]
+    assert result["checkpoints_deleted"] == ["cp_b"]
+    assert (result["checked"], result["skipped"]) == (2, 2)
+
+
+def test_repair_rechecks_entries_whose_references_disappeared(context, tmp_path):
+    manifest = str(tmp_path / "manifest.json")
+    repair_ge_store(context, manifest_path=manifest)
+
+    context.suites.delete("suite_a")
+    result = repair_ge_store(context, manifest_path=manifest)
+
+    assert result["validation_definitions_deleted"] == ["vd_a"]
+    assert result["checkpoints_deleted"] == ["cp_a"]
+    assert (result["checked"], result["skipped"]) == (2, 2)
+    assert repair_ge_store(context, manifest_path=manifest)["checked"] == 0
+
+
+def test_clear_swaps_filesystem_stores_and_keeps_backend_id(context):
+    backend = context.validation_definition_store.store_backend
+    id_file = os.path.join(backend.full_base_directory, ".ge_store_backend_id")
+    with open(id_file, "w") as fh:
+        fh.write("store_backend_id = 2bfc7a8b-7b4c-4a43-9b6d-2f0a8c36f0d1\n")
+
+    result = clear_ge_store(context)
+
+    assert sorted(result["validation_definitions_deleted"]) == ["vd_a", "vd_b"]
+    assert sorted(result["checkpoints_deleted"]) == ["cp_a", "cp_b"]
+    assert result["errors"] == []
+    assert backend.list_keys() == [] and context.checkpoint_store.store_backend.list_keys() == []
+    assert os.listdir(backend.full_base_directory) == [".ge_store_backend_id"]
+    with open(id_file) as fh:
+        assert "2bfc7a8b-7b4c-4a43-9b6d-2f0a8c36f0d1" in fh.read()
+    for thread in threading.enumerate():
+        if thread.name == "dq-store-tombstones":
+            thread.join()
+    assert glob.glob(backend.full_base_directory + ".tombstone-*") == []
+
+    # The cleared stores accept new entries.
+    bd = context.data_sources.get("ds").get_asset("asset").get_batch_definition("bd")
+    context.validation_definitions.add(gx.ValidationDefinition(name="vd_c", data=bd, suite=context.suites.get("suite_a")))
+    assert backend.list_keys() == [("vd_c",)]
+
+
+def test_clear_falls_back_to_per_key_deletes(context):
+    result = clear_ge_store(context, bulk=False)
+
+    assert sorted(result["checkpoints_deleted"]) == ["cp_a", "cp_b"]
+    assert context.checkpoint_store.store_backend.list_keys() == []
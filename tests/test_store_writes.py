@@ -0,0 +1,61 @@
+import os
+
+import great_expectations as gx
+import great_expectations.expectations as gxe
+import pytest
+
+from dq_docker.expectation_suite import add_suite_to_context
+from dq_docker.store_writes import checkpoint_unchanged, normalized_digest, write_stats
+from dq_docker.validation_definition import create_or_get_validation_definition
+
+
+@pytest.fixture
+def context(tmp_path):
+    write_stats().reset()
+    ctx = gx.get_context(mode="file", project_root_dir=str(tmp_path))
+    ctx.data_sources.add_pandas("ds").add_dataframe_asset("asset").add_batch_definition_whole_dataframe("bd")
+    return ctx
+
+
+def _suite():
+    # Built in one go: add_expectation() on a suite whose name is already
+    # stored would write to the store itself.
+    return gx.ExpectationSuite("suite", expectations=[gxe.ExpectColumnValuesToNotBeNull(column="id")])
+
+
+def _mtime(store, name):
+    backend = store.store_backend
+    return os.stat(os.path.join(backend.full_base_directory, backend._convert_key_to_filepath((name,)))).st_mtime_ns
+
+
+def test_normalized_digest_ignores_ids_and_formatting():
+    a = '{"name": "s", "id": "1", "expectations": [{"id": "x", "type": "t"}]}'
+    b = '{\n  "expectations": [{"type": "t", "id": "y"}],\n  "name": "s"\n}'
+    assert normalized_digest(a, "suites") == normalized_digest(b, "suites")
+    assert normalized_digest(a) != normalized_digest(b)
+    assert normalized_digest('{"name": "s", "id": "1"}') == normalized_digest('{"id": null, "name": "s"}')
+
+
+def test_unchanged_objects_are_not_written_again(context):
+    bd = context.data_sources.get("ds").get_asset("asset").get_batch_definition("bd")
+    for _ in range(2):
+        suite = add_suite_to_context(context, _suite(), "suite")
+        vd = create_or_get_validation_definition(context, "vd", bd, suite)
+    assert vd.id == context.validation_definitions.get("vd").id
+    assert write_stats().snapshot() == {
+        "suites": {"written": 1, "skipped": 1},
+        "validation_definitions": {"written": 1, "skipped": 1},
+    }
+
+    checkpoint = gx.Checkpoint(name="cp", validation_definitions=[vd], actions=[], result_format="SUMMARY")
+    assert not checkpoint_unchanged(context, checkpoint)
+    context.checkpoints.add_or_update(checkpoint=checkpoint)
+    before = _mtime(context.checkpoint_store, "cp")
+
+    again = gx.Checkpoint(name="cp", validation_definitions=[vd], actions=[], result_format="SUMMARY")
+    assert checkpoint_unchanged(context, again)
+    assert again.id == checkpoint.id and again.is_fresh().success
+    assert _mtime(context.checkpoint_store, "cp") == before
+
+    changed = gx.Checkpoint(name="cp", validation_definitions=[vd], actions=[], result_format="COMPLETE")
+    assert not checkpoint_unchanged(context, changed)
@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+
+import pytest
+
+from dq_docker import watch
+
+
+def _sources(tmp_path):
+    return {
+        "ds_file": {"source_folder": str(tmp_path / "file"), "batch_definition_path": "a.csv"},
+        "ds_parts": {
+            "source_folder": str(tmp_path / "parts"),
+            "batch_definition_regex": r"p_(?P<day>\d{2})\.csv",
+            "partition_mode": "latest",
+        },
+        "ds_remote": {"source_folder": "abfs://box/x"},
+    }
+
+
+def test_affected_sources_narrows_partitions(tmp_path):
+    (tmp_path / "file").mkdir()
+    (tmp_path / "parts").mkdir()
+    changed = [str(tmp_path / "parts" / "p_02.csv"), str(tmp_path / "file" / "other.csv")]
+
+    affected = watch.affected_sources(changed, _sources(tmp_path), str(tmp_path))
+
+    assert list(affected) == ["ds_parts"]
+    from dq_docker.partitions import expand_partitions
+
+    for day in ("01", "02", "03"):
+        (tmp_path / "parts" / f"p_{day}.csv").write_text("id\n")
+    expanded = expand_partitions(affected["ds_parts"], str(tmp_path / "parts"))
+    assert [key for key, _ in expanded] == ["02"]
+
+
+@pytest.mark.parametrize("use_inotify", [False, None])
+def test_watch_sources_debounces_and_revalidates(tmp_path, use_inotify):
+    (tmp_path / "file").mkdir()
+    (tmp_path / "parts").mkdir()
+    seen = []
+    stop = threading.Event()
+
+    def writer():
+        time.sleep(0.3)
+        for _ in range(3):
+            (tmp_path / "file" / "a.csv").write_text(f"id\n{time.time()}\n")
+            time.sleep(0.05)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    timer = threading.Timer(10, stop.set)
+    timer.start()
+    try:
+        cycles = watch.watch_sources(
+            _sources(tmp_path),
+            str(tmp_path),
+            None,
+            seen.append,
+            debounce=0.3,
+            poll_interval=0.1,
+            use_inotify=use_inotify,
+            stop=stop,
+            max_cycles=1,
+        )
+    finally:
+        timer.cancel()
+        t.join()
+
+    assert cycles == 1
+    assert [sorted(s) for s in seen] == [["ds_file"]]
+
+
+def test_inotify_waits_for_writer_to_close(tmp_path):
+    try:
+        watcher = watch.FolderWatcher([str(tmp_path)], debounce=0.2, use_inotify=True)
+    except OSError:
+        pytest.skip("inotify unavailable")
+    target = tmp_path / "big.csv"
+    try:
+        with open(target, "w") as fh:
+            fh.write("id\n1\n")
+            fh.flush()
+            assert watcher.wait(timeout=0.6) == set()
+        assert watcher.wait(timeout=3) == {str(target)}
+    finally:
+        watcher.close()
+
+
+def test_recently_modified_files_stay_pending(tmp_path):
+    watcher = watch.FolderWatcher([str(tmp_path)], debounce=5, use_inotify=False)
+    fresh, old = tmp_path / "fresh.csv", tmp_path / "old.csv"
+    fresh.write_text("id\n")
+    old.write_text("id\n")
+    os.utime(old, (time.time() - 60, time.time() - 60))
+    ready, pending = watcher._settled({str(fresh), str(old), str(tmp_path / "gone.csv")})
+    assert ready == {str(old), str(tmp_path / "gone.csv")} and pending == {str(fresh)}
+    watcher.close()